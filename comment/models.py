@@ -1,7 +1,10 @@
 # comment/models.py
 from django.db import models
+from django.utils import timezone
 import uuid
 from django.contrib.auth import get_user_model
+from notifications.events import comment_created, comment_reaction_changed, withdraw
+from post.models import Post
 
 User = get_user_model()
 
@@ -47,6 +50,21 @@ class Comment(models.Model):
         permissions = [
             ("manage_all_comments", "Can manage all comments"),  # Hak akses superuser
         ]
+        indexes = [
+            # Thread satu post: semua komentar (comment/tree.py) dan halaman
+            # komentar top-level (parent IS NULL) urut created_at
+            models.Index(
+                fields=["post", "parent", "-created_at"],
+                condition=models.Q(is_deleted=False),
+                name="comment_post_thread_idx",
+            ),
+            # Balasan satu komentar: preview, reply_count dan replies/list/
+            models.Index(
+                fields=["parent", "created_at"],
+                condition=models.Q(is_deleted=False),
+                name="comment_parent_created_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"Komentar oleh {self.user.username} pada {self.post.title}"
@@ -56,10 +74,26 @@ class Comment(models.Model):
         """Cek apakah komentar adalah balasan"""
         return self.parent is not None
 
+    def save(self, *args, **kwargs):
+        """Simpan komentar dan tambah comments_count pada Post saat dibuat"""
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if adding and not self.is_deleted:
+            Post.bump_counters(self.post_id, comments_count=1)
+            comment_created(self)
+
     def delete(self, *args, **kwargs):
-        """Soft delete dengan pelestarian thread"""
+        """
+        Soft delete dengan pelestarian thread. UPDATE bersyarat sehingga dua
+        delete bersamaan hanya mengurangi comments_count sekali, dan counter
+        like/dislike instance ini (mungkin basi) tidak ikut ditulis.
+        """
+        deleted = Comment.objects.filter(pk=self.pk, is_deleted=False).update(
+            is_deleted=True, updated_at=timezone.now()
+        )
         self.is_deleted = True
-        self.save()
+        if deleted:
+            Post.bump_counters(self.post_id, comments_count=-1)
 
 
 class CommentInteraction(models.Model):
@@ -99,3 +133,26 @@ class CommentInteraction(models.Model):
 
     def __str__(self):
         return f"{self.user.username} - {self.interaction_type} - Comment #{self.comment.id}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Simpan tipe awal agar save() tahu apakah notifikasi like berubah
+        instance._loaded_interaction_type = instance.__dict__.get("interaction_type")
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Simpan interaksi dan kirim/tarik notifikasi like ke pemilik komentar"""
+        previous_type = (
+            None if self._state.adding else getattr(self, "_loaded_interaction_type", None)
+        )
+        super().save(*args, **kwargs)
+        comment_reaction_changed(self, previous_type)
+        self._loaded_interaction_type = self.interaction_type
+
+    def delete(self, *args, **kwargs):
+        """Hapus interaksi beserta notifikasi like-nya"""
+        result = super().delete(*args, **kwargs)
+        if self.interaction_type == "like":
+            withdraw(self.user_id, "like_comment", self.comment.post_id, self.comment_id)
+        return result
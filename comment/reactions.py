@@ -0,0 +1,145 @@
+# comment/reactions.py
+"""
+Toggle like/dislike komentar secara atomik.
+
+Semua jalur (CommentInteractionView dan comment_interaction_web) memakai
+toggle_comment_reaction() agar logikanya hanya ada di satu tempat:
+- Baris CommentInteraction dikunci (select_for_update) selama transaksi, dan
+  IntegrityError dari unique (user, comment) saat dua request membuat baris
+  bersamaan ditangani dengan membaca ulang baris pemenangnya.
+- Counter diubah langsung di database (kolom + delta, tidak pernah < 0),
+  bukan read-modify-write lewat comment.save(), sehingga klik bersamaan
+  tidak saling menimpa.
+- Nilai counter terbaru dibaca dari UPDATE ... RETURNING (PostgreSQL dan
+  SQLite >= 3.35) sehingga tidak perlu SELECT tambahan.
+"""
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import Comment, CommentInteraction
+
+MESSAGES = {
+    ("like", "added"): ("Komentar berhasil disukai", "liked"),
+    ("like", "removed"): ("Like removed", "unliked"),
+    ("like", "changed"): ("Changed to like", "liked"),
+    ("dislike", "added"): ("Komentar berhasil di-dislike", "disliked"),
+    ("dislike", "removed"): ("Dislike removed", "undisliked"),
+    ("dislike", "changed"): ("Changed to dislike", "disliked"),
+}
+
+
+def _supports_update_returning():
+    if connection.vendor == "postgresql":
+        return True
+    return (
+        connection.vendor == "sqlite"
+        and connection.Database.sqlite_version_info >= (3, 35)
+    )
+
+
+def bump_comment_counters(comment_id, **deltas):
+    """
+    Tambahkan delta ke likes_count/dislikes_count secara atomik dan kembalikan
+    (likes_count, dislikes_count) yang baru, atau None jika komentar tidak ada.
+    updated_at ikut diperbarui agar perubahan counter masuk delta ?since=.
+    """
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    now = timezone.now()
+    if not _supports_update_returning():
+        Comment.objects.filter(pk=comment_id).update(
+            updated_at=now,
+            **{
+                field: Greatest(F(field) + delta, Value(0))
+                for field, delta in deltas.items()
+            },
+        )
+        return (
+            Comment.objects.filter(pk=comment_id)
+            .values_list("likes_count", "dislikes_count")
+            .first()
+        )
+
+    greatest = "GREATEST" if connection.vendor == "postgresql" else "MAX"
+    sets = ", ".join(f"{field} = {greatest}({field} + %s, 0)" for field in deltas)
+    pk = Comment._meta.pk.get_db_prep_value(comment_id, connection)
+    updated_at = Comment._meta.get_field("updated_at").get_db_prep_value(now, connection)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {Comment._meta.db_table} SET {sets}, updated_at = %s WHERE id = %s "
+            "RETURNING likes_count, dislikes_count",
+            [*deltas.values(), updated_at, pk],
+        )
+        row = cursor.fetchone()
+    return tuple(row) if row else None
+
+
+def _locked_interaction(user, comment):
+    interaction = (
+        CommentInteraction.objects.select_for_update()
+        .filter(user=user, comment=comment)
+        .first()
+    )
+    if interaction is not None:
+        # Pakai instance komentar yang sudah ada (dipakai hook notifikasi)
+        interaction.comment = comment
+    return interaction
+
+
+def _apply_reaction(user, comment, action, attempts=3):
+    """Ubah baris CommentInteraction; kembalikan (outcome, delta counter)"""
+    for _ in range(attempts):
+        interaction = _locked_interaction(user, comment)
+        if interaction is None:
+            try:
+                # Savepoint: jika request lain menang, transaksi luar tetap sehat
+                with transaction.atomic():
+                    CommentInteraction.objects.create(
+                        user=user, comment=comment, interaction_type=action
+                    )
+                return "added", {f"{action}s_count": 1}
+            except IntegrityError:
+                # Request lain baru saja membuat baris yang sama; ulangi dengan
+                # membaca baris pemenangnya
+                continue
+
+        previous = interaction.interaction_type
+        if previous == action:
+            interaction.delete()
+            return "removed", {f"{action}s_count": -1}
+        interaction.interaction_type = action
+        interaction.save(update_fields=["interaction_type"])
+        return "changed", {f"{action}s_count": 1, f"{previous}s_count": -1}
+    raise IntegrityError("Interaksi komentar terus berubah, coba lagi")
+
+
+def toggle_comment_reaction(user, comment, action):
+    """
+    Terapkan aksi "like"/"dislike" dari user pada comment:
+    - belum ada interaksi  -> dibuat (added)
+    - interaksi sama       -> dihapus (removed)
+    - interaksi berbeda    -> diganti (changed)
+
+    Mengembalikan dict berisi status, message, action, user_interaction,
+    likes_count dan dislikes_count terbaru.
+    """
+    if action not in ("like", "dislike"):
+        raise ValueError("Action tidak valid")
+
+    with transaction.atomic():
+        outcome, deltas = _apply_reaction(user, comment, action)
+        counts = bump_comment_counters(comment.pk, **deltas)
+
+    likes_count, dislikes_count = counts or (0, 0)
+    # Sinkronkan instance di memori tanpa query tambahan
+    comment.likes_count, comment.dislikes_count = likes_count, dislikes_count
+    message, result_action = MESSAGES[(action, outcome)]
+    return {
+        "status": "success",
+        "message": message,
+        "action": result_action,
+        "user_interaction": None if outcome == "removed" else action,
+        "likes_count": likes_count,
+        "dislikes_count": dislikes_count,
+    }
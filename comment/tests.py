@@ -1,4 +1,4 @@
-from django.test import TestCase, Client
+from django.test import TestCase, TransactionTestCase, Client
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 import json
@@ -347,6 +347,42 @@ class CommentAPIViewTests(TestCase):
         self.assertEqual(data["total_comments"], 1)
         self.assertEqual(data["comments"][0]["content"], "Active comment")
 
+    def test_get_comments_cursor_pagination(self):
+        """Test keyset pagination with ?cursor= walks every top-level comment once"""
+        for i in range(5):
+            Comment.objects.create(user=self.user, post=self.post, content=f"C{i}")
+
+        seen = []
+        cursor = ""
+        while True:
+            response = self.client.get(
+                f"/comments/post/{self.post.id}/", {"cursor": cursor, "per_page": 2}
+            )
+            self.assertEqual(response.status_code, 200)
+            data = json.loads(response.content)
+            self.assertNotIn("total_comments", data)
+            seen.extend(c["content"] for c in data["comments"])
+            cursor = data["pagination"]["next_cursor"]
+            if not cursor:
+                break
+
+        self.assertEqual(seen, [f"C{i}" for i in reversed(range(5))])
+
+        response = self.client.get(
+            f"/comments/post/{self.post.id}/", {"cursor": "not-a-cursor"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.get(
+            f"/comments/post/{self.post.id}/", {"cursor": "", "per_page": 0}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.content)["comments"]), 1)
+        response = self.client.get(
+            f"/comments/post/{self.post.id}/", {"cursor": "", "per_page": "dua"}
+        )
+        self.assertEqual(response.status_code, 400)
+
 
 class CommentInteractionViewTests(TestCase):
     """Tests for Comment Interaction views"""
@@ -881,3 +917,323 @@ class CommentEdgeCasesTests(TestCase):
 
             self.assertEqual(response.status_code, 500)
             self.assertIn("Error retrieving comments", data["message"])
+
+
+class CommentExportTests(TestCase):
+    """Tests for the streaming comment dump"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="exporter", password="pass")
+        self.post = Post.objects.create(user=self.user, title="P", content="c")
+        self.parent = Comment.objects.create(
+            user=self.user, post=self.post, content="Parent"
+        )
+        self.reply = Comment.objects.create(
+            user=self.user, post=self.post, parent=self.parent, content="Reply"
+        )
+        CommentInteraction.objects.create(
+            user=self.user, comment=self.parent, interaction_type="like"
+        )
+
+    def _get(self, query=""):
+        response = self.client.get("/comments/json/" + query)
+        body = b"".join(response.streaming_content).decode()
+        return response, body
+
+    def test_json_dump_includes_top_level_comments(self):
+        response, body = self._get()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        data = json.loads(body)
+        by_id = {c["id"]: c for c in data["comments"]}
+        self.assertIsNone(by_id[str(self.parent.id)]["parent_id"])
+        self.assertEqual(by_id[str(self.reply.id)]["parent_id"], str(self.parent.id))
+        self.assertEqual(data["interactions"][0]["comment_id"], str(self.parent.id))
+        self.assertIn("X-Export-Next-Since", response)
+
+    def test_ndjson_and_since(self):
+        response, body = self._get("?format=ndjson")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([l["type"] for l in lines].count("comments"), 2)
+        self.assertEqual([l["type"] for l in lines].count("interactions"), 1)
+
+        since = response["X-Export-Next-Since"]
+        self.reply.content = "Edited"
+        self.reply.save()
+        _, body = self._get("?format=ndjson&since=" + since)
+        lines = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([l["id"] for l in lines], [str(self.reply.id)])
+        self.assertEqual([l["type"] for l in lines], ["comments"])
+
+    def test_since_export_leaves_out_interactions(self):
+        response, _ = self._get()
+        since = response["X-Export-Next-Since"]
+        CommentInteraction.objects.filter(comment=self.parent).update(
+            interaction_type="dislike"
+        )
+        _, body = self._get("?since=" + since)
+        self.assertEqual(json.loads(body), {"comments": []})
+
+    def test_invalid_since(self):
+        response = self.client.get("/comments/json/?since=kemarin")
+        self.assertEqual(response.status_code, 400)
+
+
+class CommentTreeLoaderTests(TestCase):
+    """Tests for the single-query comment tree loader"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="treeuser", password="pass")
+        self.other = User.objects.create_user(username="other", password="pass")
+        self.post = Post.objects.create(user=self.user, title="Tree", content="c")
+
+    def _build(self, roots, depth):
+        for r in range(roots):
+            parent = Comment.objects.create(
+                user=self.other, post=self.post, content=f"root{r}"
+            )
+            CommentInteraction.objects.create(
+                user=self.user, comment=parent, interaction_type="like"
+            )
+            for d in range(depth):
+                parent = Comment.objects.create(
+                    user=self.user, post=self.post, parent=parent, content=f"r{r}d{d}"
+                )
+
+    def _get(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f"/comments/post/{self.post.id}/")
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content), len(ctx.captured_queries)
+
+    def test_nested_replies_at_any_depth(self):
+        self._build(roots=1, depth=4)
+        self.client.login(username="treeuser", password="pass")
+        data, _ = self._get()
+        node = data["comments"][0]
+        self.assertEqual(node["user_interaction"], "like")
+        self.assertFalse(node["can_edit"])
+        for d in range(4):
+            self.assertEqual(len(node["replies"]), 1)
+            node = node["replies"][0]
+            self.assertEqual(node["content"], f"r0d{d}")
+            self.assertTrue(node["can_edit"])
+        self.assertEqual(node["replies"], [])
+
+    def test_query_count_does_not_grow_with_thread_size(self):
+        self.client.login(username="treeuser", password="pass")
+        self._build(roots=1, depth=1)
+        _, small = self._get()
+        self._build(roots=5, depth=5)
+        data, large = self._get()
+        self.assertEqual(len(data["comments"]), 6)
+        self.assertEqual(small, large)
+
+    def test_replies_of_deleted_comment_are_hidden(self):
+        self._build(roots=1, depth=2)
+        Comment.objects.get(content="r0d0").delete()
+        data, _ = self._get()
+        self.assertEqual(data["comments"][0]["replies"], [])
+
+
+class CommentThreadPaginationTests(TestCase):
+    """Tests for reply previews and the paginated replies endpoint"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="viral", password="pass")
+        self.post = Post.objects.create(user=self.user, title="Viral", content="c")
+        self.root = Comment.objects.create(user=self.user, post=self.post, content="root")
+        self.replies = [
+            Comment.objects.create(
+                user=self.user, post=self.post, parent=self.root, content=f"re{i}"
+            )
+            for i in range(7)
+        ]
+        Comment.objects.create(
+            user=self.user, post=self.post, parent=self.replies[0], content="deep"
+        )
+
+    def test_cursor_mode_returns_reply_preview_and_count(self):
+        response = self.client.get(
+            f"/comments/post/{self.post.id}/", {"cursor": "", "replies": 2}
+        )
+        node = json.loads(response.content)["comments"][0]
+        self.assertEqual(node["reply_count"], 7)
+        self.assertTrue(node["has_more_replies"])
+        self.assertEqual([r["content"] for r in node["replies"]], ["re0", "re1"])
+        self.assertEqual(node["replies"][0]["reply_count"], 1)
+
+    def test_replies_endpoint_pages_oldest_first(self):
+        seen = []
+        cursor = ""
+        while True:
+            response = self.client.get(
+                f"/comments/{self.root.id}/replies/list/",
+                {"cursor": cursor, "per_page": 3, "replies": 1},
+            )
+            self.assertEqual(response.status_code, 200)
+            data = json.loads(response.content)
+            seen.extend(r["content"] for r in data["replies"])
+            cursor = data["pagination"]["next_cursor"]
+            if not cursor:
+                break
+        self.assertEqual(seen, [f"re{i}" for i in range(7)])
+
+        data = json.loads(
+            self.client.get(f"/comments/{self.replies[0].id}/replies/list/").content
+        )
+        self.assertEqual([r["content"] for r in data["replies"]], ["deep"])
+
+    def test_replies_endpoint_unknown_comment(self):
+        response = self.client.get("/comments/not-a-uuid/replies/list/")
+        self.assertEqual(response.status_code, 404)
+
+
+class CommentReactionServiceTests(TestCase):
+    """Tests for the atomic comment like/dislike toggle"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="reactor", password="pass")
+        self.post = Post.objects.create(user=self.user, title="P", content="c")
+        self.comment = Comment.objects.create(
+            user=self.user, post=self.post, content="react"
+        )
+
+    def test_toggle_cycle_returns_fresh_counts(self):
+        from .reactions import toggle_comment_reaction
+
+        result = toggle_comment_reaction(self.user, self.comment, "like")
+        self.assertEqual((result["action"], result["likes_count"]), ("liked", 1))
+        result = toggle_comment_reaction(self.user, self.comment, "dislike")
+        self.assertEqual(
+            (result["likes_count"], result["dislikes_count"]), (0, 1)
+        )
+        result = toggle_comment_reaction(self.user, self.comment, "dislike")
+        self.assertEqual(result["action"], "undisliked")
+        self.assertIsNone(result["user_interaction"])
+
+        self.comment.refresh_from_db()
+        self.assertEqual((self.comment.likes_count, self.comment.dislikes_count), (0, 0))
+        self.assertFalse(CommentInteraction.objects.exists())
+
+    def test_counter_update_does_not_overwrite_other_columns(self):
+        from .reactions import toggle_comment_reaction
+
+        stale = Comment.objects.get(pk=self.comment.pk)
+        Comment.objects.filter(pk=self.comment.pk).update(content="edited")
+        toggle_comment_reaction(self.user, stale, "like")
+        self.comment.refresh_from_db()
+        self.assertEqual(self.comment.content, "edited")
+        self.assertEqual(self.comment.likes_count, 1)
+
+    def test_stale_edit_and_delete_keep_counters(self):
+        from .reactions import toggle_comment_reaction
+
+        stale = Comment.objects.get(pk=self.comment.pk)
+        toggle_comment_reaction(self.user, self.comment, "like")
+
+        self.client.login(username="reactor", password="pass")
+        response = self.client.put(
+            reverse("comment:comment-detail", args=[str(self.comment.pk)]),
+            data=json.dumps({"content": "diedit"}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        stale.delete()
+        self.comment.refresh_from_db()
+        self.assertEqual(
+            (self.comment.content, self.comment.is_deleted, self.comment.likes_count),
+            ("diedit", True, 1),
+        )
+
+    def test_second_delete_of_stale_copy_does_not_decrement_again(self):
+        Comment.objects.create(user=self.user, post=self.post, content="lain")
+        first = Comment.objects.get(pk=self.comment.pk)
+        second = Comment.objects.get(pk=self.comment.pk)
+        first.delete()
+        second.delete()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 1)
+
+
+class CommentReactionConcurrencyTests(TransactionTestCase):
+    """Concurrent likes from many threads must keep counters exact"""
+
+    THREADS = 8
+
+    def setUp(self):
+        owner = User.objects.create_user(username="owner", password="pass")
+        post = Post.objects.create(user=owner, title="P", content="c")
+        self.comment = Comment.objects.create(user=owner, post=post, content="hot")
+        self.users = [
+            User.objects.create_user(username=f"clicker{i}", password="pass")
+            for i in range(self.THREADS)
+        ]
+
+    def _run_concurrently(self, work):
+        import threading
+        import time
+
+        from django.db import connection
+
+        barrier = threading.Barrier(self.THREADS)
+        errors = []
+
+        def runner(user):
+            from django.db import OperationalError
+
+            try:
+                barrier.wait()
+                for attempt in range(200):
+                    try:
+                        work(user)
+                        break
+                    except OperationalError as e:
+                        # Test DB SQLite (in-memory, shared cache) menolak penulis
+                        # bersamaan alih-alih menunggu; transaksi sudah di-rollback
+                        # utuh sehingga aman diulang. PostgreSQL cukup menunggu lock.
+                        if "locked" not in str(e):
+                            raise
+                        time.sleep(0.01)
+                else:
+                    raise AssertionError("database tetap terkunci")
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=runner, args=(u,)) for u in self.users]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def test_concurrent_likes_and_switches_stay_exact(self):
+        from .reactions import toggle_comment_reaction
+
+        def like(user):
+            comment = Comment.objects.get(pk=self.comment.pk)
+            toggle_comment_reaction(user, comment, "like")
+
+        self._run_concurrently(like)
+        self.comment.refresh_from_db()
+        self.assertEqual(self.comment.likes_count, self.THREADS)
+
+        def switch(user):
+            comment = Comment.objects.get(pk=self.comment.pk)
+            toggle_comment_reaction(user, comment, "dislike")
+
+        self._run_concurrently(switch)
+        self.comment.refresh_from_db()
+        self.assertEqual(
+            (self.comment.likes_count, self.comment.dislikes_count), (0, self.THREADS)
+        )
+        self.assertEqual(
+            CommentInteraction.objects.filter(interaction_type="dislike").count(),
+            self.THREADS,
+        )
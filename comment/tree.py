@@ -0,0 +1,205 @@
+# comment/tree.py
+"""
+Loader pohon komentar untuk CommentAPIView.
+
+Semua komentar (yang tidak terhapus) dari satu post diambil dalam satu query,
+lalu disusun menjadi pohon parent/reply di Python dalam O(n) tanpa rekursi,
+sehingga kedalaman nesting berapa pun tidak menambah round trip. Interaksi
+viewer dan foto profil dimuat sekaligus untuk seluruh pohon.
+Balasan dari komentar yang sudah dihapus ikut tersembunyi bersama induknya.
+
+Untuk thread besar, load_comment_page() hanya memuat N balasan pertama per
+komentar (plus reply_count) sehingga ukuran payload tetap terbatas.
+"""
+from django.conf import settings
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
+
+from profil.photos import user_photo_urls
+
+from .models import Comment, CommentInteraction
+
+# Field yang boleh dipakai untuk ?sort_by= (dengan atau tanpa "-")
+SORTABLE_FIELDS = {"created_at", "updated_at", "likes_count", "dislikes_count"}
+
+
+def can_manage_all_comments(user):
+    return bool(
+        user.is_authenticated
+        and (user.is_superuser or user.has_perm("comment.manage_all_comments"))
+    )
+
+
+def normalize_sort(sort_by, default="-created_at"):
+    """Kembalikan sort_by jika valid, selain itu default"""
+    if sort_by and sort_by.lstrip("-") in SORTABLE_FIELDS:
+        return sort_by
+    return default
+
+
+def sort_comments(comments, sort_by):
+    field = sort_by.lstrip("-")
+    descending = sort_by.startswith("-")
+    # pk sebagai tie-breaker agar urutan stabil
+    return sorted(
+        comments, key=lambda c: (getattr(c, field), str(c.pk)), reverse=descending
+    )
+
+
+def viewer_comment_interactions(viewer, comment_ids):
+    """{comment_id: "like"/"dislike"} untuk viewer, dalam satu query"""
+    comment_ids = list(comment_ids)
+    if not viewer.is_authenticated or not comment_ids:
+        return {}
+    return dict(
+        CommentInteraction.objects.filter(
+            user=viewer, comment_id__in=comment_ids
+        ).values_list("comment_id", "interaction_type")
+    )
+
+
+def comment_serializer(viewer, comments):
+    """
+    Siapkan konteks bersama (interaksi viewer, foto profil, izin) untuk
+    `comments` dalam jumlah query konstan, lalu kembalikan fungsi yang
+    mengubah satu Comment menjadi dict.
+    """
+    comments = list(comments)
+    interactions = viewer_comment_interactions(viewer, [c.pk for c in comments])
+    photos = user_photo_urls(c.user for c in comments)
+    is_superuser = can_manage_all_comments(viewer)
+    viewer_id = viewer.id if viewer.is_authenticated else None
+
+    def serialize(comment):
+        return {
+            "id": comment.id,
+            "parent_id": comment.parent_id,
+            "content": comment.content,
+            "emoji": comment.emoji,
+            "user": comment.user.username,
+            "user_id": comment.user_id,
+            "profile_photo": photos.get(comment.user_id),
+            "created_at": comment.created_at.isoformat(),
+            "updated_at": comment.updated_at.isoformat(),
+            "likes_count": comment.likes_count,
+            "dislikes_count": comment.dislikes_count,
+            "user_interaction": interactions.get(comment.pk),
+            "can_edit": comment.user_id == viewer_id or is_superuser,
+            "replies": [],
+        }
+
+    return serialize
+
+
+def load_comment_tree(post_id, viewer, roots=None, sort_by="-created_at"):
+    """
+    Susun pohon komentar untuk post_id dan kembalikan list dict top-level,
+    masing-masing dengan "replies" bersarang (balasan urut dari yang terlama).
+
+    `roots` boleh diberikan (mis. satu halaman hasil cursor pagination atau
+    satu komentar tertentu); jika tidak, semua komentar top-level dipakai dan
+    diurutkan dengan sort_by.
+    """
+    comments = list(
+        Comment.objects.filter(post_id=post_id, is_deleted=False)
+        .select_related("user__profile")
+        .order_by("created_at", "pk")
+    )
+    children = {}
+    for comment in comments:
+        children.setdefault(comment.parent_id, []).append(comment)
+
+    if roots is None:
+        roots = sort_comments(children.get(None, []), normalize_sort(sort_by))
+
+    # Kumpulkan semua node yang terjangkau dari roots (BFS, tanpa rekursi)
+    reachable = list(roots)
+    index = 0
+    while index < len(reachable):
+        reachable.extend(children.get(reachable[index].pk, []))
+        index += 1
+
+    serialize = comment_serializer(viewer, reachable)
+    nodes = {comment.pk: serialize(comment) for comment in reachable}
+    # reachable berurutan BFS, jadi induk selalu sudah ada sebelum anaknya
+    for comment in reachable[len(roots):]:
+        nodes[comment.parent_id]["replies"].append(nodes[comment.pk])
+    return [nodes[root.pk] for root in roots]
+
+
+def reply_preview_limit(request, default=None):
+    """Jumlah balasan preview dari ?replies= (0-20)"""
+    if default is None:
+        default = getattr(settings, "COMMENT_REPLY_PREVIEW", 3)
+    try:
+        return min(max(int(request.GET.get("replies", default)), 0), 20)
+    except ValueError:
+        return default
+
+
+def reply_counts(parent_ids):
+    """{parent_id: jumlah balasan langsung yang tidak terhapus}, satu query"""
+    parent_ids = list(parent_ids)
+    if not parent_ids:
+        return {}
+    return dict(
+        Comment.objects.filter(parent_id__in=parent_ids, is_deleted=False)
+        .order_by()
+        .values("parent_id")
+        .annotate(total=Count("pk"))
+        .values_list("parent_id", "total")
+    )
+
+
+def reply_previews(parent_ids, limit):
+    """
+    N balasan langsung pertama (terlama lebih dulu) untuk setiap parent, dalam
+    satu query memakai ROW_NUMBER() per parent.
+    """
+    parent_ids = list(parent_ids)
+    if not parent_ids or limit <= 0:
+        return {}
+    rows = (
+        Comment.objects.filter(parent_id__in=parent_ids, is_deleted=False)
+        .select_related("user__profile")
+        .annotate(
+            position=Window(
+                RowNumber(),
+                partition_by=[F("parent_id")],
+                order_by=[F("created_at").asc(), F("pk").asc()],
+            )
+        )
+        .filter(position__lte=limit)
+        .order_by("created_at", "pk")
+    )
+    previews = {}
+    for reply in rows:
+        previews.setdefault(reply.parent_id, []).append(reply)
+    return previews
+
+
+def load_comment_page(comments, viewer, preview=3):
+    """
+    Serialisasi satu halaman komentar dengan ukuran payload terbatas: tiap
+    komentar membawa `reply_count`, paling banyak `preview` balasan langsung,
+    dan `has_more_replies`. Balasan yang lebih dalam atau di luar preview
+    diambil lewat endpoint <comment_id>/replies/list/. Jumlah query konstan.
+    """
+    comments = list(comments)
+    previews = reply_previews([c.pk for c in comments], preview)
+    preview_replies = [reply for replies in previews.values() for reply in replies]
+    counts = reply_counts([c.pk for c in comments + preview_replies])
+    serialize = comment_serializer(viewer, comments + preview_replies)
+
+    def node(comment):
+        data = serialize(comment)
+        data["reply_count"] = counts.get(comment.pk, 0)
+        return data
+
+    page = []
+    for comment in comments:
+        data = node(comment)
+        data["replies"] = [node(reply) for reply in previews.get(comment.pk, [])]
+        data["has_more_replies"] = data["reply_count"] > len(data["replies"])
+        page.append(data)
+    return page
@@ -15,6 +15,8 @@ urlpatterns = [
         views.CommentAPIView.as_view(),
         name="comment-list-create",
     ),
+    # Streaming dump (harus sebelum <comment_id>/ agar tidak tertangkap sebagai id)
+    path("json/", show_json, name="show_json"),
     # Get, Update, Delete specific comment
     path("<str:comment_id>/", views.CommentAPIView.as_view(), name="comment-detail"),
     # Comment interactions (like, report)
@@ -41,7 +43,7 @@ urlpatterns = [
     # Get replies for a comment
     path(
         "<str:comment_id>/replies/list/",
-        views.CommentAPIView.as_view(),
+        views.comment_replies,
         name="comment-replies-list",
     ),
     # =============================================
@@ -65,5 +67,4 @@ urlpatterns = [
         views.CommentAPIView.as_view(),
         name="user-liked-comments",
     ),
-    path("json/", show_json, name="show_json"),
 ]
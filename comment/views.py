@@ -2,6 +2,7 @@
 import json
 from django.http import JsonResponse
 from django.views import View
+from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt, csrf_protect
 from django.shortcuts import redirect
@@ -9,10 +10,33 @@ from django.contrib import messages
 from django.views.decorators.http import require_http_methods
 from django.db.models import Q
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
 from .models import Comment, CommentInteraction
-from profil.models import Profile
+from .reactions import toggle_comment_reaction
+from .tree import (
+    load_comment_page,
+    load_comment_tree,
+    normalize_sort,
+    reply_preview_limit,
+)
 from post.models import Post
 from report.models import Report
+from smash.export import (
+    InvalidSince,
+    export_response,
+    iter_rows,
+    parse_since,
+    stream_json_sections,
+    stream_ndjson,
+    wants_ndjson,
+)
+from smash.pagination import (
+    InvalidCursor,
+    InvalidPageParam,
+    paginate_by_cursor,
+    per_page_param,
+    wants_cursor,
+)
 
 User = get_user_model()
 
@@ -39,126 +63,58 @@ class CommentAPIView(View):
         AJAX Support: ✅
         """
         try:
-            profile_cache = {}
-
-            def get_profile_photo_url(user):
-                if user.id in profile_cache:
-                    return profile_cache[user.id]
-                profile = Profile.objects.filter(user=user).first()
-                url = (
-                    profile.profile_photo.url
-                    if profile and profile.profile_photo
-                    else None
-                )
-                profile_cache[user.id] = url
-                return url
-
             if comment_id:
-                # Get single comment
-                comment = Comment.objects.get(id=comment_id, is_deleted=False)
-
-                comment_data = {
-                    "id": comment.id,
-                    "content": comment.content,
-                    "emoji": comment.emoji,
-                    "user": comment.user.username,
-                    "user_id": comment.user.id,
-                    "post_id": comment.post.id,
-                    "parent_id": comment.parent.id if comment.parent else None,
-                    "created_at": comment.created_at.isoformat(),
-                    "updated_at": comment.updated_at.isoformat(),
-                    "likes_count": comment.likes_count,
-                    "is_reply": comment.is_reply,
-                    "profile_photo": get_profile_photo_url(comment.user),
-                    "can_edit": self.get_user_permissions(request.user, comment)[0]
-                    or self.get_user_permissions(request.user, comment)[1],
-                    "replies": [],
-                }
-
-                # Include replies jika ada
-                if comment.replies.filter(is_deleted=False).exists():
-                    for reply in comment.replies.filter(is_deleted=False):
-                        comment_data["replies"].append(
-                            {
-                                "id": reply.id,
-                                "content": reply.content,
-                                "user": reply.user.username,
-                                "profile_photo": get_profile_photo_url(reply.user),
-                                "created_at": reply.created_at.isoformat(),
-                            }
-                        )
-
+                # Get single comment beserta seluruh balasannya
+                comment = Comment.objects.select_related("user__profile").get(
+                    id=comment_id, is_deleted=False
+                )
+                comment_data = load_comment_tree(
+                    comment.post_id, request.user, roots=[comment]
+                )[0]
+                comment_data.update(
+                    {
+                        "post_id": comment.post_id,
+                        "is_reply": comment.is_reply,
+                    }
+                )
                 return JsonResponse({"status": "success", "comment": comment_data})
 
             elif post_id:
                 # Get all comments untuk post tertentu
                 post = Post.objects.get(id=post_id, is_deleted=False)
-
-                # Filter dan ordering
-                sort_by = request.GET.get("sort_by", "-created_at")
-                comments = Comment.objects.filter(
-                    post=post,
-                    is_deleted=False,
-                    parent__isnull=True,  # Hanya parent comments
-                ).order_by(sort_by)
-
-                comments_data = []
-                for comment in comments:
-                    # Get user's interaction with this comment
-                    user_interaction = None
-                    if request.user.is_authenticated:
-                        try:
-                            interaction = CommentInteraction.objects.get(
-                                user=request.user, comment=comment
-                            )
-                            user_interaction = interaction.interaction_type
-                        except CommentInteraction.DoesNotExist:
-                            pass
-
-                    comment_data = {
-                        "id": comment.id,
-                        "content": comment.content,
-                        "emoji": comment.emoji,
-                        "user": comment.user.username,
-                        "user_id": comment.user.id,
-                        "profile_photo": get_profile_photo_url(comment.user),
-                        "created_at": comment.created_at.isoformat(),
-                        "updated_at": comment.updated_at.isoformat(),
-                        "likes_count": comment.likes_count,
-                        "dislikes_count": comment.dislikes_count,
-                        "user_interaction": user_interaction,
-                        "can_edit": self.get_user_permissions(request.user, comment)[0]
-                        or self.get_user_permissions(request.user, comment)[1],
-                        "replies": [],
-                    }
-
-                    # Include replies
-                    replies = comment.replies.filter(is_deleted=False).order_by(
-                        "created_at"
+                sort_by = normalize_sort(request.GET.get("sort_by"))
+
+                # Mode cursor (opt-in): keyset pada (created_at, id), tanpa COUNT(*).
+                # Tiap komentar hanya membawa ?replies= balasan pertama + reply_count.
+                if wants_cursor(request):
+                    per_page = per_page_param(request, 20)
+                    roots, next_cursor = paginate_by_cursor(
+                        Comment.objects.filter(
+                            post=post, is_deleted=False, parent__isnull=True
+                        ).select_related("user__profile"),
+                        request.GET.get("cursor"),
+                        per_page,
+                    )
+                    return JsonResponse(
+                        {
+                            "status": "success",
+                            "comments": load_comment_page(
+                                roots, request.user, reply_preview_limit(request)
+                            ),
+                            "pagination": {
+                                "per_page": per_page,
+                                "next_cursor": next_cursor,
+                                "has_next": next_cursor is not None,
+                            },
+                        }
                     )
-                    for reply in replies:
-                        comment_data["replies"].append(
-                            {
-                                "id": reply.id,
-                                "content": reply.content,
-                                "user": reply.user.username,
-                                "user_id": reply.user.id,
-                                "profile_photo": get_profile_photo_url(reply.user),
-                                "created_at": reply.created_at.isoformat(),
-                                "can_edit": self.get_user_permissions(
-                                    request.user, reply
-                                )[0]
-                                or self.get_user_permissions(request.user, reply)[1],
-                            }
-                        )
-
-                    comments_data.append(comment_data)
 
+                comments_data = load_comment_tree(post.id, request.user, sort_by=sort_by)
                 return JsonResponse(
                     {
                         "status": "success",
                         "comments": comments_data,
-                        "total_comments": comments.count(),
+                        "total_comments": len(comments_data),
                     }
                 )
 
@@ -176,6 +132,8 @@ class CommentAPIView(View):
                 {"status": "error", "message": "Post atau komentar tidak ditemukan"},
                 status=404,
             )
+        except (InvalidCursor, InvalidPageParam) as e:
+            return JsonResponse({"status": "error", "message": str(e)}, status=400)
         except Exception as e:
             return JsonResponse(
                 {"status": "error", "message": f"Error retrieving comments: {str(e)}"},
@@ -282,13 +240,14 @@ class CommentAPIView(View):
 
             data = json.loads(request.body)
 
-            # Update fields
+            # Update fields; counter like/dislike dijaga bump_comment_counters
+            # sehingga tidak ikut ditulis dari instance ini
             if "content" in data:
                 comment.content = data["content"]
             if "emoji" in data:
                 comment.emoji = data["emoji"]
 
-            comment.save()
+            comment.save(update_fields=["content", "emoji", "updated_at"])
 
             return JsonResponse(
                 {
@@ -382,120 +341,11 @@ class CommentInteractionView(View):
             comment = Comment.objects.get(id=comment_id, is_deleted=False)
             data = json.loads(request.body) if request.body else {}
 
-            if action == "like":
-                # Check if user already has an interaction with this comment
-                interaction, created = CommentInteraction.objects.get_or_create(
-                    user=request.user,
-                    comment=comment,
-                    defaults={"interaction_type": "like"},
-                )
-
-                if not created:
-                    # User already interacted with this comment
-                    if interaction.interaction_type == "like":
-                        # Unlike: remove the interaction
-                        interaction.delete()
-                        comment.likes_count = max(0, comment.likes_count - 1)
-                        comment.save()
-
-                        return JsonResponse(
-                            {
-                                "status": "success",
-                                "message": "Like removed",
-                                "action": "unliked",
-                                "likes_count": comment.likes_count,
-                                "dislikes_count": comment.dislikes_count,
-                            }
-                        )
-                    else:
-                        # User had disliked, now switching to like
-                        interaction.interaction_type = "like"
-                        interaction.save()
-                        comment.dislikes_count = max(0, comment.dislikes_count - 1)
-                        comment.likes_count += 1
-                        comment.save()
-
-                        return JsonResponse(
-                            {
-                                "status": "success",
-                                "message": "Changed to like",
-                                "action": "liked",
-                                "likes_count": comment.likes_count,
-                                "dislikes_count": comment.dislikes_count,
-                            }
-                        )
-                else:
-                    # New like
-                    comment.likes_count += 1
-                    comment.save()
-
-                    return JsonResponse(
-                        {
-                            "status": "success",
-                            "message": "Komentar berhasil disukai",
-                            "action": "liked",
-                            "likes_count": comment.likes_count,
-                            "dislikes_count": comment.dislikes_count,
-                        }
-                    )
-
-            elif action == "dislike":
-                # Check if user already has an interaction with this comment
-                interaction, created = CommentInteraction.objects.get_or_create(
-                    user=request.user,
-                    comment=comment,
-                    defaults={"interaction_type": "dislike"},
+            if action in ("like", "dislike"):
+                return JsonResponse(
+                    toggle_comment_reaction(request.user, comment, action)
                 )
 
-                if not created:
-                    # User already interacted with this comment
-                    if interaction.interaction_type == "dislike":
-                        # Undislike: remove the interaction
-                        interaction.delete()
-                        comment.dislikes_count = max(0, comment.dislikes_count - 1)
-                        comment.save()
-
-                        return JsonResponse(
-                            {
-                                "status": "success",
-                                "message": "Dislike removed",
-                                "action": "undisliked",
-                                "likes_count": comment.likes_count,
-                                "dislikes_count": comment.dislikes_count,
-                            }
-                        )
-                    else:
-                        # User had liked, now switching to dislike
-                        interaction.interaction_type = "dislike"
-                        interaction.save()
-                        comment.likes_count = max(0, comment.likes_count - 1)
-                        comment.dislikes_count += 1
-                        comment.save()
-
-                        return JsonResponse(
-                            {
-                                "status": "success",
-                                "message": "Changed to dislike",
-                                "action": "disliked",
-                                "likes_count": comment.likes_count,
-                                "dislikes_count": comment.dislikes_count,
-                            }
-                        )
-                else:
-                    # New dislike
-                    comment.dislikes_count += 1
-                    comment.save()
-
-                    return JsonResponse(
-                        {
-                            "status": "success",
-                            "message": "Komentar berhasil di-dislike",
-                            "action": "disliked",
-                            "likes_count": comment.likes_count,
-                            "dislikes_count": comment.dislikes_count,
-                        }
-                    )
-
             elif action == "report":
                 # Handle report action
                 report = Report.objects.create(
@@ -545,55 +395,9 @@ def comment_interaction_web(request, comment_id, action):
         data = json.loads(request.body) if request.body else {}
 
         # Reuse logic from CommentInteractionView (like/dislike/report)
-        if action == "like":
-            interaction, created = CommentInteraction.objects.get_or_create(
-                user=request.user,
-                comment=comment,
-                defaults={"interaction_type": "like"},
-            )
-
-            if not created:
-                if interaction.interaction_type == "like":
-                    interaction.delete()
-                    comment.likes_count = max(0, comment.likes_count - 1)
-                    comment.save()
-                    messages.success(request, "Like removed")
-                else:
-                    interaction.interaction_type = "like"
-                    interaction.save()
-                    comment.dislikes_count = max(0, comment.dislikes_count - 1)
-                    comment.likes_count += 1
-                    comment.save()
-                    messages.success(request, "Changed to like")
-            else:
-                comment.likes_count += 1
-                comment.save()
-                messages.success(request, "Komentar berhasil disukai")
-
-        elif action == "dislike":
-            interaction, created = CommentInteraction.objects.get_or_create(
-                user=request.user,
-                comment=comment,
-                defaults={"interaction_type": "dislike"},
-            )
-
-            if not created:
-                if interaction.interaction_type == "dislike":
-                    interaction.delete()
-                    comment.dislikes_count = max(0, comment.dislikes_count - 1)
-                    comment.save()
-                    messages.success(request, "Dislike removed")
-                else:
-                    interaction.interaction_type = "dislike"
-                    interaction.save()
-                    comment.likes_count = max(0, comment.likes_count - 1)
-                    comment.dislikes_count += 1
-                    comment.save()
-                    messages.success(request, "Changed to dislike")
-            else:
-                comment.dislikes_count += 1
-                comment.save()
-                messages.success(request, "Komentar berhasil di-dislike")
+        if action in ("like", "dislike"):
+            result = toggle_comment_reaction(request.user, comment, action)
+            messages.success(request, result["message"])
 
         elif action == "report":
             report = Report.objects.create(
@@ -617,37 +421,105 @@ def comment_interaction_web(request, comment_id, action):
         return redirect(request.META.get("HTTP_REFERER", "/"))
 
 
-def show_json(request):
-    comment_list = Comment.objects.all()
-    interaction_list = CommentInteraction.objects.all()
-    comments_data = [
-        {
-            "id": str(comment.id),
-            "post_id": comment.post.id,
-            "parent_id": comment.parent.id,
-            "user_id": comment.user_id,
-            "content": comment.content,
-            "emoji": comment.emoji,
-            "created_at": (
-                comment.created_at.isoformat() if comment.created_at else None
-            ),
-            "updated_at": (
-                comment.updated_at.isoformat() if comment.updated_at else None
+def comment_replies(request, comment_id):
+    """
+    GET balasan langsung dari satu komentar, terlama lebih dulu, dengan cursor
+    pagination (?cursor=&per_page=). Setiap balasan membawa preview balasannya
+    sendiri (?replies=) dan reply_count sehingga thread bisa dibuka bertahap.
+    """
+    if request.method != "GET":
+        return JsonResponse(
+            {"status": "error", "message": "Method tidak diizinkan"}, status=405
+        )
+    try:
+        parent = Comment.objects.get(id=comment_id, is_deleted=False)
+        per_page = per_page_param(request, 20)
+        replies, next_cursor = paginate_by_cursor(
+            Comment.objects.filter(parent=parent, is_deleted=False).select_related(
+                "user__profile"
             ),
-            "is_deleted": comment.is_deleted,
-            "likes_count": comment.likes_count,
-            "dislikes_count": comment.dislikes_count,
-        }
-        for comment in comment_list
-    ]
-    interaction_data = [
+            request.GET.get("cursor"),
+            per_page,
+            descending=False,
+        )
+    except (Comment.DoesNotExist, ValidationError):
+        return JsonResponse(
+            {"status": "error", "message": "Komentar tidak ditemukan"}, status=404
+        )
+    except (InvalidCursor, ValueError) as e:
+        return JsonResponse({"status": "error", "message": str(e)}, status=400)
+
+    return JsonResponse(
         {
-            "comment_id": str(interaction.comment.id),
-            "user_id": interaction.user_id,
-            "interaction_type": interaction.interaction_type,
-            "created_at": (
-                interaction.created_at.isoformat() if interaction.created_at else None
+            "status": "success",
+            "parent_id": parent.id,
+            "replies": load_comment_page(
+                replies, request.user, reply_preview_limit(request)
             ),
+            "pagination": {
+                "per_page": per_page,
+                "next_cursor": next_cursor,
+                "has_next": next_cursor is not None,
+            },
         }
-        for interaction in interaction_list
+    )
+
+
+def show_json(request):
+    """
+    Dump seluruh komentar dan interaksinya sebagai JSON yang di-stream.
+    Mendukung ?format=ndjson dan ?since=<ISO datetime> untuk export incremental.
+
+    ?since= hanya berlaku untuk komentar (dibuat, diedit atau di-soft delete
+    setelah waktu itu, lewat updated_at). Interaksi tidak ikut di export
+    incremental: perpindahan like/dislike mengubah baris yang sama dan
+    pembatalan menghapusnya, jadi tidak bisa dideteksi dari created_at. Client
+    yang butuh interaksi harus mengambil dump penuh (tanpa since). Counter
+    like/dislike pada baris komentar juga tidak menggeser updated_at.
+    """
+    try:
+        since = parse_since(request)
+    except InvalidSince as e:
+        return JsonResponse({"status": "error", "message": str(e)}, status=400)
+
+    started_at = timezone.now()
+    comments = Comment.objects.order_by("updated_at", "pk")
+    if since is not None:
+        comments = comments.filter(updated_at__gt=since)
+
+    sections = [
+        (
+            "comments",
+            iter_rows(
+                comments,
+                [
+                    "id",
+                    "post_id",
+                    "parent_id",
+                    "user_id",
+                    "content",
+                    "emoji",
+                    "created_at",
+                    "updated_at",
+                    "is_deleted",
+                    "likes_count",
+                    "dislikes_count",
+                ],
+            ),
+        ),
     ]
+    if since is None:
+        sections.append(
+            (
+                "interactions",
+                iter_rows(
+                    CommentInteraction.objects.order_by("created_at", "pk"),
+                    ["comment_id", "user_id", "interaction_type", "created_at"],
+                ),
+            )
+        )
+    ndjson = wants_ndjson(request)
+    chunks = (
+        stream_ndjson(sections, tagged=True) if ndjson else stream_json_sections(sections)
+    )
+    return export_response(chunks, ndjson, started_at)
@@ -0,0 +1,10 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("name", "status", "attempts", "run_after", "finished_at", "created_at")
+    list_filter = ("status", "name")
+    readonly_fields = ("locked_at", "finished_at", "last_error", "created_at")
@@ -0,0 +1,57 @@
+# jobs/management/commands/run_jobs.py
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from jobs.queue import due_job_ids, purge_finished, requeue_stale, run_job_in_thread
+
+
+class Command(BaseCommand):
+    """
+    Worker antrian job (jobs/queue.py): ambil job pending yang jatuh tempo
+    dan jalankan di thread pool. Dipakai dengan JOBS_MODE=worker, dan juga
+    untuk menjalankan retry serta job yang tertinggal di mode lain.
+    """
+
+    help = "Run pending background jobs from the database-backed queue."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=getattr(settings, "JOBS_THREADS", 2),
+            help="Jumlah thread worker (default: JOBS_THREADS)",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2,
+            help="Jeda polling saat antrian kosong, dalam detik (default: 2)",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Jalankan semua job yang jatuh tempo lalu berhenti",
+        )
+
+    def handle(self, *args, **options):
+        workers = max(options["workers"], 1)
+        processed = 0
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="jobs") as pool:
+            try:
+                while True:
+                    requeue_stale()
+                    job_ids = due_job_ids(limit=workers * 10)
+                    if job_ids:
+                        list(pool.map(run_job_in_thread, job_ids))
+                        processed += len(job_ids)
+                        continue
+                    purge_finished()
+                    if options["once"]:
+                        break
+                    time.sleep(options["interval"])
+            except KeyboardInterrupt:
+                pass
+        self.stdout.write(f"{processed} job dijalankan")
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:48
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='Nama Task')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name='Argumen')),
+                ('status', models.CharField(choices=[('pending', 'Menunggu'), ('running', 'Berjalan'), ('done', 'Selesai'), ('failed', 'Gagal')], default='pending', max_length=10, verbose_name='Status')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Percobaan')),
+                ('max_attempts', models.PositiveSmallIntegerField(default=3, verbose_name='Maksimum Percobaan')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Jalan Setelah')),
+                ('locked_at', models.DateTimeField(blank=True, null=True, verbose_name='Diklaim Pada')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Selesai Pada')),
+                ('last_error', models.TextField(blank=True, verbose_name='Error Terakhir')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Waktu Dibuat')),
+            ],
+            options={
+                'verbose_name': 'Job',
+                'verbose_name_plural': 'Jobs',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['status', 'run_after'], name='job_status_run_after_idx')],
+            },
+        ),
+    ]
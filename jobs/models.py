@@ -0,0 +1,48 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """
+    Satu pekerjaan latar belakang di antrian berbasis tabel (jobs/queue.py).
+    Worker mengklaim job pending dengan UPDATE bersyarat sehingga tidak ada
+    job yang dijalankan dua kali bersamaan.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "Menunggu"),
+        (RUNNING, "Berjalan"),
+        (DONE, "Selesai"),
+        (FAILED, "Gagal"),
+    ]
+
+    name = models.CharField(max_length=100, verbose_name="Nama Task")
+    payload = models.JSONField(default=dict, blank=True, verbose_name="Argumen")
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=PENDING, verbose_name="Status"
+    )
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="Percobaan")
+    max_attempts = models.PositiveSmallIntegerField(
+        default=3, verbose_name="Maksimum Percobaan"
+    )
+    run_after = models.DateTimeField(default=timezone.now, verbose_name="Jalan Setelah")
+    locked_at = models.DateTimeField(null=True, blank=True, verbose_name="Diklaim Pada")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Selesai Pada")
+    last_error = models.TextField(blank=True, verbose_name="Error Terakhir")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Waktu Dibuat")
+
+    class Meta:
+        verbose_name = "Job"
+        verbose_name_plural = "Jobs"
+        ordering = ["id"]
+        indexes = [
+            # Worker mencari job pending yang sudah jatuh tempo
+            models.Index(fields=["status", "run_after"], name="job_status_run_after_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
@@ -0,0 +1,204 @@
+"""
+Antrian job lokal berbasis tabel database (tanpa broker eksternal).
+
+Task didaftarkan dengan @register("nama") lalu dijadwalkan dengan
+enqueue("nama", **argumen), yang menyimpan baris Job di transaksi yang sama.
+Setelah transaksi commit, job dijalankan sesuai settings.JOBS_MODE:
+
+- "thread" (default): thread pool di proses ini (JOBS_THREADS worker),
+  sehingga request tidak menunggu pekerjaan berat seperti olah gambar.
+- "sync": langsung di thread yang sama setelah commit (test, debugging).
+- "worker": hanya disimpan; `manage.py run_jobs` yang menjalankannya.
+
+`run_jobs` juga menjalankan job yang tertinggal di mode mana pun: job yang
+belum sempat dijalankan karena proses web berhenti, job yang macet di status
+running lebih lama dari JOBS_STALE_SECONDS, dan retry yang jatuh tempo.
+
+Job yang melempar exception dicoba lagi sampai max_attempts dengan jeda
+JOBS_RETRY_DELAY * 2^(percobaan-1) detik; setelah itu status menjadi failed
+dan callback on_failure task (jika ada) dipanggil dengan argumen yang sama.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_tasks = {}  # nama -> (fungsi, on_failure)
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def jobs_mode():
+    return getattr(settings, "JOBS_MODE", "thread")
+
+
+def retry_delay(attempts):
+    return getattr(settings, "JOBS_RETRY_DELAY", 10) * 2 ** max(attempts - 1, 0)
+
+
+def register(name, on_failure=None):
+    """Decorator untuk mendaftarkan fungsi sebagai task bernama `name`"""
+
+    def decorator(func):
+        _tasks[name] = (func, on_failure)
+        return func
+
+    return decorator
+
+
+def enqueue(task, /, **payload):
+    """
+    Simpan job baru untuk task bernama `task`; dijalankan setelah transaksi
+    saat ini commit. Argumen harus bisa diserialisasi ke JSON.
+    """
+    from .models import Job
+
+    if task not in _tasks:
+        raise ValueError(f"Task '{task}' tidak terdaftar")
+    job = Job.objects.create(
+        name=task,
+        payload=payload,
+        max_attempts=getattr(settings, "JOBS_MAX_ATTEMPTS", 3),
+    )
+    mode = jobs_mode()
+    if mode != "worker":
+        transaction.on_commit(lambda: _dispatch(job.pk, mode))
+    return job
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, "JOBS_THREADS", 2),
+                    thread_name_prefix="jobs",
+                )
+    return _executor
+
+
+def _dispatch(job_id, mode, delay=0):
+    if mode == "sync":
+        run_job(job_id)
+    elif delay:
+        timer = threading.Timer(delay, _dispatch, args=(job_id, mode))
+        timer.daemon = True
+        timer.start()
+    else:
+        _get_executor().submit(run_job_in_thread, job_id)
+
+
+def run_job_in_thread(job_id):
+    """run_job() untuk thread worker yang memakai koneksi database sendiri"""
+    close_old_connections()
+    try:
+        run_job(job_id)
+    except Exception:
+        logger.exception("Job #%s gagal dijalankan", job_id)
+    finally:
+        connections.close_all()
+
+
+def _claim(job_id):
+    """Ubah job pending yang jatuh tempo menjadi running; None jika sudah diambil"""
+    from .models import Job
+
+    now = timezone.now()
+    claimed = Job.objects.filter(pk=job_id, status=Job.PENDING, run_after__lte=now).update(
+        status=Job.RUNNING, locked_at=now, attempts=F("attempts") + 1
+    )
+    return Job.objects.filter(pk=job_id).first() if claimed else None
+
+
+def run_job(job_id):
+    """Jalankan satu job jika masih pending; kembalikan status akhirnya (atau None)"""
+    from .models import Job
+
+    job = _claim(job_id)
+    if job is None:
+        return None
+    func, on_failure = _tasks.get(job.name, (None, None))
+    try:
+        if func is None:
+            raise LookupError(f"Task '{job.name}' tidak terdaftar")
+        func(**job.payload)
+    except Exception as exc:
+        return _fail(job, exc, on_failure)
+
+    Job.objects.filter(pk=job.pk).update(
+        status=Job.DONE, finished_at=timezone.now(), locked_at=None, last_error=""
+    )
+    return Job.DONE
+
+
+def _fail(job, exc, on_failure):
+    from .models import Job
+
+    error = f"{type(exc).__name__}: {exc}"
+    if job.attempts < job.max_attempts:
+        delay = retry_delay(job.attempts)
+        logger.warning(
+            "Job %s #%s gagal (percobaan %d), dicoba lagi dalam %ss: %s",
+            job.name, job.pk, job.attempts, delay, error,
+        )
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.PENDING,
+            locked_at=None,
+            run_after=timezone.now() + timedelta(seconds=delay),
+            last_error=error,
+        )
+        if jobs_mode() == "thread":
+            _dispatch(job.pk, "thread", delay=delay)
+        return Job.PENDING
+
+    logger.error("Job %s #%s gagal permanen: %s", job.name, job.pk, error)
+    Job.objects.filter(pk=job.pk).update(
+        status=Job.FAILED, finished_at=timezone.now(), locked_at=None, last_error=error
+    )
+    if on_failure is not None:
+        try:
+            on_failure(**job.payload)
+        except Exception:
+            logger.exception("on_failure untuk job %s #%s gagal", job.name, job.pk)
+    return Job.FAILED
+
+
+def requeue_stale(stale_seconds=None):
+    """Kembalikan job running yang workernya mati ke pending; kembalikan jumlahnya"""
+    from .models import Job
+
+    if stale_seconds is None:
+        stale_seconds = getattr(settings, "JOBS_STALE_SECONDS", 600)
+    cutoff = timezone.now() - timedelta(seconds=stale_seconds)
+    return Job.objects.filter(status=Job.RUNNING, locked_at__lt=cutoff).update(
+        status=Job.PENDING, locked_at=None
+    )
+
+
+def due_job_ids(limit=100):
+    from .models import Job
+
+    return list(
+        Job.objects.filter(status=Job.PENDING, run_after__lte=timezone.now())
+        .order_by("run_after", "id")
+        .values_list("id", flat=True)[:limit]
+    )
+
+
+def purge_finished(keep_days=None):
+    """Hapus job done yang lebih tua dari JOBS_KEEP_DAYS; job gagal disimpan"""
+    from .models import Job
+
+    if keep_days is None:
+        keep_days = getattr(settings, "JOBS_KEEP_DAYS", 7)
+    cutoff = timezone.now() - timedelta(days=keep_days)
+    deleted, _ = Job.objects.filter(status=Job.DONE, finished_at__lt=cutoff).delete()
+    return deleted
@@ -0,0 +1,98 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from . import queue
+from .models import Job
+
+
+@override_settings(JOBS_MODE="sync", JOBS_RETRY_DELAY=0)
+class JobQueueTests(TestCase):
+    """jobs/queue.py: antrian job berbasis tabel dengan retry."""
+
+    def setUp(self):
+        self.calls = []
+        self.failures = []
+        self.addCleanup(queue._tasks.pop, "test.echo", None)
+        self.addCleanup(queue._tasks.pop, "test.flaky", None)
+
+        @queue.register("test.echo")
+        def echo(value):
+            self.calls.append(value)
+
+        @queue.register("test.flaky", on_failure=lambda value: self.failures.append(value))
+        def flaky(value):
+            self.calls.append(value)
+            raise RuntimeError("rusak")
+
+    def test_enqueued_job_runs_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            job = queue.enqueue("test.echo", value=1)
+        self.assertEqual((self.calls, job.status), ([], Job.PENDING))
+
+        for callback in callbacks:
+            callback()
+        job.refresh_from_db()
+        self.assertEqual(self.calls, [1])
+        self.assertEqual((job.status, job.attempts), (Job.DONE, 1))
+        # Job yang sudah selesai tidak dijalankan dua kali
+        self.assertIsNone(queue.run_job(job.pk))
+
+    def test_unknown_task_is_rejected(self):
+        with self.assertRaises(ValueError):
+            queue.enqueue("test.tidak_ada")
+
+    def test_failing_job_is_retried_then_marked_failed(self):
+        job = Job.objects.create(name="test.flaky", payload={"value": 7}, max_attempts=2)
+        with self.assertLogs("jobs.queue", "WARNING"):
+            self.assertEqual(queue.run_job(job.pk), Job.PENDING)
+        job.refresh_from_db()
+        self.assertEqual((job.attempts, job.last_error), (1, "RuntimeError: rusak"))
+        self.assertEqual(self.failures, [])
+
+        with self.assertLogs("jobs.queue", "ERROR"):
+            self.assertEqual(queue.run_job(job.pk), Job.FAILED)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 2))
+        self.assertEqual(self.failures, [7])
+
+
+@override_settings(JOBS_MODE="worker")
+class RunJobsCommandTests(TransactionTestCase):
+    """run_jobs memakai thread worker dengan koneksi database sendiri."""
+
+    def setUp(self):
+        self.calls = []
+        self.addCleanup(queue._tasks.pop, "test.echo", None)
+        queue.register("test.echo")(lambda value: self.calls.append(value))
+
+    def test_run_jobs_command_picks_up_due_and_stale_jobs(self):
+        due = Job.objects.create(name="test.echo", payload={"value": "due"})
+        Job.objects.create(
+            name="test.echo",
+            payload={"value": "later"},
+            run_after=timezone.now() + timedelta(hours=1),
+        )
+        stale = Job.objects.create(
+            name="test.echo",
+            payload={"value": "stale"},
+            status=Job.RUNNING,
+            locked_at=timezone.now() - timedelta(hours=1),
+        )
+        old = Job.objects.create(
+            name="test.echo",
+            payload={"value": "old"},
+            status=Job.DONE,
+            finished_at=timezone.now() - timedelta(days=30),
+        )
+
+        call_command("run_jobs", "--once", "--workers", "1", stdout=StringIO())
+        self.assertEqual(sorted(self.calls), ["due", "stale"])
+        self.assertEqual(
+            set(Job.objects.filter(pk__in=[due.pk, stale.pk]).values_list("status", flat=True)),
+            {Job.DONE},
+        )
+        self.assertFalse(Job.objects.filter(pk=old.pk).exists())
@@ -1,3 +1,10 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Notification
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ("recipient", "actor", "notification_type", "post", "is_read", "created_at")
+    list_filter = ("notification_type", "is_read")
+    raw_id_fields = ("recipient", "actor", "post", "comment")
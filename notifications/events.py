@@ -0,0 +1,124 @@
+"""
+Penulisan notifikasi pada saat event terjadi (fan-out on write).
+
+Dipanggil dari save()/delete() model PostInteraction, Comment dan
+CommentInteraction. User tidak pernah menerima notifikasi atas aksinya
+sendiri, dan like yang dibatalkan (atau diganti dislike) ikut menarik
+notifikasinya kembali.
+"""
+
+
+def _notification_model():
+    from .models import Notification
+
+    return Notification
+
+
+def notify(recipient_id, actor_id, notification_type, post_id, comment_id=None):
+    """Buat satu notifikasi, kecuali penerima adalah pelakunya sendiri"""
+    if recipient_id == actor_id:
+        return None
+    return _notification_model().objects.create(
+        recipient_id=recipient_id,
+        actor_id=actor_id,
+        notification_type=notification_type,
+        post_id=post_id,
+        comment_id=comment_id,
+    )
+
+
+def withdraw(actor_id, notification_type, post_id, comment_id=None):
+    """Hapus notifikasi like yang dibatalkan"""
+    _notification_model().objects.filter(
+        actor_id=actor_id,
+        notification_type=notification_type,
+        post_id=post_id,
+        comment_id=comment_id,
+    ).delete()
+
+
+def notify_many(actor_id, notification_type, targets):
+    """
+    Versi bulk notify(): satu INSERT untuk banyak target
+    (recipient_id, post_id, comment_id); target milik pelaku sendiri dilewati
+    """
+    Notification = _notification_model()
+    Notification.objects.bulk_create(
+        [
+            Notification(
+                recipient_id=recipient_id,
+                actor_id=actor_id,
+                notification_type=notification_type,
+                post_id=post_id,
+                comment_id=comment_id,
+            )
+            for recipient_id, post_id, comment_id in targets
+            if recipient_id != actor_id
+        ]
+    )
+
+
+def withdraw_many(actor_id, notification_type, post_ids=(), comment_ids=()):
+    """Versi bulk withdraw(): notifikasi like pada banyak post atau komentar"""
+    if post_ids:
+        _notification_model().objects.filter(
+            actor_id=actor_id,
+            notification_type=notification_type,
+            post_id__in=post_ids,
+            comment_id__isnull=True,
+        ).delete()
+    if comment_ids:
+        _notification_model().objects.filter(
+            actor_id=actor_id,
+            notification_type=notification_type,
+            comment_id__in=comment_ids,
+        ).delete()
+
+
+def post_reaction_changed(interaction, previous_type):
+    """PostInteraction dibuat/diubah: hanya like yang dinotifikasi"""
+    if interaction.interaction_type == previous_type:
+        return
+    if interaction.interaction_type == "like":
+        notify(
+            interaction.post.user_id, interaction.user_id, "like_post", interaction.post_id
+        )
+    elif previous_type == "like":
+        withdraw(interaction.user_id, "like_post", interaction.post_id)
+
+
+def comment_reaction_changed(interaction, previous_type):
+    """CommentInteraction dibuat/diubah/dihapus (previous_type -> tipe sekarang)"""
+    if interaction.interaction_type == previous_type:
+        return
+    comment = interaction.comment
+    if interaction.interaction_type == "like":
+        notify(
+            comment.user_id,
+            interaction.user_id,
+            "like_comment",
+            comment.post_id,
+            comment.pk,
+        )
+    elif previous_type == "like":
+        withdraw(interaction.user_id, "like_comment", comment.post_id, comment.pk)
+
+
+def comment_created(comment):
+    """
+    Komentar baru: pemilik post mendapat "comment"/"reply", dan pemilik
+    komentar induk mendapat "reply_to_comment". Jika keduanya orang yang
+    sama, cukup satu notifikasi "reply_to_comment".
+    """
+    post_owner_id = comment.post.user_id
+    parent_owner_id = comment.parent.user_id if comment.parent_id else None
+    if parent_owner_id is not None:
+        notify(parent_owner_id, comment.user_id, "reply_to_comment", comment.post_id, comment.pk)
+    if post_owner_id != parent_owner_id:
+        notify(
+            post_owner_id,
+            comment.user_id,
+            "reply" if comment.parent_id else "comment",
+            comment.post_id,
+            comment.pk,
+        )
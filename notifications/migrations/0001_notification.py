@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:15
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('comment', '0001_initial'),
+        ('post', '0006_posthotscore'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('notification_type', models.CharField(choices=[('like_post', 'Like pada post'), ('comment', 'Komentar pada post'), ('reply', 'Balasan pada post'), ('reply_to_comment', 'Balasan pada komentar'), ('like_comment', 'Like pada komentar')], max_length=20, verbose_name='Jenis Notifikasi')),
+                ('is_read', models.BooleanField(default=False, verbose_name='Sudah Dibaca?')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Waktu Dibuat')),
+                ('actor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications_sent', to=settings.AUTH_USER_MODEL, verbose_name='Pelaku')),
+                ('comment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='comment.comment', verbose_name='Komentar')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='post.post', verbose_name='Post')),
+                ('recipient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to=settings.AUTH_USER_MODEL, verbose_name='Penerima')),
+            ],
+            options={
+                'verbose_name': 'Notifikasi',
+                'verbose_name_plural': 'Notifikasi',
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['recipient', '-created_at'], name='notif_recipient_created_idx'), models.Index(condition=models.Q(('is_read', False)), fields=['recipient'], name='notif_recipient_unread_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,71 @@
+from django.db import migrations
+
+
+def backfill_notifications(apps, schema_editor):
+    """
+    Isi inbox dari interaksi dan komentar yang sudah ada, dengan aturan yang
+    sama seperti notifications/events.py. Semua ditandai sudah dibaca agar
+    counter unread tidak melonjak setelah deploy.
+    """
+    Notification = apps.get_model("notifications", "Notification")
+    PostInteraction = apps.get_model("post", "PostInteraction")
+    Comment = apps.get_model("comment", "Comment")
+    CommentInteraction = apps.get_model("comment", "CommentInteraction")
+
+    def rows():
+        likes = PostInteraction.objects.filter(interaction_type="like").values_list(
+            "post__user_id", "user_id", "post_id", "created_at"
+        )
+        for recipient_id, actor_id, post_id, created_at in likes.iterator(chunk_size=1000):
+            yield recipient_id, actor_id, "like_post", post_id, None, created_at
+
+        comments = Comment.objects.filter(is_deleted=False).values_list(
+            "pk", "user_id", "post_id", "post__user_id", "parent__user_id", "created_at"
+        )
+        for pk, actor_id, post_id, owner_id, parent_owner_id, created_at in comments.iterator(
+            chunk_size=1000
+        ):
+            if parent_owner_id is not None:
+                yield parent_owner_id, actor_id, "reply_to_comment", post_id, pk, created_at
+            if owner_id != parent_owner_id:
+                note_type = "comment" if parent_owner_id is None else "reply"
+                yield owner_id, actor_id, note_type, post_id, pk, created_at
+
+        comment_likes = CommentInteraction.objects.filter(
+            interaction_type="like"
+        ).values_list("comment__user_id", "user_id", "comment__post_id", "comment_id", "created_at")
+        for recipient_id, actor_id, post_id, comment_id, created_at in comment_likes.iterator(
+            chunk_size=1000
+        ):
+            yield recipient_id, actor_id, "like_comment", post_id, comment_id, created_at
+
+    batch = []
+    for recipient_id, actor_id, note_type, post_id, comment_id, created_at in rows():
+        if recipient_id == actor_id:
+            continue
+        batch.append(
+            Notification(
+                recipient_id=recipient_id,
+                actor_id=actor_id,
+                notification_type=note_type,
+                post_id=post_id,
+                comment_id=comment_id,
+                created_at=created_at,
+                is_read=True,
+            )
+        )
+        if len(batch) >= 1000:
+            Notification.objects.bulk_create(batch)
+            batch = []
+    Notification.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0001_notification"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_notifications, migrations.RunPython.noop),
+    ]
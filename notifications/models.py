@@ -1,3 +1,71 @@
+from django.contrib.auth import get_user_model
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+User = get_user_model()
+
+
+class Notification(models.Model):
+    """
+    Notifikasi yang ditulis saat event terjadi (fan-out on write), sehingga
+    inbox cukup dibaca lewat index (recipient, created_at) tanpa menggabungkan
+    tabel interaksi dan komentar setiap kali halaman dibuka.
+    """
+
+    TYPE_CHOICES = [
+        ("like_post", "Like pada post"),
+        ("comment", "Komentar pada post"),
+        ("reply", "Balasan pada post"),
+        ("reply_to_comment", "Balasan pada komentar"),
+        ("like_comment", "Like pada komentar"),
+    ]
+
+    recipient = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        verbose_name="Penerima",
+        related_name="notifications",
+    )
+    actor = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        verbose_name="Pelaku",
+        related_name="notifications_sent",
+    )
+    notification_type = models.CharField(
+        max_length=20, choices=TYPE_CHOICES, verbose_name="Jenis Notifikasi"
+    )
+    post = models.ForeignKey(
+        "post.Post",
+        on_delete=models.CASCADE,
+        verbose_name="Post",
+        related_name="notifications",
+    )
+    comment = models.ForeignKey(
+        "comment.Comment",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        verbose_name="Komentar",
+        related_name="notifications",
+    )
+    is_read = models.BooleanField(default=False, verbose_name="Sudah Dibaca?")
+    created_at = models.DateTimeField(default=timezone.now, verbose_name="Waktu Dibuat")
+
+    class Meta:
+        verbose_name = "Notifikasi"
+        verbose_name_plural = "Notifikasi"
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(
+                fields=["recipient", "-created_at"], name="notif_recipient_created_idx"
+            ),
+            models.Index(
+                fields=["recipient"],
+                condition=models.Q(is_read=False),
+                name="notif_recipient_unread_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.actor} -> {self.recipient}: {self.notification_type}"
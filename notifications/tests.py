@@ -1,3 +1,104 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
 
-# Create your tests here.
+from comment.models import Comment, CommentInteraction
+from post.models import Post, PostInteraction
+
+from .models import Notification
+
+User = get_user_model()
+
+
+class NotificationFanOutTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="pass")
+        self.fan = User.objects.create_user(username="fan", password="pass")
+        self.post = Post.objects.create(user=self.owner, title="Padel", content="c")
+
+    def types_for(self, user):
+        return list(
+            Notification.objects.filter(recipient=user)
+            .order_by("created_at", "id")
+            .values_list("notification_type", flat=True)
+        )
+
+    def test_like_is_written_and_withdrawn(self):
+        interaction = PostInteraction.objects.create(
+            user=self.fan, post=self.post, interaction_type="like"
+        )
+        self.assertEqual(self.types_for(self.owner), ["like_post"])
+
+        interaction.interaction_type = "dislike"
+        interaction.save()
+        self.assertEqual(self.types_for(self.owner), [])
+
+        interaction.interaction_type = "like"
+        interaction.save()
+        interaction.delete()
+        self.assertEqual(self.types_for(self.owner), [])
+
+    def test_comments_replies_and_comment_likes(self):
+        own = Comment.objects.create(user=self.owner, post=self.post, content="mine")
+        theirs = Comment.objects.create(user=self.fan, post=self.post, content="hi")
+        Comment.objects.create(user=self.fan, post=self.post, parent=own, content="re")
+        Comment.objects.create(user=self.owner, post=self.post, parent=theirs, content="re")
+        CommentInteraction.objects.create(
+            user=self.fan, comment=own, interaction_type="like"
+        )
+
+        self.assertEqual(
+            self.types_for(self.owner), ["comment", "reply_to_comment", "like_comment"]
+        )
+        self.assertEqual(self.types_for(self.fan), ["reply_to_comment"])
+
+    def test_self_actions_are_not_notified(self):
+        PostInteraction.objects.create(
+            user=self.owner, post=self.post, interaction_type="like"
+        )
+        Comment.objects.create(user=self.owner, post=self.post, content="me")
+        self.assertFalse(Notification.objects.exists())
+
+
+class NotificationApiTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="pass")
+        self.fan = User.objects.create_user(username="fan", password="pass")
+        self.post = Post.objects.create(user=self.owner, title="Padel", content="c")
+        self.comments = [
+            Comment.objects.create(user=self.fan, post=self.post, content=f"c{i}")
+            for i in range(3)
+        ]
+        self.client.login(username="owner", password="pass")
+
+    def test_cursor_pages_and_unread_count(self):
+        data = self.client.get("/notifications/api/?per_page=2").json()
+        self.assertEqual(len(data["notifications"]), 2)
+        self.assertEqual(data["notifications"][0]["content"], "c2")
+        self.assertEqual(data["unread_count"], 3)
+
+        cursor = data["pagination"]["next_cursor"]
+        data = self.client.get(f"/notifications/api/?per_page=2&cursor={cursor}").json()
+        self.assertEqual([n["content"] for n in data["notifications"]], ["c0"])
+        self.assertFalse(data["pagination"]["has_next"])
+
+    def test_since_returns_only_new_notifications(self):
+        since = self.client.get("/notifications/api/").json()["next_since"]
+        Comment.objects.create(user=self.fan, post=self.post, content="baru")
+
+        data = self.client.get("/notifications/api/", {"since": since}).json()
+        self.assertEqual([n["content"] for n in data["notifications"]], ["baru"])
+
+        data = self.client.get("/notifications/api/", {"since": data["next_since"]}).json()
+        self.assertEqual(data["notifications"], [])
+
+    def test_soft_deleted_content_is_hidden_and_mark_read(self):
+        self.comments[0].delete()
+        data = self.client.get("/notifications/api/").json()
+        self.assertEqual(len(data["notifications"]), 2)
+
+        self.client.post("/notifications/api/read/")
+        self.assertEqual(self.client.get("/notifications/api/").json()["unread_count"], 0)
+
+    def test_invalid_since(self):
+        response = self.client.get("/notifications/api/?since=nanti")
+        self.assertEqual(response.status_code, 400)
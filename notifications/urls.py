@@ -6,4 +6,5 @@ app_name = "notifications"
 urlpatterns = [
     path("", views.notifications_view, name="notifications"),
     path("api/", views.notifications_api, name="notifications_api"),
+    path("api/read/", views.mark_notifications_read, name="mark_notifications_read"),
 ]
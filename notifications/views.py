@@ -1,147 +1,70 @@
 from django.contrib.auth.decorators import login_required
+from django.db.models import Q
 from django.http import JsonResponse
 from django.shortcuts import render
 from django.urls import reverse
 from django.templatetags.static import static
-
-from comment.models import Comment, CommentInteraction
-from post.models import PostInteraction
-from profil.models import Profile
-
-
-def _safe_iter(qs):
-    iterator = qs.iterator()
-    while True:
-        try:
-            yield next(iterator)
-        except StopIteration:
-            break
-        except (ValueError, TypeError, AttributeError):
-            continue
-
-
-def _actor_photo(user, cache, default_photo):
-    if not user:
-        return default_photo
-    if user.id in cache:
-        return cache[user.id]
-    profile = Profile.objects.filter(user=user).first()
-    url = profile.profile_photo.url if profile and profile.profile_photo else default_photo
-    cache[user.id] = url
-    return url
-
-
-def build_notifications(user):
-    default_photo = static("images/user-profile.png")
-    cache = {}
-
-    post_interactions = (
-        PostInteraction.objects.filter(post__user=user, post__is_deleted=False)
-        .exclude(interaction_type="dislike")
-        .select_related("user", "post")
-        .order_by("-id")[:50]
+from django.views.decorators.http import require_POST
+
+from profil.photos import user_photo_urls
+from smash.export import InvalidSince, parse_since
+from smash.pagination import InvalidCursor, paginate_by_cursor
+
+from .models import Notification
+
+MESSAGES = {
+    "like_post": "liked your post",
+    "comment": "commented on your post",
+    "reply": "replied to a comment on your post",
+    "reply_to_comment": "replied to your comment",
+    "like_comment": "liked your comment",
+}
+
+
+def inbox(user):
+    """
+    Notifikasi milik user, dibaca lewat index (recipient, created_at).
+    Notifikasi untuk post/komentar yang sudah di-soft delete disembunyikan.
+    """
+    return (
+        Notification.objects.filter(recipient=user, post__is_deleted=False)
+        .filter(Q(comment__isnull=True) | Q(comment__is_deleted=False))
+        .select_related("actor__profile", "post", "comment")
     )
 
-    recent_comments = (
-        Comment.objects.filter(post__user=user, post__is_deleted=False, is_deleted=False)
-        .exclude(user=user)
-        .select_related("user", "post")
-        .order_by("-created_at")[:50]
-    )
 
-    replies_to_user_comments = (
-        Comment.objects.filter(parent__user=user, is_deleted=False, post__is_deleted=False)
-        .exclude(user=user)
-        .select_related("user", "post", "parent")
-        .order_by("-created_at")[:50]
-    )
+def unread_count(user):
+    return inbox(user).filter(is_read=False).count()
 
-    comment_interactions = (
-        CommentInteraction.objects.filter(comment__user=user)
-        .exclude(interaction_type="dislike")
-        .exclude(user=user)
-        .select_related("user", "comment", "comment__post")
-        .order_by("-created_at")[:50]
-    )
 
-    notifications = []
-
-    for pi in _safe_iter(post_interactions):
-        if pi.user_id == user.id or (pi.post and getattr(pi.post, "is_deleted", False)):
-            continue
-        notifications.append(
-            {
-                "type": f"{pi.interaction_type}_post",
-                "actor": pi.user.username,
-                "actor_profile_photo": _actor_photo(pi.user, cache, default_photo),
-                "actor_id": pi.user.id,
-                "post_title": pi.post.title,
-                "post_id": pi.post.id,
-                "message": f"@{pi.user.username} {pi.interaction_type}d your post",
-                "message_text": f"{pi.interaction_type}d your post",
-                "timestamp": getattr(pi, "created_at", None),
-            }
-        )
-
-    for c in _safe_iter(recent_comments):
-        if not c.post or getattr(c.post, "is_deleted", False):
-            continue
-        note_type = "reply" if c.parent_id else "comment"
-        notifications.append(
-            {
-                "type": note_type,
-                "actor": c.user.username,
-                "actor_profile_photo": _actor_photo(c.user, cache, default_photo),
-                "actor_id": c.user.id,
-                "post_title": c.post.title,
-                "post_id": c.post.id,
-                "content": c.content,
-                "message": f"@{c.user.username} {'replied to your comment' if c.parent_id else 'commented on your post'}",
-                "message_text": "replied to your comment" if c.parent_id else "commented on your post",
-                "timestamp": getattr(c, "created_at", None),
-            }
-        )
-
-    for rc in _safe_iter(replies_to_user_comments):
-        if not rc.post or getattr(rc.post, "is_deleted", False):
-            continue
-        notifications.append(
-            {
-                "type": "reply_to_comment",
-                "actor": rc.user.username,
-                "actor_profile_photo": _actor_photo(rc.user, cache, default_photo),
-                "actor_id": rc.user.id,
-                "post_title": rc.post.title,
-                "post_id": rc.post.id,
-                "content": rc.content,
-                "message": f"@{rc.user.username} replied to your comment",
-                "message_text": "replied to your comment",
-                "timestamp": getattr(rc, "created_at", None),
-            }
-        )
-
-    for ci in _safe_iter(comment_interactions):
-        if not ci.comment or ci.comment.is_deleted:
-            continue
-        if ci.comment.post and getattr(ci.comment.post, "is_deleted", False):
-            continue
-        notifications.append(
-            {
-                "type": f"{ci.interaction_type}_comment",
-                "actor": ci.user.username,
-                "actor_profile_photo": _actor_photo(ci.user, cache, default_photo),
-                "actor_id": ci.user.id,
-                "post_title": ci.comment.post.title,
-                "post_id": ci.comment.post.id,
-                "content": ci.comment.content,
-                "message": f"@{ci.user.username} liked your comment",
-                "message_text": "liked your comment",
-                "timestamp": getattr(ci, "created_at", None),
-            }
-        )
-
-    notifications.sort(key=lambda n: n.get("timestamp") or 0, reverse=True)
-    return notifications
+def serialize_notifications(notifications):
+    default_photo = static("images/user-profile.png")
+    photos = user_photo_urls(n.actor for n in notifications)
+    data = []
+    for n in notifications:
+        message_text = MESSAGES.get(n.notification_type, "")
+        item = {
+            "id": n.id,
+            "type": n.notification_type,
+            "actor": n.actor.username,
+            "actor_profile_photo": photos.get(n.actor_id) or default_photo,
+            "actor_id": n.actor_id,
+            "post_title": n.post.title,
+            "post_id": n.post_id,
+            "message": f"@{n.actor.username} {message_text}",
+            "message_text": message_text,
+            "is_read": n.is_read,
+            "timestamp": n.created_at,
+        }
+        if n.comment_id:
+            item["comment_id"] = str(n.comment_id)
+            item["content"] = n.comment.content
+        data.append(item)
+    return data
+
+
+def build_notifications(user, limit=50):
+    return serialize_notifications(list(inbox(user)[:limit]))
 
 
 def serialize_for_api(notifications):
@@ -155,13 +78,58 @@ def serialize_for_api(notifications):
 @login_required
 def notifications_view(request):
     notifications = build_notifications(request.user)
+    Notification.objects.filter(recipient=request.user, is_read=False).update(is_read=True)
     return render(request, "notifications.html", {"notifications": notifications})
 
 
 @login_required
 def notifications_api(request):
-    notifications = serialize_for_api(build_notifications(request.user))
-    for n in notifications:
-        actor_id = n.get("actor_id")
-        n["actor_profile_url"] = reverse("profil:user_profile", args=[actor_id]) if actor_id else None
-    return JsonResponse({"status": "success", "notifications": notifications})
+    """
+    GET inbox notifikasi (terbaru lebih dulu).
+    - ?since=<ISO datetime>: hanya notifikasi setelah waktu tersebut (untuk polling);
+      nilai `next_since` pada response dipakai untuk polling berikutnya.
+    - ?cursor=&per_page=: halaman berikutnya (keyset pagination).
+    """
+    try:
+        since = parse_since(request)
+        per_page = min(max(int(request.GET.get("per_page", 50)), 1), 100)
+        notifications = inbox(request.user)
+        if since is not None:
+            notifications = notifications.filter(created_at__gt=since)
+        page, next_cursor = paginate_by_cursor(
+            notifications, request.GET.get("cursor"), per_page
+        )
+    except (InvalidSince, InvalidCursor, ValueError) as e:
+        return JsonResponse({"status": "error", "message": str(e)}, status=400)
+
+    data = serialize_for_api(serialize_notifications(page))
+    for n in data:
+        n["actor_profile_url"] = reverse("profil:user_profile", args=[n["actor_id"]])
+
+    if page and not request.GET.get("cursor"):
+        next_since = page[0].created_at.isoformat()
+    else:
+        next_since = since.isoformat() if since else None
+    return JsonResponse(
+        {
+            "status": "success",
+            "notifications": data,
+            "unread_count": unread_count(request.user),
+            "next_since": next_since,
+            "pagination": {
+                "per_page": per_page,
+                "next_cursor": next_cursor,
+                "has_next": next_cursor is not None,
+            },
+        }
+    )
+
+
+@login_required
+@require_POST
+def mark_notifications_read(request):
+    """Tandai semua notifikasi user sebagai sudah dibaca"""
+    updated = Notification.objects.filter(recipient=request.user, is_read=False).update(
+        is_read=True
+    )
+    return JsonResponse({"status": "success", "marked_read": updated, "unread_count": 0})
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Post, PostInteraction, PostShare
+from .models import Post, PostHotScore, PostInteraction, PostShare
 
 # Register your models here.
 
@@ -23,3 +23,10 @@ class PostShareAdmin(admin.ModelAdmin):
     list_display = ("user", "post", "created_at")
     list_filter = ("created_at",)
     search_fields = ("user__username", "post__title")
+
+
+@admin.register(PostHotScore)
+class PostHotScoreAdmin(admin.ModelAdmin):
+    list_display = ("post", "score", "updated_at")
+    ordering = ("-score",)
+    search_fields = ("post__title",)
@@ -0,0 +1,289 @@
+# post/batch.py
+"""
+Batch interaksi untuk aksi mobile yang diantrekan saat offline.
+
+Client mengirim daftar aksi berurutan, mis.
+    [{"target": "post", "id": 1, "action": "like"},
+     {"target": "comment", "id": "<uuid>", "action": "dislike"},
+     {"target": "post", "id": 1, "action": "save"}]
+dan apply_interaction_batch() menerapkannya dalam satu transaksi:
+
+1. Semua post/komentar target dan state awal user (reaksi, bookmark) dimuat
+   dengan beberapa query bulk.
+2. Aksi dilipat berurutan menjadi state akhir per target (like lalu like lagi
+   = tidak ada perubahan).
+3. Selisih state akhir terhadap state awal ditulis secara berkelompok, bukan
+   lewat endpoint satuan per target: satu bulk_create, satu DELETE dan satu
+   UPDATE per tipe reaksi untuk PostInteraction/PostSave/CommentInteraction,
+   satu UPDATE counter per post/komentar yang berubah, notifikasi like dalam
+   satu INSERT/DELETE, skor hot dihitung ulang sekali per post yang jumlah
+   like-nya berubah, dan cache feed dibuang sekali setelah transaksi.
+4. Share dicatat ke buffer write-behind (post/counters.py) setelah transaksi
+   selesai; state akhir sudah termasuk share yang masih di buffer.
+5. State akhir semua target dibaca kembali secara bulk.
+
+Aksi dengan target yang tidak ditemukan dilewati dan dilaporkan di "errors".
+"""
+import uuid
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+
+from comment.models import Comment, CommentInteraction
+from comment.reactions import bump_comment_counters
+from notifications.events import notify_many, withdraw_many
+from smash.feed_cache import invalidate_feed_cache
+
+from .counters import pending_counts, record_shares
+from .hot import refresh_hot_score
+from .models import Post, PostInteraction, PostSave
+
+# Aksi yang diizinkan per jenis target
+BATCH_ACTIONS = {
+    "post": {"like", "dislike", "save", "share"},
+    "comment": {"like", "dislike"},
+}
+
+
+class InvalidBatch(ValueError):
+    """Payload batch tidak valid"""
+
+
+def max_batch_size():
+    return getattr(settings, "INTERACTION_BATCH_MAX", 100)
+
+
+def parse_actions(payload):
+    """
+    Validasi payload ({"actions": [...]} atau list langsung) dan kembalikan
+    list tuple (target, id, action) dengan urutan yang sama.
+    """
+    actions = payload.get("actions") if isinstance(payload, dict) else payload
+    if not isinstance(actions, list) or not actions:
+        raise InvalidBatch("actions harus berupa list yang tidak kosong")
+    if len(actions) > max_batch_size():
+        raise InvalidBatch(f"Maksimal {max_batch_size()} aksi per batch")
+
+    parsed = []
+    for index, item in enumerate(actions):
+        if not isinstance(item, dict):
+            raise InvalidBatch(f"Aksi #{index} harus berupa object")
+        target, action = item.get("target", "post"), item.get("action")
+        if action not in BATCH_ACTIONS.get(target, ()):
+            raise InvalidBatch(f"Aksi #{index} tidak valid: {target}/{action}")
+        try:
+            if target == "post":
+                target_id = int(item.get("id"))
+            else:
+                target_id = uuid.UUID(str(item.get("id")))
+        except (TypeError, ValueError):
+            raise InvalidBatch(f"Aksi #{index}: id tidak valid")
+        parsed.append((target, target_id, action))
+    return parsed
+
+
+def _toggle(current, action):
+    """State reaksi setelah toggle `action` (sama -> hilang, beda -> ganti)"""
+    return None if current == action else action
+
+
+def _write_reactions(model, target_field, user, current, wanted):
+    """
+    Tulis selisih reaksi user dari `current` ke `wanted` ({target_id: tipe
+    atau None}) pada `model` secara berkelompok. Mengembalikan (delta counter
+    per target, target yang baru di-like, target yang like-nya dibatalkan).
+    """
+    deltas = defaultdict(Counter)
+    created, removed, changed = [], [], defaultdict(list)
+    liked, unliked = [], []
+    for target_id, new in wanted.items():
+        old = current.get(target_id)
+        if new == old:
+            continue
+        if new:
+            deltas[target_id][f"{new}s_count"] += 1
+        if old:
+            deltas[target_id][f"{old}s_count"] -= 1
+        if new == "like":
+            liked.append(target_id)
+        elif old == "like":
+            unliked.append(target_id)
+
+        if old is None:
+            created.append(
+                model(user=user, interaction_type=new, **{target_field: target_id})
+            )
+        elif new is None:
+            removed.append(target_id)
+        else:
+            changed[new].append(target_id)
+
+    # Lewat queryset, bukan save()/delete() per baris: counter dan notifikasi
+    # ditulis sekali oleh pemanggil
+    model.objects.bulk_create(created)
+    if removed:
+        model.objects.filter(user=user, **{f"{target_field}__in": removed}).delete()
+    for interaction_type, target_ids in changed.items():
+        model.objects.filter(user=user, **{f"{target_field}__in": target_ids}).update(
+            interaction_type=interaction_type
+        )
+    return deltas, liked, unliked
+
+
+def _post_states(user, post_ids):
+    rows = Post.objects.filter(pk__in=post_ids).values(
+        "id", "likes_count", "dislikes_count", "shares_count"
+    )
+    reactions = dict(
+        PostInteraction.objects.filter(user=user, post_id__in=post_ids).values_list(
+            "post_id", "interaction_type"
+        )
+    )
+    saved = set(
+        PostSave.objects.filter(user=user, post_id__in=post_ids).values_list(
+            "post_id", flat=True
+        )
+    )
+    return [
+        {
+            **row,
+            "shares_count": row["shares_count"]
+            + pending_counts(row["id"])["shares_count"],
+            "user_interaction": reactions.get(row["id"]),
+            "is_saved": row["id"] in saved,
+        }
+        for row in rows
+    ]
+
+
+def _comment_states(user, comment_ids):
+    rows = Comment.objects.filter(pk__in=comment_ids).values(
+        "id", "post_id", "likes_count", "dislikes_count"
+    )
+    reactions = dict(
+        CommentInteraction.objects.filter(
+            user=user, comment_id__in=comment_ids
+        ).values_list("comment_id", "interaction_type")
+    )
+    return [{**row, "user_interaction": reactions.get(row["id"])} for row in rows]
+
+
+def apply_interaction_batch(user, actions):
+    """
+    Terapkan `actions` (hasil parse_actions) untuk user dalam satu transaksi.
+    Mengembalikan dict {"posts": [...], "comments": [...], "errors": [...]}
+    berisi state akhir setiap target.
+    """
+    post_ids = {target_id for target, target_id, _ in actions if target == "post"}
+    comment_ids = {
+        target_id for target, target_id, _ in actions if target == "comment"
+    }
+
+    with transaction.atomic():
+        posts = Post.objects.filter(pk__in=post_ids, is_deleted=False).in_bulk()
+        comments = (
+            Comment.objects.filter(
+                pk__in=comment_ids, is_deleted=False, post__is_deleted=False
+            ).in_bulk()
+        )
+        post_reactions = dict(
+            PostInteraction.objects.select_for_update()
+            .filter(user=user, post_id__in=posts)
+            .values_list("post_id", "interaction_type")
+        )
+        saved = set(
+            PostSave.objects.filter(user=user, post_id__in=posts).values_list(
+                "post_id", flat=True
+            )
+        )
+        comment_reactions = dict(
+            CommentInteraction.objects.select_for_update()
+            .filter(user=user, comment_id__in=comments)
+            .values_list("comment_id", "interaction_type")
+        )
+
+        # Lipat aksi berurutan menjadi state akhir per target
+        wanted_reactions = dict(post_reactions)
+        wanted_saved = {post_id: post_id in saved for post_id in posts}
+        wanted_comment_reactions = dict(comment_reactions)
+        shares = {}
+        errors = []
+        for index, (target, target_id, action) in enumerate(actions):
+            if target == "post" and target_id not in posts:
+                errors.append({"index": index, "message": "Post tidak ditemukan"})
+            elif target == "comment" and target_id not in comments:
+                errors.append({"index": index, "message": "Komentar tidak ditemukan"})
+            elif target == "comment":
+                wanted_comment_reactions[target_id] = _toggle(
+                    wanted_comment_reactions.get(target_id), action
+                )
+            elif action == "save":
+                wanted_saved[target_id] = not wanted_saved[target_id]
+            elif action == "share":
+                shares[target_id] = shares.get(target_id, 0) + 1
+            else:
+                wanted_reactions[target_id] = _toggle(
+                    wanted_reactions.get(target_id), action
+                )
+
+        # Terapkan hanya selisih terhadap state awal
+        post_deltas, liked_posts, unliked_posts = _write_reactions(
+            PostInteraction, "post_id", user, post_reactions, wanted_reactions
+        )
+        for post_id, delta in post_deltas.items():
+            Post.objects.filter(pk=post_id).update(**Post.counter_updates(**delta))
+            # Skor hot hanya bergantung pada like dan komentar
+            if delta["likes_count"]:
+                refresh_hot_score(post_id)
+        notify_many(
+            user.id,
+            "like_post",
+            [(posts[post_id].user_id, post_id, None) for post_id in liked_posts],
+        )
+        withdraw_many(user.id, "like_post", post_ids=unliked_posts)
+
+        PostSave.objects.bulk_create(
+            [
+                PostSave(user=user, post_id=post_id)
+                for post_id, wanted in wanted_saved.items()
+                if wanted and post_id not in saved
+            ]
+        )
+        unsaved = [
+            post_id
+            for post_id, wanted in wanted_saved.items()
+            if not wanted and post_id in saved
+        ]
+        if unsaved:
+            PostSave.objects.filter(user=user, post_id__in=unsaved).delete()
+
+        comment_deltas, liked_comments, unliked_comments = _write_reactions(
+            CommentInteraction,
+            "comment_id",
+            user,
+            comment_reactions,
+            wanted_comment_reactions,
+        )
+        for comment_id, delta in comment_deltas.items():
+            bump_comment_counters(comment_id, **delta)
+        notify_many(
+            user.id,
+            "like_comment",
+            [
+                (comments[comment_id].user_id, comments[comment_id].post_id, comment_id)
+                for comment_id in liked_comments
+            ],
+        )
+        withdraw_many(user.id, "like_comment", comment_ids=unliked_comments)
+
+    if post_deltas:
+        invalidate_feed_cache()
+    if shares:
+        record_shares(user.id, shares)
+
+    return {
+        "posts": _post_states(user, list(posts)),
+        "comments": _comment_states(user, list(comments)),
+        "errors": errors,
+    }
@@ -0,0 +1,222 @@
+# post/counters.py
+"""
+Counter write-behind untuk share dan view post.
+
+Setiap share/view tidak langsung meng-UPDATE baris Post (yang membuat semua
+penulis pada post populer antre di satu baris), tetapi dicatat ke buffer di
+memori proses. Buffer di-flush sekaligus:
+- setelah COUNTER_FLUSH_EVENTS event, atau
+- jika sudah lewat COUNTER_FLUSH_INTERVAL detik sejak flush terakhir
+  (dicek oleh CounterFlushMiddleware di akhir setiap request), dan
+- saat proses berhenti (atexit), jika database masih bisa dipakai.
+
+Satu flush = bulk_create baris audit PostShare + satu UPDATE per post untuk
+shares_count/views_count, dalam satu transaksi. Counter di database bisa
+tertinggal sampai satu interval; pending_counts() memberi selisih yang belum
+ditulis.
+
+Jendela kehilangan data: buffer hanya ada di memori worker. atexit tidak
+berjalan jika proses dimatikan paksa (SIGKILL, OOM killer, worker gunicorn
+yang di-kill karena timeout), sehingga share, view, dan baris audit PostShare
+yang belum di-flush hilang -- paling banyak COUNTER_FLUSH_INTERVAL detik atau
+COUNTER_FLUSH_EVENTS event per worker. Karena itu write-behind bersifat opt-in:
+default COUNTER_WRITE_BEHIND = False menulis setiap event langsung ke database.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from smash.feed_cache import invalidate_feed_cache
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_shares = []  # (user_id, post_id, waktu share) per share, urut kejadian
+_views = Counter()  # post_id -> jumlah view
+_last_flush = time.monotonic()
+
+
+def write_behind_enabled():
+    return getattr(settings, "COUNTER_WRITE_BEHIND", False)
+
+
+def flush_interval():
+    return getattr(settings, "COUNTER_FLUSH_INTERVAL", 5)
+
+
+def flush_events():
+    return getattr(settings, "COUNTER_FLUSH_EVENTS", 100)
+
+
+def _pending_events():
+    return len(_shares) + sum(_views.values())
+
+
+def _buffer(shares=(), views=None):
+    """Tambahkan event ke buffer; True jika buffer sudah penuh"""
+    with _lock:
+        _shares.extend(shares)
+        _views.update(views or {})
+        return _pending_events() >= flush_events()
+
+
+def _record(shares=(), views=None):
+    if _buffer(shares, views) or not write_behind_enabled():
+        flush_counters()
+
+
+def record_share(user_id, post_id, count=1):
+    """Catat `count` share dari user untuk post"""
+    record_shares(user_id, {post_id: count})
+
+
+def record_shares(user_id, counts):
+    """Catat share dari user untuk banyak post sekaligus ({post_id: jumlah})"""
+    shared_at = timezone.now()
+    _record(
+        shares=[
+            (user_id, post_id, shared_at)
+            for post_id, count in counts.items()
+            for _ in range(count)
+        ]
+    )
+
+
+def record_view(post_id):
+    """Catat satu view untuk post"""
+    _record(views={post_id: 1})
+
+
+def pending_counts(post_id):
+    """Share/view untuk post yang masih di buffer (belum ada di database)"""
+    with _lock:
+        shares = sum(1 for _, pk, _ in _shares if pk == post_id)
+        return {"shares_count": shares, "views_count": _views[post_id]}
+
+
+def _take_buffer():
+    global _shares, _views, _last_flush
+    with _lock:
+        shares, views = _shares, _views
+        _shares, _views = [], Counter()
+        _last_flush = time.monotonic()
+    return shares, views
+
+
+def _write(shares, views):
+    from .models import Post, PostShare
+
+    post_ids = {post_id for _, post_id, _ in shares} | set(views)
+    with transaction.atomic():
+        # Post/user bisa saja sudah dihapus sejak event dicatat (dibaca di
+        # dalam transaksi agar selalu dari primary, bukan read replica)
+        existing_posts = set(
+            Post.objects.filter(pk__in=post_ids).values_list("pk", flat=True)
+        )
+        existing_users = set(
+            get_user_model()
+            .objects.filter(pk__in={user_id for user_id, _, _ in shares})
+            .values_list("pk", flat=True)
+        )
+        rows = [
+            PostShare(user_id=user_id, post_id=post_id, created_at=shared_at)
+            for user_id, post_id, shared_at in shares
+            if post_id in existing_posts and user_id in existing_users
+        ]
+        share_counts = Counter(row.post_id for row in rows)
+
+        # bulk_create tidak memanggil PostShare.save(), jadi counter ditulis
+        # di bawah sekali per post
+        PostShare.objects.bulk_create(rows, batch_size=500)
+        for post_id in sorted(post_ids & existing_posts):
+            updates = {}
+            if share_counts[post_id]:
+                updates["shares_count"] = F("shares_count") + share_counts[post_id]
+            if views[post_id]:
+                updates["views_count"] = F("views_count") + views[post_id]
+            if updates:
+                Post.objects.filter(pk=post_id).update(**updates)
+    # View tidak tampil di feed yang di-cache, jadi hanya share yang membuang cache
+    if rows:
+        invalidate_feed_cache()
+    return len(rows), sum(views[post_id] for post_id in existing_posts)
+
+
+def flush_counters():
+    """
+    Tulis isi buffer ke database. Mengembalikan (jumlah share, jumlah view)
+    yang ditulis. Jika database gagal, event dikembalikan ke buffer.
+    """
+    shares, views = _take_buffer()
+    if not shares and not views:
+        return 0, 0
+    try:
+        return _write(shares, views)
+    except DatabaseError:
+        logger.exception("Gagal flush counter share/view, dicoba lagi nanti")
+        _buffer(shares, views)
+        return 0, 0
+
+
+def maybe_flush():
+    """Flush jika ada event dan interval flush sudah lewat"""
+    with _lock:
+        due = _pending_events() and (
+            time.monotonic() - _last_flush >= flush_interval()
+        )
+    if due:
+        flush_counters()
+
+
+class CounterFlushMiddleware:
+    """Flush buffer counter yang sudah jatuh tempo setelah setiap request"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        maybe_flush()
+        return response
+
+
+def _database_usable():
+    """Koneksi default masih hidup dan tabel Post ada (mis. bukan setelah test DB dihapus)"""
+    from .models import Post
+
+    connection = connections[DEFAULT_DB_ALIAS]
+    try:
+        connection.ensure_connection()
+        if not connection.is_usable():
+            return False
+        with connection.cursor() as cursor:
+            return Post._meta.db_table in connection.introspection.table_names(cursor)
+    except Exception:
+        return False
+
+
+def _flush_at_exit():
+    shares, views = _take_buffer()
+    if not shares and not views:
+        return
+    if not _database_usable():
+        logger.warning(
+            "Database tidak tersedia, %d share/view tidak tersimpan saat proses berhenti",
+            len(shares) + sum(views.values()),
+        )
+        return
+    try:
+        _write(shares, views)
+    except Exception as e:
+        logger.warning("Counter share/view tidak tersimpan saat proses berhenti: %s", e)
+
+
+atexit.register(_flush_at_exit)
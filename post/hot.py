@@ -0,0 +1,120 @@
+# post/hot.py
+"""
+Skor "hot thread" yang dimaterialisasi di tabel PostHotScore.
+
+Dua formula tersedia lewat settings.HOT_SCORE_FORMULA:
+- "reddit" (default): log10(poin) + umur_post / HOT_SCORE_DECAY_SECONDS.
+  Skor tidak berubah seiring waktu, sehingga update incremental saat ada
+  interaksi/komentar sudah cukup menjaga urutan tetap benar.
+- "hn": poin / (jam_umur + 2) ** HOT_SCORE_GRAVITY (gaya Hacker News).
+  Skor meluruh terhadap waktu sekarang, jadi jalankan `rebuild_hot_scores`
+  secara berkala (mis. via cron) agar urutan tetap segar.
+
+Poin = likes + komentar, sama seperti ranking hot thread sebelumnya.
+"""
+import math
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+
+# Titik nol untuk formula reddit; hanya mempengaruhi offset, bukan urutan
+REDDIT_EPOCH = datetime(2005, 12, 8, 7, 46, 43, tzinfo=dt_timezone.utc)
+
+
+def hot_score_formula():
+    return getattr(settings, "HOT_SCORE_FORMULA", "reddit")
+
+
+def compute_hot_score(likes, comments, created_at, now=None):
+    """Hitung skor hot untuk satu post berdasarkan formula yang dikonfigurasi"""
+    points = likes + comments
+    if hot_score_formula() == "hn":
+        gravity = getattr(settings, "HOT_SCORE_GRAVITY", 1.8)
+        age_hours = ((now or timezone.now()) - created_at).total_seconds() / 3600
+        return points / math.pow(max(age_hours, 0) + 2, gravity)
+
+    decay_seconds = getattr(settings, "HOT_SCORE_DECAY_SECONDS", 45000)
+    order = math.log10(max(points, 1))
+    seconds = (created_at - REDDIT_EPOCH).total_seconds()
+    return round(order + seconds / decay_seconds, 7)
+
+
+def refresh_hot_score(post_id):
+    """Hitung ulang skor satu post (dipanggil setelah counter berubah)"""
+    from .models import Post, PostHotScore
+
+    row = (
+        Post.objects.filter(pk=post_id)
+        .values("likes_count", "comments_count", "created_at", "is_deleted")
+        .first()
+    )
+    if row is None:
+        return
+    if row["is_deleted"]:
+        PostHotScore.objects.filter(post_id=post_id).delete()
+        return
+    PostHotScore.objects.update_or_create(
+        post_id=post_id,
+        defaults={
+            "score": compute_hot_score(
+                row["likes_count"], row["comments_count"], row["created_at"]
+            )
+        },
+    )
+
+
+def rebuild_hot_scores(batch_size=500):
+    """
+    Bangun ulang seluruh tabel skor secara batch. Mengembalikan jumlah post
+    yang diberi skor.
+    """
+    from .models import Post as post_model, PostHotScore as score_model
+
+    now = timezone.now()
+    score_model.objects.filter(post__is_deleted=True).delete()
+    rows = (
+        post_model.objects.filter(is_deleted=False)
+        .order_by("pk")
+        .values_list("pk", "likes_count", "comments_count", "created_at")
+    )
+    total = 0
+    batch = []
+    for pk, likes, comments, created_at in rows.iterator(chunk_size=batch_size):
+        batch.append(
+            score_model(
+                post_id=pk,
+                score=compute_hot_score(likes, comments, created_at, now=now),
+                updated_at=now,
+            )
+        )
+        if len(batch) >= batch_size:
+            total += _upsert_scores(score_model, batch)
+            batch = []
+    total += _upsert_scores(score_model, batch)
+    return total
+
+
+def _upsert_scores(score_model, batch):
+    if batch:
+        score_model.objects.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=["post"],
+            update_fields=["score", "updated_at"],
+        )
+    return len(batch)
+
+
+def hot_posts(limit=None):
+    """
+    Queryset post terpanas, diurutkan dari tabel skor (satu query ber-index).
+    """
+    from .models import Post
+
+    limit = limit or getattr(settings, "HOT_THREADS_LIMIT", 50)
+    return (
+        Post.objects.filter(hot_score__isnull=False, is_deleted=False)
+        .select_related("user__profile")
+        .order_by("-hot_score__score", "-created_at")[:limit]
+    )
@@ -0,0 +1,219 @@
+# post/management/commands/benchmark_indexes.py
+import statistics
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from comment.models import Comment
+from post.models import Post, PostInteraction
+from report.models import Report
+
+# Model yang index Meta-nya dibandingkan (lihat migration *_hot_path_indexes)
+INDEXED_MODELS = (Post, PostInteraction, Comment, Report)
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _hot_queries(sample_post, sample_user, sample_comment):
+    """(label, fungsi pembuat queryset) untuk jalur baca yang paling sering"""
+    live = Post.objects.filter(is_deleted=False)
+    comments = Comment.objects.filter(is_deleted=False)
+    return [
+        ("feed terbaru", lambda: live.order_by("-created_at", "-id")[:20]),
+        (
+            "post milik user",
+            lambda: live.filter(user=sample_user).order_by("-created_at")[:20],
+        ),
+        (
+            "thread komentar",
+            lambda: comments.filter(post=sample_post).order_by("created_at"),
+        ),
+        (
+            "komentar top-level",
+            lambda: comments.filter(post=sample_post, parent__isnull=True).order_by(
+                "-created_at"
+            )[:20],
+        ),
+        (
+            "balasan komentar",
+            lambda: comments.filter(parent=sample_comment).order_by("created_at")[:20],
+        ),
+        (
+            "like per post",
+            lambda: PostInteraction.objects.filter(
+                post=sample_post, interaction_type="like"
+            ),
+        ),
+        (
+            "laporan pending",
+            lambda: Report.objects.filter(status="PENDING", category="SPAM").order_by(
+                "-created_at"
+            )[:20],
+        ),
+    ]
+
+
+class Command(BaseCommand):
+    """
+    Bandingkan query plan dan latency jalur baca utama dengan dan tanpa index
+    komposit/parsial dari Meta.indexes. Data contoh di-seed, index di-drop lalu
+    dibuat ulang, dan semuanya di-rollback di akhir sehingga database tidak
+    berubah. Karena DROP INDEX mengunci tabel selama transaksi, perintah ini
+    menolak berjalan jika DEBUG=False kecuali diberi --force.
+    """
+
+    help = "Seed sample data and compare hot-path query plans/latency with and without indexes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--posts",
+            type=int,
+            default=2000,
+            help="Jumlah post contoh (default: 2000)",
+        )
+        parser.add_argument(
+            "--comments-per-post",
+            type=int,
+            default=5,
+            help="Jumlah komentar top-level per post, masing-masing + 1 balasan (default: 5)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Jumlah eksekusi per query untuk median latency (default: 20)",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Izinkan berjalan meski DEBUG=False",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options["force"]:
+            raise CommandError(
+                "benchmark_indexes men-drop index di dalam transaksi; "
+                "jalankan dengan DEBUG=True atau --force."
+            )
+        try:
+            with transaction.atomic():
+                self._run(
+                    max(options["posts"], 1),
+                    max(options["comments_per_post"], 1),
+                    max(options["repeat"], 1),
+                )
+                raise _Rollback
+        except _Rollback:
+            pass
+        self.stdout.write(self.style.SUCCESS("Data contoh dan perubahan index di-rollback."))
+
+    def _run(self, posts, comments_per_post, repeat):
+        sample = self._seed(posts, comments_per_post)
+        queries = _hot_queries(*sample)
+        # Editor hanya dipakai untuk membangun SQL CREATE/DROP INDEX; tidak
+        # di-enter karena schema editor SQLite menolak berjalan di dalam atomic()
+        editor = connection.schema_editor(collect_sql=True)
+        editor.deferred_sql = []
+        indexes = [(model, index) for model in INDEXED_MODELS for index in model._meta.indexes]
+
+        with connection.cursor() as cursor:
+            for model, index in indexes:
+                cursor.execute(str(index.remove_sql(model, editor)))
+        without = self._measure(queries, repeat, "TANPA index")
+
+        with connection.cursor() as cursor:
+            for model, index in indexes:
+                cursor.execute(str(index.create_sql(model, editor)))
+        with_indexes = self._measure(queries, repeat, "DENGAN index")
+
+        self.stdout.write("\nMedian latency (ms):")
+        for label, _ in queries:
+            before, after = without[label], with_indexes[label]
+            speedup = before / after if after else float("inf")
+            self.stdout.write(
+                f"  {label:<20} {before:8.3f} -> {after:8.3f}  ({speedup:.1f}x)"
+            )
+
+    def _seed(self, posts, comments_per_post):
+        if not connection.features.can_return_rows_from_bulk_insert:
+            raise CommandError("Database tidak mengembalikan pk dari bulk_create.")
+        User = get_user_model()
+        users = User.objects.bulk_create(
+            User(username=f"bench-user-{i}") for i in range(max(posts // 20, 2))
+        )
+        post_rows = Post.objects.bulk_create(
+            Post(
+                user=users[i % len(users)],
+                title=f"Benchmark {i}",
+                content="padel",
+                is_deleted=i % 10 == 0,
+            )
+            for i in range(posts)
+        )
+        # created_at (auto_now_add) diisi ulang agar urutan waktunya bervariasi
+        now = timezone.now()
+        for i, post in enumerate(post_rows):
+            post.created_at = now - timedelta(minutes=i)
+        Post.objects.bulk_update(post_rows, ["created_at"], batch_size=500)
+
+        roots = Comment.objects.bulk_create(
+            Comment(user=users[j % len(users)], post=post, content="komentar")
+            for post in post_rows
+            for j in range(comments_per_post)
+        )
+        Comment.objects.bulk_create(
+            Comment(user=root.user, post=root.post, parent=root, content="balasan")
+            for root in roots
+        )
+        PostInteraction.objects.bulk_create(
+            PostInteraction(
+                user=user, post=post, interaction_type="like" if k % 3 else "dislike"
+            )
+            for k, post in enumerate(post_rows)
+            for user in users[: 1 + k % 5]
+        )
+        Report.objects.bulk_create(
+            Report(
+                reporter=users[k % len(users)],
+                post=post,
+                category=("SPAM", "SARA", "NSFW", "OTHER")[k % 4],
+                status=("PENDING", "REVIEWED", "RESOLVED")[k % 3],
+            )
+            for k, post in enumerate(post_rows)
+        )
+        self.stdout.write(
+            f"Seeded {len(post_rows)} post, {len(roots) * 2} komentar, "
+            f"{PostInteraction.objects.count()} interaksi, {len(post_rows)} laporan."
+        )
+        return post_rows[len(post_rows) // 2], users[0], roots[len(roots) // 2]
+
+    def _analyze(self):
+        tables = [model._meta.db_table for model in INDEXED_MODELS]
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute(f"ANALYZE {', '.join(tables)}")
+            elif connection.vendor == "sqlite":
+                cursor.execute("ANALYZE")
+
+    def _measure(self, queries, repeat, title):
+        self._analyze()
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\n== {title} =="))
+        medians = {}
+        for label, build in queries:
+            self.stdout.write(f"-- {label}")
+            for line in build().explain().splitlines():
+                self.stdout.write(f"   {line}")
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                list(build())
+                timings.append((time.perf_counter() - started) * 1000)
+            medians[label] = statistics.median(timings)
+        return medians
@@ -0,0 +1,52 @@
+# post/management/commands/generate_image_variants.py
+from django.core.management.base import BaseCommand
+
+from post.models import Post
+from profil.models import Profile
+from smash.images import delete_variants, process_image
+
+# (model, field gambar, field JSON varian, field status)
+TARGETS = (
+    (Post, "image", "image_variants", "image_status"),
+    (Profile, "profile_photo", "profile_photo_variants", "profile_photo_status"),
+)
+
+
+class Command(BaseCommand):
+    """
+    Buat thumbnail (smash/images.py) untuk gambar post dan foto profil yang
+    diupload sebelum pipeline varian ada, atau setelah IMAGE_VARIANT_WIDTHS
+    diubah (--force). Dijalankan langsung, tidak lewat antrian job.
+    """
+
+    help = "Generate WebP/JPEG width variants for existing post images and profile photos."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Buat ulang varian meski sudah ada",
+        )
+
+    def handle(self, *args, **options):
+        for model, file_field, variants_field, status_field in TARGETS:
+            rows = model._base_manager.exclude(**{file_field: ""}).exclude(
+                **{f"{file_field}__isnull": True}
+            )
+            if not options["force"]:
+                rows = rows.filter(**{variants_field: {}})
+
+            done = 0
+            for instance in rows.only("pk", file_field, variants_field).iterator():
+                field_file = getattr(instance, file_field)
+                delete_variants(field_file.storage, getattr(instance, variants_field))
+                process_image(
+                    model=model._meta.label,
+                    pk=instance.pk,
+                    file_field=file_field,
+                    variants_field=variants_field,
+                    status_field=status_field,
+                    name=field_file.name,
+                )
+                done += 1
+            self.stdout.write(f"{model._meta.label}: {done} gambar diproses")
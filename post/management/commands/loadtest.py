@@ -0,0 +1,147 @@
+# post/management/commands/loadtest.py
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_PATHS = ["/post/api/posts/", "/post/api/hot/", "/post/api/search/?q=padel"]
+
+
+def _percentile(values, pct):
+    """Persentil nearest-rank dari list yang sudah terurut"""
+    if not values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+class Command(BaseCommand):
+    """
+    Load test sederhana terhadap server yang sedang berjalan: kirim request
+    GET paralel ke beberapa endpoint baca, laporkan latency p50/p95/p99 dan
+    throughput, lalu bandingkan statistik koneksi /health/db/ sebelum dan
+    sesudah (koneksi baru per request).
+
+    Untuk melihat efek koneksi persisten jalankan dua kali terhadap satu
+    worker, mis. `gunicorn smash.wsgi -w 1` dengan DB_CONN_MAX_AGE=0 lalu
+    DB_CONN_MAX_AGE=60; statistik /health/db/ hanya milik worker yang
+    menjawab, jadi gunakan satu worker agar angkanya bisa dibandingkan.
+    """
+
+    help = "Run a concurrent GET load test against a running server and report latency and DB connection reuse."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--base-url",
+            default="http://127.0.0.1:8000",
+            help="URL server (default: http://127.0.0.1:8000)",
+        )
+        parser.add_argument(
+            "--path",
+            action="append",
+            dest="paths",
+            help=f"Path yang diuji, boleh diulang (default: {', '.join(DEFAULT_PATHS)})",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=200,
+            help="Jumlah request total (default: 200)",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=8,
+            help="Jumlah request paralel (default: 8)",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=10,
+            help="Timeout per request dalam detik (default: 10)",
+        )
+        parser.add_argument(
+            "--stats-token",
+            default=None,
+            help="Nilai header X-Stats-Token untuk /health/db/ (default: DB_STATS_TOKEN)",
+        )
+
+    def handle(self, *args, **options):
+        base_url = options["base_url"].rstrip("/") + "/"
+        paths = options["paths"] or DEFAULT_PATHS
+        total = max(options["requests"], 1)
+        timeout = options["timeout"]
+        token = options["stats_token"] or getattr(settings, "DB_STATS_TOKEN", "")
+        local = threading.local()
+
+        def session():
+            # requests.Session tidak thread-safe: satu per thread
+            if not hasattr(local, "session"):
+                local.session = requests.Session()
+            return local.session
+
+        def hit(index):
+            path = paths[index % len(paths)]
+            started = time.perf_counter()
+            try:
+                status = session().get(urljoin(base_url, path.lstrip("/")), timeout=timeout).status_code
+            except requests.RequestException:
+                status = None
+            return path, status, (time.perf_counter() - started) * 1000
+
+        before = self._db_stats(base_url, token, timeout)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(options["concurrency"], 1)) as pool:
+            results = list(pool.map(hit, range(total)))
+        elapsed = time.perf_counter() - started
+        after = self._db_stats(base_url, token, timeout)
+
+        if all(status is None for _, status, _ in results):
+            raise CommandError(f"Tidak ada request yang berhasil ke {base_url}")
+
+        self.stdout.write(
+            f"{total} request, concurrency {options['concurrency']}, "
+            f"{elapsed:.2f}s ({total / elapsed:.1f} req/s)"
+        )
+        self.stdout.write(
+            f"  {'path':<32} {'n':>5} {'err':>4} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  (ms)"
+        )
+        for path in paths:
+            rows = [row for row in results if row[0] == path]
+            timings = sorted(ms for _, _, ms in rows)
+            errors = sum(1 for _, status, _ in rows if status is None or status >= 500)
+            self.stdout.write(
+                f"  {path:<32} {len(rows):>5} {errors:>4} "
+                f"{_percentile(timings, 50):>8.1f} {_percentile(timings, 95):>8.1f} "
+                f"{_percentile(timings, 99):>8.1f} {timings[-1] if timings else 0:>8.1f}"
+            )
+
+        if before and after and before["pid"] == after["pid"]:
+            served = after["requests"] - before["requests"]
+            opened = after["connections_opened"] - before["connections_opened"]
+            self.stdout.write(
+                f"Koneksi DB baru: {opened} untuk {served} request "
+                f"({opened / served if served else 0:.3f} per request, pid {after['pid']})"
+            )
+        elif before and after:
+            self.stdout.write(
+                "Statistik /health/db/ berasal dari worker berbeda; jalankan server dengan satu worker."
+            )
+        else:
+            self.stdout.write("Statistik /health/db/ tidak tersedia (butuh --stats-token).")
+
+    def _db_stats(self, base_url, token, timeout):
+        try:
+            response = requests.get(
+                urljoin(base_url, "health/db/"),
+                headers={"X-Stats-Token": token} if token else {},
+                timeout=timeout,
+            )
+        except requests.RequestException:
+            return None
+        return response.json() if response.status_code == 200 else None
@@ -0,0 +1,29 @@
+# post/management/commands/rebuild_hot_scores.py
+from django.core.management.base import BaseCommand
+
+from post.hot import hot_score_formula, rebuild_hot_scores
+
+
+class Command(BaseCommand):
+    """
+    Bangun ulang tabel PostHotScore secara penuh. Jalankan berkala (mis. cron
+    tiap beberapa menit) terutama jika HOT_SCORE_FORMULA = "hn".
+    """
+
+    help = "Recompute the materialized hot-thread scores for all posts."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Jumlah baris per bulk upsert (default: 500)",
+        )
+
+    def handle(self, *args, **options):
+        total = rebuild_hot_scores(batch_size=max(options["batch_size"], 1))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{total} post(s) scored with the {hot_score_formula()} formula."
+            )
+        )
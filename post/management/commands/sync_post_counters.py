@@ -0,0 +1,83 @@
+# post/management/commands/sync_post_counters.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from comment.models import Comment
+from post.models import Post, PostInteraction, PostShare
+
+COUNTER_FIELDS = ("likes_count", "dislikes_count", "shares_count", "comments_count")
+
+
+def _count_subquery(model, **filters):
+    rows = (
+        model.objects.filter(post=OuterRef("pk"), **filters)
+        .order_by()
+        .values("post")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(rows), 0)
+
+
+class Command(BaseCommand):
+    """
+    Hitung ulang counter denormalisasi pada Post (like, dislike, share,
+    komentar) dan perbaiki baris yang nilainya sudah tidak sesuai (drift).
+    """
+
+    help = "Recompute Post counter columns and repair drifted rows in bulk."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Jumlah baris per bulk_update (default: 500)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Hanya laporkan drift tanpa menulis ke database",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(options["batch_size"], 1)
+        drifted = (
+            Post.objects.annotate(
+                expected_likes_count=_count_subquery(
+                    PostInteraction, interaction_type="like"
+                ),
+                expected_dislikes_count=_count_subquery(
+                    PostInteraction, interaction_type="dislike"
+                ),
+                expected_shares_count=_count_subquery(PostShare),
+                expected_comments_count=_count_subquery(Comment, is_deleted=False),
+            )
+            # exclude() dengan beberapa kondisi = NOT (semua sama), jadi yang
+            # tersisa hanya post dengan minimal satu counter yang melenceng.
+            .exclude(**{field: F(f"expected_{field}") for field in COUNTER_FIELDS})
+            .only("id", *COUNTER_FIELDS)
+            .order_by("pk")
+        )
+
+        repaired = 0
+        batch = []
+        for post in drifted.iterator(chunk_size=batch_size):
+            for field in COUNTER_FIELDS:
+                setattr(post, field, getattr(post, f"expected_{field}"))
+            batch.append(post)
+            if len(batch) >= batch_size:
+                repaired += self._flush(batch, options["dry_run"])
+                batch = []
+        repaired += self._flush(batch, options["dry_run"])
+
+        verb = "would be repaired" if options["dry_run"] else "repaired"
+        self.stdout.write(self.style.SUCCESS(f"{repaired} post(s) {verb}."))
+
+    def _flush(self, batch, dry_run):
+        if batch and not dry_run:
+            with transaction.atomic():
+                Post.objects.bulk_update(batch, COUNTER_FIELDS)
+        return len(batch)
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:36
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def _count_subquery(model, **filters):
+    rows = (
+        model.objects.filter(post=OuterRef("pk"), **filters)
+        .order_by()
+        .values("post")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(rows), 0)
+
+
+def backfill_counters(apps, schema_editor):
+    Post = apps.get_model("post", "Post")
+    PostInteraction = apps.get_model("post", "PostInteraction")
+    PostShare = apps.get_model("post", "PostShare")
+    Comment = apps.get_model("comment", "Comment")
+    Post.objects.update(
+        likes_count=_count_subquery(PostInteraction, interaction_type="like"),
+        dislikes_count=_count_subquery(PostInteraction, interaction_type="dislike"),
+        shares_count=_count_subquery(PostShare),
+        comments_count=_count_subquery(Comment, is_deleted=False),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('post', '0004_postshare'),
+        ('comment', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Jumlah Komentar'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='dislikes_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Jumlah Dislike'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Jumlah Like'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='shares_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Jumlah Share'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:52
+
+import math
+from datetime import datetime, timezone as dt_timezone
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+# Salinan formula "reddit" dari post/hot.py saat migration ini dibuat, agar
+# migration tidak berubah jika kode aplikasi berubah. Formula lain (mis. "hn")
+# diterapkan dengan `manage.py rebuild_hot_scores` setelah migrate.
+REDDIT_EPOCH = datetime(2005, 12, 8, 7, 46, 43, tzinfo=dt_timezone.utc)
+DECAY_SECONDS = 45000
+
+
+def populate_hot_scores(apps, schema_editor):
+    Post = apps.get_model("post", "Post")
+    PostHotScore = apps.get_model("post", "PostHotScore")
+    db_alias = schema_editor.connection.alias
+    now = timezone.now()
+
+    batch = []
+    rows = (
+        Post.objects.using(db_alias)
+        .filter(is_deleted=False)
+        .order_by("pk")
+        .values_list("pk", "likes_count", "comments_count", "created_at")
+    )
+    for pk, likes, comments, created_at in rows.iterator(chunk_size=500):
+        order = math.log10(max(likes + comments, 1))
+        seconds = (created_at - REDDIT_EPOCH).total_seconds()
+        batch.append(
+            PostHotScore(
+                post_id=pk,
+                score=round(order + seconds / DECAY_SECONDS, 7),
+                updated_at=now,
+            )
+        )
+        if len(batch) >= 500:
+            PostHotScore.objects.using(db_alias).bulk_create(batch)
+            batch = []
+    PostHotScore.objects.using(db_alias).bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('post', '0005_post_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostHotScore',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='hot_score', serialize=False, to='post.post', verbose_name='Post')),
+                ('score', models.FloatField(default=0, verbose_name='Skor Hot')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Waktu Dihitung')),
+            ],
+            options={
+                'verbose_name': 'Skor Hot Post',
+                'verbose_name_plural': 'Skor Hot Post',
+                'indexes': [models.Index(fields=['-score'], name='post_hotscore_score_idx')],
+            },
+        ),
+        migrations.RunPython(populate_hot_scores, migrations.RunPython.noop),
+    ]
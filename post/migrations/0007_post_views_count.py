@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('post', '0006_posthotscore'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='views_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Jumlah View'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('post', '0007_post_views_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['-created_at', '-id'], name='post_live_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['user', '-created_at'], name='post_user_live_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='postinteraction',
+            index=models.Index(fields=['post', 'interaction_type'], name='postinteraction_type_idx'),
+        ),
+    ]
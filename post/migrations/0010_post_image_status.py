@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:50
+
+from django.db import migrations, models
+
+
+def mark_existing_ready(apps, schema_editor):
+    # Gambar yang sudah ada sebelum antrian job langsung dianggap siap
+    Model = apps.get_model("post", "Post")
+    Model.objects.exclude(image="").exclude(image__isnull=True).update(image_status="ready")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('post', '0009_post_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_status',
+            field=models.CharField(choices=[('none', 'Tanpa gambar'), ('processing', 'Sedang diproses'), ('ready', 'Siap'), ('failed', 'Gagal diproses')], default='none', editable=False, max_length=10, verbose_name='Status Gambar'),
+        ),
+        migrations.RunPython(mark_existing_ready, migrations.RunPython.noop),
+    ]
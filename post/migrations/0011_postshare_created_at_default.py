@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:24
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('post', '0010_post_image_status'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='postshare',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Waktu Dibagikan'),
+        ),
+    ]
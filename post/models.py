@@ -1,7 +1,17 @@
 # post/models.py
 from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+from notifications.events import post_reaction_changed, withdraw
+from search.index import sync_post_index
+from smash.feed_cache import invalidate_feed_cache
+from smash.images import IMAGE_NONE, IMAGE_STATUS_CHOICES, sync_image
+
+from .hot import refresh_hot_score
 
 User = get_user_model()
 
@@ -25,6 +35,17 @@ class Post(models.Model):
     image = models.ImageField(
         upload_to="post_images/", null=True, blank=True, verbose_name="Gambar Post"
     )
+    # Nama file thumbnail per lebar/format, diisi oleh smash/images.py
+    image_variants = models.JSONField(
+        default=dict, blank=True, editable=False, verbose_name="Varian Gambar"
+    )
+    image_status = models.CharField(
+        max_length=10,
+        choices=IMAGE_STATUS_CHOICES,
+        default=IMAGE_NONE,
+        editable=False,
+        verbose_name="Status Gambar",
+    )
     video_link = models.URLField(
         max_length=500,
         null=True,
@@ -35,6 +56,18 @@ class Post(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Waktu Dibuat")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Waktu Diperbarui")
     is_deleted = models.BooleanField(default=False, verbose_name="Terhapus?")
+    # Counter denormalisasi, dijaga oleh PostInteraction/PostShare/Comment
+    # (lihat bump_counters) dan diperbaiki massal via `sync_post_counters`.
+    likes_count = models.PositiveIntegerField(default=0, verbose_name="Jumlah Like")
+    dislikes_count = models.PositiveIntegerField(
+        default=0, verbose_name="Jumlah Dislike"
+    )
+    shares_count = models.PositiveIntegerField(default=0, verbose_name="Jumlah Share")
+    comments_count = models.PositiveIntegerField(
+        default=0, verbose_name="Jumlah Komentar"
+    )
+    # Ditulis secara write-behind oleh post/counters.py
+    views_count = models.PositiveIntegerField(default=0, verbose_name="Jumlah View")
 
     class Meta:
         verbose_name = "Post"
@@ -43,6 +76,33 @@ class Post(models.Model):
         permissions = [
             ("manage_all_posts", "Can manage all posts"),  # Hak akses superuser
         ]
+        # Index parsial hanya memuat post yang tidak terhapus (yang dibaca feed)
+        indexes = [
+            # Feed terbaru / cursor pagination: ORDER BY created_at, id
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=models.Q(is_deleted=False),
+                name="post_live_created_idx",
+            ),
+            # Post milik satu user (halaman profil, pencarian author)
+            models.Index(
+                fields=["user", "-created_at"],
+                condition=models.Q(is_deleted=False),
+                name="post_user_live_created_idx",
+            ),
+        ]
+
+    # Kolom yang hanya ditulis lewat UPDATE atomik (bump_counters, write-behind);
+    # save() biasa tidak boleh menimpanya dengan nilai instance yang sudah basi
+    COUNTER_FIELDS = (
+        "likes_count",
+        "dislikes_count",
+        "shares_count",
+        "comments_count",
+        "views_count",
+    )
+    # Ditulis oleh sync_image() dan job images.process (smash/images.py)
+    IMAGE_JOB_FIELDS = ("image_variants", "image_status")
 
     def __str__(self):
         return f"{self.title} oleh {self.user.username}"
@@ -55,30 +115,68 @@ class Post(models.Model):
         #     raise ValidationError("Post harus memiliki gambar atau tautan video.")
         pass
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Simpan nama file awal agar save() tahu apakah gambar berubah
+        instance._loaded_image_name = instance.__dict__.get("image")
+        return instance
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        if not adding and kwargs.get("update_fields") is None and not kwargs.get("force_insert"):
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.COUNTER_FIELDS + self.IMAGE_JOB_FIELDS
+            ]
+        super().save(*args, **kwargs)
+        if adding:
+            refresh_hot_score(self.pk)
+        sync_image(
+            self, "image", "image_variants", "image_status",
+            getattr(self, "_loaded_image_name", None),
+        )
+        self._loaded_image_name = self.image.name if self.image else None
+        sync_post_index(self)
+        invalidate_feed_cache()
+
     def delete(self, *args, **kwargs):
         """Soft delete untuk menjaga integritas data"""
         self.is_deleted = True
-        self.save()
+        self.save(update_fields=["is_deleted", "updated_at"])
+        refresh_hot_score(self.pk)
 
     def restore(self):
         """Memulihkan post yang terhapus"""
         self.is_deleted = False
-        self.save()
-
-    @property
-    def likes_count(self):
-        """Get total likes count"""
-        return self.interactions.filter(interaction_type="like").count()
+        self.save(update_fields=["is_deleted", "updated_at"])
+        refresh_hot_score(self.pk)
 
-    @property
-    def dislikes_count(self):
-        """Get total dislikes count"""
-        return self.interactions.filter(interaction_type="dislike").count()
+    @staticmethod
+    def counter_updates(**deltas):
+        """Argumen update() untuk menambah delta ke kolom counter (minimal 0)"""
+        return {
+            field: Greatest(F(field) + delta, Value(0))
+            for field, delta in deltas.items()
+            if delta
+        }
 
-    @property
-    def shares_count(self):
-        """Get total shares count"""
-        return self.shares.count()
+    @classmethod
+    def bump_counters(cls, post_id, **deltas):
+        """
+        Update kolom counter secara atomik dengan F() (tanpa read-modify-write).
+        Contoh: Post.bump_counters(post.id, likes_count=1, dislikes_count=-1)
+        Nilai tidak pernah turun di bawah 0.
+        """
+        updates = cls.counter_updates(**deltas)
+        if updates:
+            cls.objects.filter(pk=post_id).update(**updates)
+            invalidate_feed_cache()
+        # Skor hot hanya bergantung pada like dan komentar
+        if deltas.get("likes_count") or deltas.get("comments_count"):
+            refresh_hot_score(post_id)
 
 
 class PostInteraction(models.Model):
@@ -112,10 +210,45 @@ class PostInteraction(models.Model):
             "user",
             "post",
         ]  # User can only have one interaction per post
+        indexes = [
+            # Hitung like/dislike per post (sync_post_counters, notifikasi)
+            models.Index(
+                fields=["post", "interaction_type"], name="postinteraction_type_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.interaction_type} - Post #{self.post.id}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Simpan tipe awal agar save() tahu counter mana yang harus dipindah
+        instance._loaded_interaction_type = instance.__dict__.get("interaction_type")
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Simpan interaksi dan sesuaikan likes_count/dislikes_count pada Post"""
+        previous_type = (
+            None if self._state.adding else getattr(self, "_loaded_interaction_type", None)
+        )
+        super().save(*args, **kwargs)
+        if previous_type != self.interaction_type:
+            deltas = {f"{self.interaction_type}s_count": 1}
+            if previous_type:
+                deltas[f"{previous_type}s_count"] = -1
+            Post.bump_counters(self.post_id, **deltas)
+            post_reaction_changed(self, previous_type)
+        self._loaded_interaction_type = self.interaction_type
+
+    def delete(self, *args, **kwargs):
+        """Hapus interaksi dan kurangi counter terkait pada Post"""
+        result = super().delete(*args, **kwargs)
+        Post.bump_counters(self.post_id, **{f"{self.interaction_type}s_count": -1})
+        if self.interaction_type == "like":
+            withdraw(self.user_id, "like_post", self.post_id)
+        return result
+
 
 class PostSave(models.Model):
     """
@@ -156,7 +289,11 @@ class PostShare(models.Model):
     post = models.ForeignKey(
         Post, on_delete=models.CASCADE, verbose_name="Post", related_name="shares"
     )
-    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Waktu Dibagikan")
+    # Bukan auto_now_add: flush write-behind (post/counters.py) mengisi waktu
+    # share yang sebenarnya, bukan waktu flush
+    created_at = models.DateTimeField(
+        default=timezone.now, editable=False, verbose_name="Waktu Dibagikan"
+    )
 
     class Meta:
         verbose_name = "Post Share"
@@ -165,3 +302,42 @@ class PostShare(models.Model):
 
     def __str__(self):
         return f"{self.user.username} shared Post #{self.post.id}"
+
+    def save(self, *args, **kwargs):
+        """Simpan share dan tambah shares_count pada Post"""
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if adding:
+            Post.bump_counters(self.post_id, shares_count=1)
+
+    def delete(self, *args, **kwargs):
+        """Hapus share dan kurangi shares_count pada Post"""
+        result = super().delete(*args, **kwargs)
+        Post.bump_counters(self.post_id, shares_count=-1)
+        return result
+
+
+class PostHotScore(models.Model):
+    """
+    Skor hot thread yang dimaterialisasi (lihat post/hot.py).
+    Diupdate incremental saat like/komentar berubah, dan dibangun ulang
+    penuh lewat command `rebuild_hot_scores`.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        verbose_name="Post",
+        related_name="hot_score",
+    )
+    score = models.FloatField(default=0, verbose_name="Skor Hot")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Waktu Dihitung")
+
+    class Meta:
+        verbose_name = "Skor Hot Post"
+        verbose_name_plural = "Skor Hot Post"
+        indexes = [models.Index(fields=["-score"], name="post_hotscore_score_idx")]
+
+    def __str__(self):
+        return f"Post #{self.post_id} - {self.score:.4f}"
@@ -0,0 +1,97 @@
+# post/serializers.py
+from profil.photos import user_photo_srcsets, user_photo_urls
+from smash.images import variant_srcset
+
+from .models import Post, PostInteraction, PostSave
+
+
+def can_manage_all_posts(user):
+    """True jika user adalah superuser atau punya izin post.manage_all_posts"""
+    return bool(
+        user.is_authenticated
+        and (user.is_superuser or user.has_perm("post.manage_all_posts"))
+    )
+
+
+def viewer_post_state(viewer, post_ids):
+    """
+    Ambil interaksi (like/dislike) dan status bookmark viewer, hanya untuk
+    post_ids yang akan ditampilkan. Mengembalikan (interactions, saved_ids).
+    """
+    post_ids = list(post_ids)
+    if not viewer.is_authenticated or not post_ids:
+        return {}, set()
+    interactions = dict(
+        PostInteraction.objects.filter(user=viewer, post_id__in=post_ids).values_list(
+            "post_id", "interaction_type"
+        )
+    )
+    saved_ids = set(
+        PostSave.objects.filter(user=viewer, post_id__in=post_ids).values_list(
+            "post_id", flat=True
+        )
+    )
+    return interactions, saved_ids
+
+
+def serialize_posts(posts, viewer):
+    """
+    Serialisasi satu halaman post untuk feed API dalam jumlah query konstan.
+
+    `posts` sebaiknya sudah memakai select_related("user__profile"); counter
+    diambil langsung dari kolom Post, foto profil ikut dari join tersebut,
+    interaksi viewer dimuat sekaligus untuk post di halaman ini saja, dan izin
+    viewer hanya dicek sekali per halaman. image_srcset/profile_photo_srcset
+    berisi URL thumbnail per format dan lebar (smash/images.py), None jika
+    gambar belum punya varian; image_status "processing" selama job gambar
+    belum selesai.
+    """
+    posts = list(posts)
+    user_interactions, saved_post_ids = viewer_post_state(
+        viewer, [post.id for post in posts]
+    )
+    is_superuser = can_manage_all_posts(viewer)
+    viewer_id = viewer.id if viewer.is_authenticated else None
+    photos = user_photo_urls(post.user for post in posts)
+    avatar_srcsets = user_photo_srcsets(post.user for post in posts)
+    storage = Post._meta.get_field("image").storage
+
+    return [
+        {
+            "id": post.id,
+            "title": post.title,
+            "content": post.content,
+            "image": post.image.url if post.image else None,
+            "image_srcset": variant_srcset(storage, post.image_variants),
+            "image_status": post.image_status,
+            "video_link": post.video_link,
+            "user": post.user.username,
+            "user_id": post.user_id,
+            "created_at": post.created_at.isoformat(),
+            "profile_photo": photos.get(post.user_id),
+            "profile_photo_srcset": avatar_srcsets.get(post.user_id),
+            "comment_count": post.comments_count,
+            "likes_count": post.likes_count,
+            "dislikes_count": post.dislikes_count,
+            "shares_count": post.shares_count,
+            "views_count": post.views_count,
+            "user_interaction": user_interactions.get(post.id),
+            "is_saved": post.id in saved_post_ids,
+            "can_edit": post.user_id == viewer_id or is_superuser,
+        }
+        for post in posts
+    ]
+
+
+def filter_posts_for_viewer(posts, viewer, filter_by):
+    """
+    Terapkan filter liked/bookmarked sebagai join di database (bukan
+    id__in dari list Python). Filter lain dikembalikan apa adanya.
+    """
+    if filter_by == "liked":
+        return posts.filter(
+            interactions__user=viewer, interactions__interaction_type="like"
+        )
+    if filter_by == "bookmarked":
+        return posts.filter(saves__user=viewer)
+    return posts
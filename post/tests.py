@@ -6,7 +6,7 @@ Test suite lengkap untuk app `post` yang menargetkan minimal 80% coverage.
 Yang diuji (ringkasan):
 - Model: Post, PostInteraction, PostSave, PostShare
   - __str__, soft-delete / restore
-  - property likes_count, dislikes_count, shares_count
+  - counter kolom likes_count, dislikes_count, shares_count, comments_count
   - unique constraint untuk PostSave / PostInteraction
 - API class-based views:
   - PostAPIView: GET list & single (including pagination & sort_by),
@@ -21,15 +21,18 @@ Catatan teknis:
   tests ini mem-patch `post.views.render` dan memeriksa context yang dilempar ke `render`.
 - RequestFactory digunakan dan request.user diset manual untuk menghindari ketergantungan middleware.
 """
+import base64
 import json
 from unittest.mock import patch
-from django.test import TestCase, RequestFactory
+from django.test import TestCase, TransactionTestCase, RequestFactory, override_settings
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.http import HttpResponse
 
 from .models import Post, PostInteraction, PostSave, PostShare
-from .views import PostAPIView, PostInteractionView, hot_threads, bookmarked_threads, recent_thread, search_posts
+from .counters import flush_counters
+from .views import PostAPIView, PostInteractionView, hot_threads, bookmarked_threads, recent_thread
+from search.views import search_posts
 from report.models import Report  # digunakan oleh PostInteractionView
 
 User = get_user_model()
@@ -75,12 +78,101 @@ class PostModelTests(TestCase):
         """shares_count dan PostSave unique_together basic check."""
         PostShare.objects.create(user=self.owner, post=self.post)
         PostShare.objects.create(user=self.other, post=self.post)
+        self.post.refresh_from_db()
         self.assertEqual(self.post.shares_count, 2)
 
         PostSave.objects.create(user=self.other, post=self.post)
         self.assertEqual(PostSave.objects.filter(user=self.other, post=self.post).count(), 1)
 
 
+class PostCounterTests(TestCase):
+    """Counter kolom pada Post dijaga atomik dan bisa diperbaiki oleh command."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username="cowner", password="pass")
+        self.other = User.objects.create_user(username="cother", password="pass")
+        self.post = Post.objects.create(user=self.owner, title="Counter", content="c")
+
+    def test_interaction_change_and_delete_move_counters(self):
+        interaction = PostInteraction.objects.create(
+            user=self.other, post=self.post, interaction_type="like"
+        )
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.likes_count, self.post.dislikes_count), (1, 0))
+
+        interaction = PostInteraction.objects.get(pk=interaction.pk)
+        interaction.interaction_type = "dislike"
+        interaction.save()
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.likes_count, self.post.dislikes_count), (0, 1))
+
+        interaction.delete()
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.likes_count, self.post.dislikes_count), (0, 0))
+
+    def test_comment_create_and_soft_delete_update_comments_count(self):
+        from comment.models import Comment
+
+        comment = Comment.objects.create(user=self.other, post=self.post, content="hi")
+        Comment.objects.create(
+            user=self.owner, post=self.post, parent=comment, content="reply"
+        )
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 2)
+
+        comment.delete()
+        comment.delete()  # soft delete kedua kali tidak boleh mengurangi lagi
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 1)
+
+    def test_saving_stale_instance_keeps_counters(self):
+        stale = Post.objects.get(pk=self.post.pk)
+        PostInteraction.objects.create(
+            user=self.other, post=self.post, interaction_type="like"
+        )
+        Post.bump_counters(self.post.id, shares_count=2, views_count=3)
+
+        stale.title = "Judul baru"
+        stale.save()
+        stale.delete()
+        stale.restore()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.title, "Judul baru")
+        self.assertEqual(
+            (self.post.likes_count, self.post.shares_count, self.post.views_count),
+            (1, 2, 3),
+        )
+
+    def test_counters_never_go_negative(self):
+        Post.bump_counters(self.post.id, likes_count=-5)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 0)
+
+    def test_sync_post_counters_repairs_drift(self):
+        from io import StringIO
+        from django.core.management import call_command
+
+        PostInteraction.objects.create(
+            user=self.other, post=self.post, interaction_type="like"
+        )
+        PostShare.objects.create(user=self.other, post=self.post)
+        Post.objects.filter(pk=self.post.pk).update(
+            likes_count=7, shares_count=0, comments_count=3
+        )
+
+        out = StringIO()
+        call_command("sync_post_counters", "--dry-run", stdout=out)
+        self.assertIn("1 post(s) would be repaired", out.getvalue())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 7)
+
+        call_command("sync_post_counters", stdout=StringIO())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+        self.assertEqual(self.post.shares_count, 1)
+        self.assertEqual(self.post.comments_count, 0)
+
+
 class PostAPIViewTests(TestCase):
     """Tests untuk PostAPIView: CRUD API behavior & edge cases."""
 
@@ -118,6 +210,58 @@ class PostAPIViewTests(TestCase):
         d2 = self._json(resp2)
         self.assertEqual(d2["pagination"]["page"], 2)
 
+    def test_get_list_cursor_pagination(self):
+        """?cursor= mode pages by (created_at, id) without a total count."""
+        seen = []
+        cursor = ""
+        while True:
+            req = self.factory.get("/posts/", {"cursor": cursor, "per_page": 4})
+            req.user = self.user
+            d = self._json(PostAPIView.as_view()(req))
+            self.assertEqual(d["status"], "success")
+            self.assertNotIn("total", d["pagination"])
+            seen.extend(p["id"] for p in d["posts"])
+            cursor = d["pagination"]["next_cursor"]
+            if not cursor:
+                break
+        expected = list(
+            Post.objects.filter(is_deleted=False)
+            .order_by("-created_at", "-id")
+            .values_list("id", flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+        req = self.factory.get("/posts/?cursor=bogus")
+        req.user = self.user
+        self.assertEqual(PostAPIView.as_view()(req).status_code, 400)
+
+        # Cursor rakitan dengan pk yang bukan angka: 400, bukan 500
+        crafted = base64.urlsafe_b64encode(
+            json.dumps(["2024-01-01T00:00:00", "abc"]).encode()
+        ).decode().rstrip("=")
+        req = self.factory.get("/posts/", {"cursor": crafted})
+        req.user = self.user
+        self.assertEqual(PostAPIView.as_view()(req).status_code, 400)
+
+    def test_get_list_rejects_or_clamps_bad_page_params(self):
+        """per_page 0/-1 dijepit ke 1; nilai bukan angka memberi 400, bukan 500."""
+        for params in ({"cursor": "", "per_page": 0}, {"cursor": "", "per_page": -1}):
+            req = self.factory.get("/posts/", params)
+            req.user = self.user
+            resp = PostAPIView.as_view()(req)
+            self.assertEqual(resp.status_code, 200)
+            d = self._json(resp)
+            self.assertEqual((len(d["posts"]), d["pagination"]["per_page"]), (1, 1))
+
+        req = self.factory.get("/posts/", {"per_page": 500})
+        req.user = self.user
+        self.assertEqual(self._json(PostAPIView.as_view()(req))["pagination"]["per_page"], 100)
+
+        for params in ({"cursor": "", "per_page": "abc"}, {"page": "x"}, {"per_page": "1.5"}):
+            req = self.factory.get("/posts/", params)
+            req.user = self.user
+            self.assertEqual(PostAPIView.as_view()(req).status_code, 400)
+
     def test_superuser_can_see_deleted_posts_in_list(self):
         """Superuser listing should include deleted posts."""
         p = Post.objects.create(user=self.user, title="to_delete", content="c")
@@ -237,6 +381,61 @@ class PostAPIViewTests(TestCase):
         self.assertTrue(post.is_deleted)
 
 
+class PostFeedQueryCountTests(TestCase):
+    """List mode PostAPIView harus memakai jumlah query konstan per halaman."""
+
+    def setUp(self):
+        from comment.models import Comment
+        from profil.models import Profile
+
+        self.factory = RequestFactory()
+        self.viewer = User.objects.create_user(username="viewer", password="pass")
+        authors = [
+            User.objects.create_user(username=f"author{i}", password="pass")
+            for i in range(5)
+        ]
+        # Profile dibuat otomatis saat user dibuat
+        Profile.objects.filter(user__in=authors).update(bio="bio")
+        for i in range(120):
+            post = Post.objects.create(user=authors[i % 5], title=f"Q{i}", content="c")
+            if i % 3 == 0:
+                PostInteraction.objects.create(
+                    user=self.viewer, post=post, interaction_type="like"
+                )
+                Comment.objects.create(user=authors[0], post=post, content="hi")
+            if i % 4 == 0:
+                PostSave.objects.create(user=self.viewer, post=post)
+
+    def _count_queries(self, per_page):
+        from django.core.cache import cache
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        # Mulai dari cache kosong agar foto profil selalu ikut dihitung
+        cache.clear()
+        req = self.factory.get(f"/posts/?page=1&per_page={per_page}")
+        req.user = User.objects.get(pk=self.viewer.pk)
+        with CaptureQueriesContext(connection) as ctx:
+            resp = PostAPIView.as_view()(req)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(json.loads(resp.content)["posts"]), per_page)
+        return len(ctx.captured_queries)
+
+    def test_query_count_is_flat_across_page_sizes(self):
+        self.assertEqual(self._count_queries(10), self._count_queries(100))
+
+    def test_liked_and_bookmarked_filters_only_return_viewer_posts(self):
+        viewer = User.objects.get(pk=self.viewer.pk)
+        for filter_by, expected in (("liked", 40), ("bookmarked", 30)):
+            req = self.factory.get(f"/posts/?filter={filter_by}&per_page=200")
+            req.user = viewer
+            d = json.loads(PostAPIView.as_view()(req).content)
+            self.assertEqual(d["pagination"]["total"], expected)
+            key = "user_interaction" if filter_by == "liked" else "is_saved"
+            wanted = "like" if filter_by == "liked" else True
+            self.assertTrue(all(p[key] == wanted for p in d["posts"]))
+
+
 class PostInteractionViewTests(TestCase):
     """Tests untuk PostInteractionView: like/dislike/share/report dan error cases."""
 
@@ -259,6 +458,7 @@ class PostInteractionViewTests(TestCase):
         d = self._json(r)
         self.assertEqual(d["action"], "added")
         self.assertEqual(d["user_interaction"], "like")
+        self.post.refresh_from_db()
         self.assertEqual(self.post.likes_count, 1)
 
         # same like again -> removed
@@ -276,6 +476,7 @@ class PostInteractionViewTests(TestCase):
         self.assertEqual(r3.status_code, 200)
         d3 = self._json(r3)
         self.assertEqual(d3["action"], "added")
+        self.post.refresh_from_db()
         self.assertEqual(self.post.dislikes_count, 1)
 
         # change to like (should update)
@@ -296,6 +497,9 @@ class PostInteractionViewTests(TestCase):
         self.assertEqual(r_share.status_code, 200)
         d_share = self._json(r_share)
         self.assertEqual(d_share["status"], "success")
+        self.assertEqual(d_share["shares_count"], 1)
+        # Baris PostShare ditulis saat buffer write-behind di-flush
+        flush_counters()
         self.assertEqual(self.post.shares.count(), 1)
 
         # report
@@ -330,6 +534,1145 @@ class PostInteractionViewTests(TestCase):
         self.assertEqual(resp.status_code, 401)
 
 
+class HotScoreTests(TestCase):
+    """Skor hot dimaterialisasi di PostHotScore dan dipakai halaman/API hot."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.author = User.objects.create_user(username="hotauthor", password="pass")
+        self.fans = [
+            User.objects.create_user(username=f"fan{i}", password="pass")
+            for i in range(3)
+        ]
+        self.popular = Post.objects.create(user=self.author, title="Popular", content="c")
+        self.quiet = Post.objects.create(user=self.author, title="Quiet", content="c")
+
+    def test_interactions_update_score_incrementally(self):
+        from .models import PostHotScore
+
+        self.assertTrue(PostHotScore.objects.filter(post=self.quiet).exists())
+        before = PostHotScore.objects.get(post=self.popular).score
+        for fan in self.fans:
+            PostInteraction.objects.create(
+                user=fan, post=self.popular, interaction_type="like"
+            )
+        self.assertGreater(PostHotScore.objects.get(post=self.popular).score, before)
+
+        req = self.factory.get("/post/api/hot/")
+        req.user = self.author
+        from .views import hot_threads_api
+
+        d = json.loads(hot_threads_api(req).content)
+        self.assertEqual([p["title"] for p in d["posts"]], ["Popular", "Quiet"])
+
+    def test_deleted_post_leaves_ranking_and_rebuild_restores(self):
+        from io import StringIO
+        from django.core.management import call_command
+        from .models import PostHotScore
+
+        self.quiet.delete()
+        self.assertFalse(PostHotScore.objects.filter(post=self.quiet).exists())
+
+        PostHotScore.objects.all().delete()
+        call_command("rebuild_hot_scores", stdout=StringIO())
+        self.assertEqual(
+            list(PostHotScore.objects.values_list("post_id", flat=True)),
+            [self.popular.id],
+        )
+
+    def test_hn_formula_decays_with_age(self):
+        from datetime import timedelta
+        from django.test import override_settings
+        from django.utils import timezone
+        from .hot import compute_hot_score
+
+        now = timezone.now()
+        with override_settings(HOT_SCORE_FORMULA="hn"):
+            fresh = compute_hot_score(10, 0, now, now=now)
+            old = compute_hot_score(10, 0, now - timedelta(hours=24), now=now)
+        self.assertGreater(fresh, old)
+
+
+class FeedCacheTests(TestCase):
+    """Feed anonim dilayani dari cache berversi dan invalid saat post berubah."""
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.factory = RequestFactory()
+        self.user = User.objects.create_user(username="cacheuser", password="pass")
+        Post.objects.create(user=self.user, title="Cached", content="c")
+
+    def _anon_list(self):
+        from django.contrib.auth.models import AnonymousUser
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        req = self.factory.get("/posts/?page=1&per_page=10")
+        req.user = AnonymousUser()
+        with CaptureQueriesContext(connection) as ctx:
+            d = json.loads(PostAPIView.as_view()(req).content)
+        return d, len(ctx.captured_queries)
+
+    def test_anonymous_feed_is_cached_until_posts_change(self):
+        first, _ = self._anon_list()
+        second, queries = self._anon_list()
+        self.assertEqual(first, second)
+        self.assertEqual(queries, 0)
+
+        Post.objects.create(user=self.user, title="Fresh", content="c")
+        third, queries = self._anon_list()
+        self.assertGreater(queries, 0)
+        self.assertEqual(third["posts"][0]["title"], "Fresh")
+
+        PostInteraction.objects.create(
+            user=self.user, post=Post.objects.get(title="Fresh"), interaction_type="like"
+        )
+        fourth, _ = self._anon_list()
+        self.assertEqual(fourth["posts"][0]["likes_count"], 1)
+
+    def test_hot_and_recent_pages_render_from_fragment_cache(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        for url in ("/hot/", "/recent/"):
+            self.assertEqual(self.client.get(url).status_code, 200)
+            with CaptureQueriesContext(connection) as ctx:
+                resp = self.client.get(url)
+            self.assertContains(resp, "Cached")
+            self.assertFalse(
+                any("post_post" in q["sql"] for q in ctx.captured_queries)
+            )
+
+
+class FlutterCommentsPaginationTests(TestCase):
+    """get_comments dengan ?cursor= memaginasi komentar top-level."""
+
+    def setUp(self):
+        from comment.models import Comment
+
+        self.user = User.objects.create_user(username="mobile", password="pass")
+        self.post = Post.objects.create(user=self.user, title="M", content="c")
+        for i in range(3):
+            root = Comment.objects.create(user=self.user, post=self.post, content=f"t{i}")
+            for j in range(4):
+                Comment.objects.create(
+                    user=self.user, post=self.post, parent=root, content=f"t{i}r{j}"
+                )
+
+    def test_cursor_pages_with_reply_previews(self):
+        url = f"/post/api/posts/{self.post.id}/comments/"
+        data = self.client.get(url, {"cursor": "", "per_page": 2, "replies": 1}).json()
+        self.assertEqual([c["content"] for c in data["comments"]], ["t2", "t1"])
+        self.assertEqual(data["comments"][0]["reply_count"], 4)
+        self.assertEqual([r["author"] for r in data["comments"][0]["replies"]], ["mobile"])
+
+        cursor = data["pagination"]["next_cursor"]
+        data = self.client.get(url, {"cursor": cursor, "per_page": 2}).json()
+        self.assertEqual([c["content"] for c in data["comments"]], ["t0"])
+        self.assertFalse(data["pagination"]["has_next"])
+
+        # Tanpa cursor tetap list datar seperti sebelumnya
+        self.assertEqual(len(self.client.get(url).json()), 15)
+
+
+class FlutterCommentsBulkTests(TestCase):
+    """get_comments tanpa cursor: reaksi viewer dimuat sekaligus, dan ?since=."""
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.user = User.objects.create_user(username="viewer", password="pass")
+        self.post = Post.objects.create(user=self.user, title="B", content="c")
+        self.url = f"/post/api/posts/{self.post.id}/comments/"
+
+    def _add_comments(self, count):
+        from comment.models import Comment, CommentInteraction
+
+        comments = []
+        for i in range(count):
+            author = User.objects.create_user(username=f"author{count}-{i}")
+            comment = Comment.objects.create(user=author, post=self.post, content=f"k{i}")
+            CommentInteraction.objects.create(
+                user=self.user, comment=comment, interaction_type="like"
+            )
+            comments.append(comment)
+        return comments
+
+    def _queries_for_get(self):
+        from django.core.cache import cache
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, {"user_id": self.user.id})
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response.json()
+
+    def test_query_count_is_constant(self):
+        self._add_comments(2)
+        small, data = self._queries_for_get()
+        self.assertEqual([c["user_reaction"] for c in data], ["like", "like"])
+
+        self._add_comments(6)
+        large, data = self._queries_for_get()
+        self.assertEqual(len(data), 8)
+        self.assertEqual(small, large)
+
+    def test_since_returns_only_changed_comments(self):
+        from django.utils import timezone
+
+        old, edited, deleted = self._add_comments(3)
+        since = timezone.now()
+        edited.content = "diedit"
+        edited.save()
+        deleted.delete()
+
+        response = self.client.get(self.url, {"since": since.isoformat()})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("X-Next-Since", response)
+        changes = {c["id"]: c for c in response.json()}
+        self.assertNotIn(str(old.id), changes)
+        self.assertEqual(changes[str(edited.id)]["content"], "diedit")
+        self.assertFalse(changes[str(edited.id)]["is_deleted"])
+        # Komentar terhapus hanya dikirim sebagai tombstone, tanpa isi/penulis
+        self.assertEqual(
+            sorted(changes[str(deleted.id)]), ["id", "is_deleted", "parent_id", "updated_at"]
+        )
+        self.assertTrue(changes[str(deleted.id)]["is_deleted"])
+
+        # Tanpa since, komentar terhapus tidak dikirim
+        ids = [c["id"] for c in self.client.get(self.url).json()]
+        self.assertNotIn(str(deleted.id), ids)
+
+    def test_since_includes_comments_reacted_after_since(self):
+        from django.utils import timezone
+
+        from comment.reactions import toggle_comment_reaction
+
+        reacted, untouched = self._add_comments(2)
+        since = timezone.now()
+        toggle_comment_reaction(self.post.user, reacted, "dislike")
+
+        changes = {
+            c["id"]: c
+            for c in self.client.get(self.url, {"since": since.isoformat()}).json()
+        }
+        self.assertNotIn(str(untouched.id), changes)
+        self.assertEqual(changes[str(reacted.id)]["dislikes_count"], 1)
+
+    def test_invalid_since_is_rejected(self):
+        response = self.client.get(self.url, {"since": "kemarin"})
+        self.assertEqual(response.status_code, 400)
+
+
+class InteractionBatchTests(TestCase):
+    """/post/api/interactions/batch/ menerapkan aksi offline dalam satu request."""
+
+    url = "/post/api/interactions/batch/"
+
+    def setUp(self):
+        from comment.models import Comment
+
+        self.user = User.objects.create_user(username="offline", password="pass")
+        self.author = User.objects.create_user(username="author", password="pass")
+        self.p1 = Post.objects.create(user=self.author, title="P1", content="c")
+        self.p2 = Post.objects.create(user=self.author, title="P2", content="c")
+        self.comment = Comment.objects.create(user=self.author, post=self.p1, content="k")
+
+    def _batch(self, actions, **extra):
+        return self.client.post(
+            self.url,
+            data=json.dumps({"actions": actions, **extra}),
+            content_type="application/json",
+        )
+
+    def test_applies_actions_in_order_and_returns_final_state(self):
+        self.client.login(username="offline", password="pass")
+        response = self._batch(
+            [
+                {"target": "post", "id": self.p1.id, "action": "like"},
+                {"target": "post", "id": self.p1.id, "action": "dislike"},
+                {"target": "post", "id": self.p2.id, "action": "like"},
+                {"target": "post", "id": self.p2.id, "action": "like"},
+                {"target": "post", "id": self.p1.id, "action": "save"},
+                {"target": "post", "id": self.p1.id, "action": "share"},
+                {"target": "post", "id": self.p1.id, "action": "share"},
+                {"target": "comment", "id": str(self.comment.id), "action": "like"},
+            ]
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        posts = {p["id"]: p for p in data["posts"]}
+        self.assertEqual(posts[self.p1.id]["user_interaction"], "dislike")
+        self.assertEqual(posts[self.p1.id]["dislikes_count"], 1)
+        self.assertEqual(posts[self.p1.id]["likes_count"], 0)
+        self.assertTrue(posts[self.p1.id]["is_saved"])
+        self.assertEqual(posts[self.p1.id]["shares_count"], 2)
+        # like lalu like lagi = tidak ada perubahan
+        self.assertIsNone(posts[self.p2.id]["user_interaction"])
+        self.assertEqual(posts[self.p2.id]["likes_count"], 0)
+        self.assertEqual(data["comments"][0]["user_interaction"], "like")
+        self.assertEqual(data["comments"][0]["likes_count"], 1)
+
+        flush_counters()
+        self.assertEqual(PostShare.objects.filter(post=self.p1).count(), 2)
+        self.assertTrue(PostSave.objects.filter(user=self.user, post=self.p1).exists())
+        self.assertFalse(PostInteraction.objects.filter(post=self.p2).exists())
+
+    def test_toggles_against_existing_state(self):
+        PostInteraction.objects.create(user=self.user, post=self.p1, interaction_type="like")
+        PostSave.objects.create(user=self.user, post=self.p1)
+        response = self._batch(
+            [
+                {"target": "post", "id": self.p1.id, "action": "like"},
+                {"target": "post", "id": self.p1.id, "action": "save"},
+            ],
+            user_id=self.user.id,
+        )
+        post_state = response.json()["posts"][0]
+        self.assertIsNone(post_state["user_interaction"])
+        self.assertFalse(post_state["is_saved"])
+        self.assertEqual(post_state["likes_count"], 0)
+
+    def test_grouped_writes_keep_counters_hot_scores_and_notifications(self):
+        from comment.models import CommentInteraction
+        from notifications.models import Notification
+
+        from .hot import hot_posts
+
+        PostInteraction.objects.create(user=self.user, post=self.p2, interaction_type="like")
+        self.client.login(username="offline", password="pass")
+        response = self._batch(
+            [
+                {"target": "post", "id": self.p1.id, "action": "like"},
+                {"target": "post", "id": self.p2.id, "action": "dislike"},
+                {"target": "comment", "id": str(self.comment.id), "action": "like"},
+            ]
+        )
+        posts = {p["id"]: p for p in response.json()["posts"]}
+        self.assertEqual((posts[self.p1.id]["likes_count"], posts[self.p1.id]["dislikes_count"]), (1, 0))
+        self.assertEqual((posts[self.p2.id]["likes_count"], posts[self.p2.id]["dislikes_count"]), (0, 1))
+        self.assertEqual(
+            CommentInteraction.objects.get(user=self.user).interaction_type, "like"
+        )
+        # Like baru dinotifikasi, like yang diganti dislike ditarik
+        self.assertEqual(
+            set(
+                Notification.objects.filter(actor=self.user).values_list(
+                    "notification_type", "post_id", "comment_id"
+                )
+            ),
+            {("like_post", self.p1.id, None), ("like_comment", self.p1.id, self.comment.id)},
+        )
+        self.assertEqual([post.id for post in hot_posts()][0], self.p1.id)
+
+    def test_missing_targets_are_reported(self):
+        self.client.login(username="offline", password="pass")
+        data = self._batch(
+            [
+                {"target": "post", "id": 999999, "action": "like"},
+                {"target": "post", "id": self.p2.id, "action": "like"},
+            ]
+        ).json()
+        self.assertEqual(data["errors"], [{"index": 0, "message": "Post tidak ditemukan"}])
+        self.assertEqual(data["posts"][0]["likes_count"], 1)
+
+    def test_rejects_invalid_payloads(self):
+        self.assertEqual(self._batch([{"target": "post", "id": 1, "action": "like"}]).status_code, 401)
+        self.client.login(username="offline", password="pass")
+        self.assertEqual(self._batch([]).status_code, 400)
+        self.assertEqual(
+            self._batch([{"target": "comment", "id": "x", "action": "save"}]).status_code,
+            400,
+        )
+        self.assertEqual(
+            self._batch([{"target": "comment", "id": "bukan-uuid", "action": "like"}]).status_code,
+            400,
+        )
+
+
+@override_settings(COUNTER_WRITE_BEHIND=True)
+class WriteBehindCounterTests(TestCase):
+    """post/counters.py menampung share/view lalu menulisnya sekaligus."""
+
+    def setUp(self):
+        from . import counters
+
+        counters._take_buffer()
+        self.addCleanup(counters._take_buffer)
+        self.user = User.objects.create_user(username="sharer", password="pass")
+        self.post = Post.objects.create(user=self.user, title="W", content="c")
+
+    def test_shares_and_views_are_buffered_until_flush(self):
+        from .counters import pending_counts, record_share, record_view
+
+        record_share(self.user.id, self.post.id, count=3)
+        record_view(self.post.id)
+        record_view(self.post.id)
+        self.assertEqual(
+            pending_counts(self.post.id), {"shares_count": 3, "views_count": 2}
+        )
+        self.assertFalse(PostShare.objects.exists())
+
+        self.assertEqual(flush_counters(), (3, 2))
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.shares_count, 3)
+        self.assertEqual(self.post.views_count, 2)
+        self.assertEqual(PostShare.objects.filter(post=self.post).count(), 3)
+        self.assertEqual(pending_counts(self.post.id)["shares_count"], 0)
+
+    def test_flush_after_event_threshold(self):
+        from django.test import override_settings
+        from .counters import record_share
+
+        with override_settings(COUNTER_FLUSH_EVENTS=2):
+            record_share(self.user.id, self.post.id)
+            self.assertEqual(PostShare.objects.count(), 0)
+            record_share(self.user.id, self.post.id)
+        self.assertEqual(PostShare.objects.count(), 2)
+
+    def test_flush_uses_constant_queries(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .counters import record_share
+
+        for _ in range(20):
+            record_share(self.user.id, self.post.id)
+        with CaptureQueriesContext(connection) as ctx:
+            flush_counters()
+        # cek post & user, bulk insert, satu UPDATE (plus savepoint)
+        self.assertLessEqual(len(ctx.captured_queries), 6)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.shares_count, 20)
+
+    def test_events_for_deleted_posts_are_dropped(self):
+        from .counters import record_share, record_view
+
+        other = Post.objects.create(user=self.user, title="X", content="c")
+        record_share(self.user.id, other.id)
+        record_view(other.id)
+        Post.objects.filter(pk=other.pk).delete()
+        self.assertEqual(flush_counters(), (0, 0))
+
+    def test_flushed_share_keeps_event_time(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from .counters import record_share
+
+        shared_at = timezone.now() - timedelta(minutes=10)
+        with patch("post.counters.timezone.now", return_value=shared_at):
+            record_share(self.user.id, self.post.id)
+        flush_counters()
+        self.assertEqual(PostShare.objects.get(post=self.post).created_at, shared_at)
+
+    def test_exit_flush_skips_unusable_database(self):
+        from . import counters
+
+        counters.record_view(self.post.id)
+        with patch("post.counters._database_usable", return_value=False), patch(
+            "post.counters._write"
+        ) as write, self.assertLogs("post.counters", "WARNING"):
+            counters._flush_at_exit()
+        write.assert_not_called()
+
+    def test_detail_views_are_counted(self):
+        self.client.get(f"/post/api/posts/{self.post.id}/")
+        data = self.client.get(f"/post/api/posts/{self.post.id}/").json()
+        self.assertEqual(data["post"]["views_count"], 2)
+
+
+class BenchmarkIndexesCommandTests(TestCase):
+    """benchmark_indexes membandingkan plan lalu me-rollback semua perubahan."""
+
+    def test_reports_plans_and_rolls_back(self):
+        from io import StringIO
+        from django.core.management import call_command
+        from django.db import connection
+
+        out = StringIO()
+        call_command(
+            "benchmark_indexes", posts=40, comments_per_post=2, repeat=1, force=True,
+            stdout=out,
+        )
+        output = out.getvalue()
+        self.assertIn("TANPA index", output)
+        self.assertIn("DENGAN index", output)
+        self.assertIn("laporan pending", output)
+        self.assertFalse(Post.objects.exists())
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, Post._meta.db_table
+            )
+        self.assertIn("post_live_created_idx", constraints)
+
+    def test_refuses_without_debug_or_force(self):
+        from django.core.management import CommandError, call_command
+
+        with self.assertRaises(CommandError):
+            call_command("benchmark_indexes", posts=1, repeat=1)
+
+
+class PrimaryReplicaRouterTests(TestCase):
+    """smash/db_router.py: kapan read boleh diarahkan ke replica."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def _read_alias_during(self, request):
+        from smash.db_router import ReplicaRoutingMiddleware, read_alias
+
+        seen = {}
+
+        def view(req):
+            # Test berjalan di dalam atomic(); yang diuji di sini flag request-nya
+            with patch("smash.db_router.connections") as conns:
+                conns.__getitem__.return_value.in_atomic_block = False
+                seen["alias"] = read_alias()
+            return HttpResponse("ok")
+
+        response = ReplicaRoutingMiddleware(view)(request)
+        return seen["alias"], response
+
+    @override_settings(DATABASE_REPLICAS=["replica"])
+    def test_safe_requests_read_from_replica(self):
+        from smash.db_router import read_alias
+
+        alias, response = self._read_alias_during(self.factory.get("/post/api/posts/"))
+        self.assertEqual(alias, "replica")
+        self.assertNotIn("db_use_primary", response.cookies)
+        # Di luar request (command, shell) selalu primary
+        self.assertEqual(read_alias(), "default")
+
+    @override_settings(DATABASE_REPLICAS=["replica"], REPLICA_STICKY_SECONDS=7)
+    def test_writes_pin_client_to_primary(self):
+        alias, response = self._read_alias_during(self.factory.post("/post/api/posts/"))
+        self.assertEqual(alias, "default")
+        self.assertEqual(response.cookies["db_use_primary"]["max-age"], 7)
+
+        request = self.factory.get("/post/api/posts/")
+        request.COOKIES["db_use_primary"] = "1"
+        alias, _ = self._read_alias_during(request)
+        self.assertEqual(alias, "default")
+
+    def test_without_replicas_everything_uses_primary(self):
+        alias, response = self._read_alias_during(self.factory.get("/"))
+        self.assertEqual(alias, "default")
+        self.assertNotIn("db_use_primary", response.cookies)
+
+    def test_writes_and_migrations_stay_on_primary(self):
+        from smash.db_router import PrimaryReplicaRouter
+
+        router = PrimaryReplicaRouter()
+        self.assertEqual(router.db_for_write(Post), "default")
+        self.assertTrue(router.allow_migrate("default", "post"))
+        self.assertFalse(router.allow_migrate("replica", "post"))
+
+
+class SQLiteReplicaIntegrationTests(TransactionTestCase):
+    """
+    Primary = database test, replica = snapshot file SQLite (VACUUM INTO) yang
+    sengaja tertinggal, untuk membuktikan read benar-benar pindah database.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Alias "replica" hanya dibuat di setUp; izinkan koneksinya di test ini
+        cls.databases = frozenset(cls.databases | {"replica"})
+
+    def setUp(self):
+        import os
+        import tempfile
+
+        from django.core.cache import cache
+        from django.db import connection, connections
+
+        if connection.vendor != "sqlite":
+            self.skipTest("Butuh SQLite")
+        cache.clear()
+        user = User.objects.create_user(username="replica", password="pass")
+        self.replicated = Post.objects.create(user=user, title="Lama", content="c")
+
+        # "Replikasi": salin primary ke file, lalu buat post yang belum tereplikasi
+        path = os.path.join(tempfile.mkdtemp(), "replica.sqlite3")
+        with connection.cursor() as cursor:
+            cursor.execute("VACUUM INTO %s", [path])
+        self.lagging = Post.objects.create(user=user, title="Baru", content="c")
+
+        connections.settings["replica"] = {
+            **connection.settings_dict,
+            "NAME": path,
+            "TEST": {"MIRROR": "default"},
+        }
+        self.addCleanup(self._drop_replica)
+
+    def _drop_replica(self):
+        from django.db import connections
+
+        if "replica" in connections:
+            connections["replica"].close()
+            del connections["replica"]
+        connections.settings.pop("replica", None)
+
+    @override_settings(DATABASE_REPLICAS=["replica"])
+    def test_reads_hit_replica_until_client_writes(self):
+        url = "/post/api/posts/{}/"
+        self.assertEqual(self.client.get(url.format(self.replicated.id)).status_code, 200)
+        # Belum ada di replica
+        self.assertEqual(self.client.get(url.format(self.lagging.id)).status_code, 404)
+
+        # Setelah write (apa pun hasilnya) client dibaca dari primary
+        response = self.client.post(
+            "/post/api/interactions/batch/", data="{}", content_type="application/json"
+        )
+        self.assertIn("db_use_primary", response.cookies)
+        self.assertEqual(self.client.get(url.format(self.lagging.id)).status_code, 200)
+
+
+class DatabaseStatsTests(TestCase):
+    """smash/db_stats.py dan endpoint /health/db/."""
+
+    def test_counts_new_connections_and_requests(self):
+        from django.db import connection
+        from django.db.backends.signals import connection_created
+        from smash import db_stats
+
+        db_stats.install()
+        before = db_stats.db_stats()
+        connection_created.send(sender=connection.__class__, connection=connection)
+        db_stats.record_request()
+        after = db_stats.db_stats()
+        self.assertEqual(after["connections_opened"], before["connections_opened"] + 1)
+        self.assertEqual(after["requests"], before["requests"] + 1)
+        self.assertIn("conn_max_age", after["databases"]["default"])
+        self.assertIsNone(after["databases"]["default"]["pool"])
+
+    def test_endpoint_requires_staff_or_token(self):
+        self.assertEqual(self.client.get("/health/db/").status_code, 403)
+
+        User.objects.create_user(username="ops", password="pass", is_staff=True)
+        self.client.login(username="ops", password="pass")
+        response = self.client.get("/health/db/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("connections_per_request", response.json())
+
+    @override_settings(DB_STATS_TOKEN="rahasia")
+    def test_endpoint_accepts_token(self):
+        self.assertEqual(
+            self.client.get("/health/db/", HTTP_X_STATS_TOKEN="salah").status_code, 403
+        )
+        response = self.client.get("/health/db/", HTTP_X_STATS_TOKEN="rahasia")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "success")
+
+    def test_loadtest_reports_latency_and_connection_reuse(self):
+        from io import StringIO
+        from unittest.mock import MagicMock
+        from django.core.management import call_command
+
+        stats = iter([
+            {"pid": 1, "requests": 10, "connections_opened": 2},
+            {"pid": 1, "requests": 30, "connections_opened": 3},
+        ])
+        stats_response = MagicMock(status_code=200)
+        stats_response.json.side_effect = lambda: next(stats)
+        session = MagicMock()
+        session.get.return_value = MagicMock(status_code=200)
+
+        out = StringIO()
+        with patch("post.management.commands.loadtest.requests.get", return_value=stats_response), \
+                patch("post.management.commands.loadtest.requests.Session", return_value=session):
+            call_command(
+                "loadtest", paths=["/post/api/posts/"], requests=20, concurrency=4, stdout=out
+            )
+        output = out.getvalue()
+        self.assertEqual(session.get.call_count, 20)
+        self.assertIn("p95", output)
+        self.assertIn("Koneksi DB baru: 1 untuk 20 request", output)
+
+
+class ImageProxyCacheTests(TestCase):
+    """smash/image_cache.py terhadap server HTTP lokal sebagai upstream."""
+
+    PNG = b"\x89PNG\r\n\x1a\n" + b"x" * 100
+
+    @classmethod
+    def setUpClass(cls):
+        import threading
+        import time
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        super().setUpClass()
+        cls.hits = []
+
+        class Upstream(BaseHTTPRequestHandler):
+            def do_GET(handler):
+                cls.hits.append(handler.path)
+                if handler.path.startswith("/slow"):
+                    time.sleep(0.2)
+                etag = '"%s"' % handler.path
+                if handler.headers.get("If-None-Match") == etag:
+                    handler.send_response(304)
+                    handler.send_header("ETag", etag)
+                    handler.end_headers()
+                    return
+                body = cls.PNG * (100 if "big" in handler.path else 1)
+                byte_range = handler.headers.get("Range")
+                if byte_range:
+                    start, end = (int(n) for n in byte_range[len("bytes="):].split("-"))
+                    handler.send_response(206)
+                    handler.send_header("Content-Range", f"bytes {start}-{end}/{len(body)}")
+                    body = body[start:end + 1]
+                else:
+                    handler.send_response(200)
+                # Tanpa Content-Type: proxy post harus menebak dari isi
+                if not handler.path.startswith("/bare"):
+                    handler.send_header("Content-Type", "image/png")
+                handler.send_header("ETag", etag)
+                if not handler.path.startswith("/chunked"):
+                    handler.send_header("Content-Length", str(len(body)))
+                handler.end_headers()
+                handler.wfile.write(body)
+
+            def log_message(handler, *args):
+                pass
+
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), Upstream)
+        cls.base = "http://127.0.0.1:%d" % cls.server.server_address[1]
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        import shutil
+        import tempfile
+        from smash import image_cache
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        override = override_settings(
+            IMAGE_PROXY_CACHE=True, IMAGE_PROXY_CACHE_DIR=directory, IMAGE_PROXY_CACHE_TTL=3600
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+        image_cache._usage["bytes"] = None
+        self.hits.clear()
+
+    def _fetch(self, path, **kwargs):
+        from smash.image_cache import fetch_image
+
+        image, status = fetch_image(self.base + path, **kwargs)
+        return b"".join(image.stream()), status
+
+    def test_second_request_served_from_disk(self):
+        url = "/post/image-proxy/?url=" + self.base + "/bare/a"
+        first = self.client.get(url)
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(first["Content-Length"], str(len(self.PNG)))
+        # Tipe ditebak dari chunk pertama
+        self.assertEqual(first["Content-Type"], "image/png")
+        self.assertEqual(b"".join(first.streaming_content), self.PNG)
+
+        second = self.client.get(url)
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(b"".join(second.streaming_content), self.PNG)
+        self.assertEqual(second["Content-Type"], "image/png")
+        self.assertEqual(self.hits, ["/bare/a"])
+
+        # Client yang sudah memegang ETag yang sama mendapat 304
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=second["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.get("/proxy-image/?url=" + self.base + "/bare/a")
+        self.assertEqual(response["X-Cache"], "HIT")
+
+    def test_stale_entry_is_revalidated_with_etag(self):
+        from smash.image_cache import HIT, MISS, REVALIDATED
+
+        with override_settings(IMAGE_PROXY_CACHE_TTL=0):
+            self.assertEqual(self._fetch("/img.png")[1], MISS)
+            body, status = self._fetch("/img.png")
+        self.assertEqual(status, REVALIDATED)
+        self.assertEqual(body, self.PNG)
+        # Revalidasi memperbarui umur entry
+        self.assertEqual(self._fetch("/img.png")[1], HIT)
+        self.assertEqual(len(self.hits), 2)
+
+    def test_concurrent_misses_share_one_upstream_fetch(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            results = list(pool.map(lambda _: self._fetch("/slow.png"), range(5)))
+        self.assertEqual(self.hits, ["/slow.png"])
+        self.assertTrue(all(body == self.PNG for body, _ in results))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        import os
+        import time
+        from smash.image_cache import HIT, MISS, cache_dir, url_key
+
+        # Muat dua entry; entry ketiga memaksa satu dibuang
+        with override_settings(IMAGE_PROXY_CACHE_MAX_BYTES=2 * len(self.PNG) + 400):
+            self._fetch("/a.png")
+            self._fetch("/b.png")
+            old = time.time() - 60
+            os.utime(os.path.join(cache_dir(), url_key(self.base + "/a.png")), (old, old))
+            os.utime(os.path.join(cache_dir(), url_key(self.base + "/b.png")), (old - 60, old - 60))
+            self.assertEqual(self._fetch("/a.png")[1], HIT)
+            self._fetch("/c.png")
+
+            self.assertEqual(self._fetch("/a.png")[1], HIT)
+            self.assertEqual(self._fetch("/b.png")[1], MISS)
+
+    def test_upstream_errors_are_not_cached(self):
+        import requests
+        from smash.image_cache import fetch_image
+
+        with self.assertRaises(requests.RequestException):
+            fetch_image("http://127.0.0.1:1/none.png", timeout=1)
+        response = self.client.get("/post/image-proxy/?url=http://127.0.0.1:1/none.png")
+        self.assertEqual(response.status_code, 502)
+
+    def test_byte_budget_rejects_or_truncates_large_images(self):
+        import os
+        from smash.image_cache import ImageTooLarge, cache_dir, fetch_image, url_key
+
+        with override_settings(IMAGE_PROXY_MAX_BYTES=1000):
+            with self.assertRaises(ImageTooLarge):
+                fetch_image(self.base + "/big.png")
+            response = self.client.get("/post/image-proxy/?url=" + self.base + "/big.png")
+            self.assertEqual(response.status_code, 502)
+
+            # Tanpa Content-Length: stream diputus di batas dan tidak di-cache
+            with self.assertLogs("smash.image_cache", "WARNING"):
+                body, _ = self._fetch("/chunked/big.png")
+        self.assertLessEqual(len(body), 1000)
+        self.assertFalse(os.path.exists(os.path.join(cache_dir(), url_key(self.base + "/chunked/big.png"))))
+
+    def test_range_requests(self):
+        url = "/post/image-proxy/?url=" + self.base + "/img.png"
+        # Belum di-cache: Range diteruskan ke upstream
+        response = self.client.get(url, HTTP_RANGE="bytes=0-7")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["X-Cache"], "BYPASS")
+        self.assertEqual(response["Content-Range"], f"bytes 0-7/{len(self.PNG)}")
+        self.assertEqual(b"".join(response.streaming_content), self.PNG[:8])
+
+        b"".join(self.client.get(url).streaming_content)
+        response = self.client.get(url, HTTP_RANGE="bytes=100-")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["X-Cache"], "HIT")
+        self.assertEqual(response["Content-Length"], str(len(self.PNG) - 100))
+        self.assertEqual(b"".join(response.streaming_content), self.PNG[100:])
+
+        response = self.client.get(url, HTTP_RANGE="bytes=999-")
+        self.assertEqual(response.status_code, 416)
+
+    def test_abandoned_stream_is_not_cached_and_releases_waiters(self):
+        from smash.image_cache import MISS, _inflight, fetch_image
+
+        image, status = fetch_image(self.base + "/img.png")
+        self.assertEqual(status, MISS)
+        image.close()
+        self.assertEqual(_inflight, {})
+        self.assertEqual(self._fetch("/img.png")[1], MISS)
+
+
+class PooledHttpClientTests(TestCase):
+    """smash/http_client.py: keep-alive, retry, dan metrik pool."""
+
+    @classmethod
+    def setUpClass(cls):
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        super().setUpClass()
+        cls.hits = []
+        cls.failures = {}
+
+        class Upstream(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def do_GET(handler):
+                cls.hits.append(handler.path)
+                if cls.failures.get(handler.path, 0) > 0:
+                    cls.failures[handler.path] -= 1
+                    handler.send_response(503)
+                    handler.send_header("Content-Length", "0")
+                    handler.end_headers()
+                    return
+                handler.send_response(200)
+                handler.send_header("Content-Length", "2")
+                handler.send_header("Set-Cookie", "tracker=1; Path=/")
+                handler.end_headers()
+                handler.wfile.write(b"ok")
+
+            def log_message(handler, *args):
+                pass
+
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), Upstream)
+        cls.base = "http://127.0.0.1:%d" % cls.server.server_address[1]
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        from smash import http_client
+
+        override = override_settings(HTTP_RETRIES=2, HTTP_RETRY_BACKOFF=0)
+        override.enable()
+        self.addCleanup(override.disable)
+        # Session dibuat ulang dari settings di atas
+        http_client.close()
+        self.addCleanup(http_client.close)
+        self.hits.clear()
+        self.failures.clear()
+
+    def test_connections_are_reused_per_host(self):
+        from smash import http_client
+
+        for _ in range(3):
+            self.assertEqual(http_client.get(self.base + "/a").content, b"ok")
+        stats = http_client.pool_stats()
+        self.assertEqual(stats["requests"], 3)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 2)
+        host = stats["hosts"][self.base]
+        self.assertEqual(host["connections_opened"], 1)
+        # Cookie upstream tidak disimpan di session bersama
+        self.assertEqual(len(http_client.get_session().cookies), 0)
+
+    def test_retries_transient_upstream_errors(self):
+        from smash import http_client
+
+        self.failures["/flaky"] = 2
+        response = http_client.get(self.base + "/flaky")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.hits, ["/flaky"] * 3)
+
+        self.failures["/down"] = 5
+        response = http_client.get(self.base + "/down")
+        self.assertEqual(response.status_code, 503)
+
+    def test_stats_endpoint_requires_staff(self):
+        self.assertEqual(self.client.get("/health/http/").status_code, 403)
+        User.objects.create_user(username="ops", password="pass", is_staff=True)
+        self.client.login(username="ops", password="pass")
+        response = self.client.get("/health/http/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("hits", response.json())
+
+
+def _png(width, height, mode="RGBA"):
+    from io import BytesIO
+    from PIL import Image
+
+    buffer = BytesIO()
+    Image.new(mode, (width, height), (200, 30, 30, 128) if mode == "RGBA" else (200, 30, 30)).save(
+        buffer, "PNG"
+    )
+    return buffer.getvalue()
+
+
+class ImageVariantTests(TestCase):
+    """smash/images.py: thumbnail WebP/JPEG per lebar untuk Post.image lewat antrian job."""
+
+    def setUp(self):
+        import shutil
+        import tempfile
+        from django.core.cache import cache
+
+        cache.clear()
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        override = override_settings(
+            MEDIA_ROOT=media, IMAGE_VARIANT_WIDTHS=[64, 320, 1080], JOBS_MODE="sync"
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+        self.user = User.objects.create_user(username="foto", password="pass")
+
+    def _post(self, data, name="a.png"):
+        with self.captureOnCommitCallbacks(execute=True):
+            post = Post.objects.create(
+                user=self.user, title="t", content="c", image=SimpleUploadedFile(name, data)
+            )
+        post.refresh_from_db()
+        return post
+
+    def test_upload_is_processing_until_job_runs(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            post = Post.objects.create(
+                user=self.user, title="t", content="c",
+                image=SimpleUploadedFile("a.png", _png(400, 200)),
+            )
+        self.assertEqual(post.image_status, "processing")
+        post.refresh_from_db()
+        self.assertEqual((post.image_status, post.image_variants), ("processing", {}))
+
+        for callback in callbacks:
+            callback()
+        post.refresh_from_db()
+        self.assertEqual(post.image_status, "ready")
+        self.assertEqual(list(post.image_variants), ["64", "320"])
+
+    def test_stale_save_does_not_reset_processed_image(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            post = Post.objects.create(
+                user=self.user, title="t", content="c",
+                image=SimpleUploadedFile("a.png", _png(400, 200)),
+            )
+        stale = Post.objects.get(pk=post.pk)
+        for callback in callbacks:
+            callback()
+
+        stale.title = "diedit"
+        stale.save()
+        post.refresh_from_db()
+        self.assertEqual((post.title, post.image_status), ("diedit", "ready"))
+        self.assertEqual(list(post.image_variants), ["64", "320"])
+
+    def test_upload_generates_width_variants_without_upscaling(self):
+        from PIL import Image
+
+        post = self._post(_png(1200, 600))
+        self.assertEqual(sorted(post.image_variants, key=int), ["64", "320", "1080"])
+        storage = post.image.storage
+        with storage.open(post.image_variants["320"]["jpeg"]) as fh, Image.open(fh) as img:
+            self.assertEqual((img.size, img.format, img.mode), ((320, 160), "JPEG", "RGB"))
+        with storage.open(post.image_variants["1080"]["webp"]) as fh, Image.open(fh) as img:
+            self.assertEqual((img.width, img.format), (1080, "WEBP"))
+        self.assertTrue(post.image_variants["64"]["webp"].startswith("post_images/a"))
+
+        small = self._post(_png(200, 100, "RGB"), "b.png")
+        self.assertEqual(list(small.image_variants), ["64"])
+        self.assertEqual(small.image_status, "ready")
+
+    def test_exif_is_stripped_and_orientation_applied(self):
+        from io import BytesIO
+        from PIL import Image
+
+        exif = Image.Exif()
+        exif[0x0112] = 6  # rotasi 90 derajat
+        exif[0x010F] = "Kamera"
+        buffer = BytesIO()
+        Image.new("RGB", (300, 100), (0, 0, 0)).save(buffer, "JPEG", exif=exif.tobytes())
+
+        post = self._post(buffer.getvalue(), "foto.jpg")
+        with post.image.open("rb") as fh, Image.open(fh) as img:
+            self.assertEqual((img.size, img.format), ((100, 300), "JPEG"))
+            self.assertFalse(img.getexif())
+        self.assertEqual(post.image_status, "ready")
+
+    def test_replacing_or_removing_image_cleans_up_variants(self):
+        post = self._post(_png(400, 400))
+        storage = post.image.storage
+        old = post.image_variants["320"]["webp"]
+        post.image = SimpleUploadedFile("c.png", _png(500, 500))
+        with self.captureOnCommitCallbacks(execute=True):
+            post.save()
+        self.assertFalse(storage.exists(old))
+        post.refresh_from_db()
+        self.assertTrue(storage.exists(post.image_variants["320"]["webp"]))
+
+        # Save tanpa mengganti gambar tidak menjadwalkan job baru
+        with self.captureOnCommitCallbacks() as callbacks:
+            post.title = "judul baru"
+            post.save()
+        self.assertEqual(callbacks, [])
+
+        current = post.image_variants["64"]["jpeg"]
+        post.image = None
+        post.save()
+        post.refresh_from_db()
+        self.assertEqual((post.image_variants, post.image_status), ({}, "none"))
+        self.assertFalse(storage.exists(current))
+
+    def test_replacing_image_on_stale_instance_cleans_up_variants(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            post = Post.objects.create(
+                user=self.user, title="t", content="c",
+                image=SimpleUploadedFile("a.png", _png(400, 400)),
+            )
+        # Dimuat sebelum job selesai: image_variants di instance ini masih {}
+        stale = Post.objects.get(pk=post.pk)
+        for callback in callbacks:
+            callback()
+        post.refresh_from_db()
+        storage = post.image.storage
+        old = [name for entry in post.image_variants.values() for name in entry.values()]
+        self.assertTrue(old)
+
+        stale.image = SimpleUploadedFile("c.png", _png(500, 500))
+        with self.captureOnCommitCallbacks(execute=True):
+            stale.save()
+        self.assertFalse(any(storage.exists(name) for name in old))
+
+    def test_stale_job_result_is_discarded(self):
+        from smash.images import process_image
+
+        post = self._post(_png(400, 400))
+        old_name = post.image.name
+        with self.captureOnCommitCallbacks():
+            post.image = SimpleUploadedFile("baru.png", _png(400, 400))
+            post.save()
+        # Job untuk file lama tidak boleh menimpa gambar yang sudah diganti
+        process_image(
+            model="post.Post", pk=post.pk, file_field="image",
+            variants_field="image_variants", status_field="image_status",
+            name=old_name,
+        )
+        post.refresh_from_db()
+        self.assertEqual((post.image_status, post.image_variants), ("processing", {}))
+
+    def test_undecodable_upload_is_marked_failed(self):
+        with self.assertLogs("smash.images", "WARNING"):
+            post = self._post(b"GIF89a", "rusak.gif")
+        self.assertEqual((post.image_variants, post.image_status), ({}, "failed"))
+
+    def test_feed_exposes_srcset_map(self):
+        from .serializers import serialize_posts
+        from django.contrib.auth.models import AnonymousUser
+
+        self._post(_png(800, 400))
+        Post.objects.create(user=self.user, title="teks", content="c")
+        rows = serialize_posts(
+            Post.objects.select_related("user__profile").order_by("id"), AnonymousUser()
+        )
+        srcset = rows[0]["image_srcset"]
+        self.assertEqual(list(srcset), ["webp", "jpeg"])
+        self.assertEqual(list(srcset["webp"]), ["64", "320"])
+        self.assertTrue(srcset["jpeg"]["320"].endswith("_w320.jpg"))
+        self.assertEqual(rows[0]["image_status"], "ready")
+        self.assertIsNone(rows[1]["image_srcset"])
+        self.assertEqual(rows[1]["image_status"], "none")
+        self.assertIsNone(rows[0]["profile_photo_srcset"])
+
+    def test_backfill_command(self):
+        from io import StringIO
+        from django.core.management import call_command
+
+        post = self._post(_png(400, 200))
+        Post.objects.filter(pk=post.pk).update(image_variants={})
+        out = StringIO()
+        call_command("generate_image_variants", stdout=out)
+        post.refresh_from_db()
+        self.assertEqual(list(post.image_variants), ["64", "320"])
+        self.assertIn("post.Post: 1 gambar diproses", out.getvalue())
+
+
 class TemplateViewsTests(TestCase):
     """
     Tests untuk hot_threads, bookmarked_threads, recent_thread, search_posts.
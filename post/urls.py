@@ -15,8 +15,16 @@ urlpatterns = [
     path(
         "api/posts/<int:post_id>/", views.PostAPIView.as_view(), name="post_api_detail"
     ),
+    # Hot Threads API (twin dari halaman Hot Threads)
+    path("api/hot/", views.hot_threads_api, name="hot_threads_api"),
     # Get Comments API (placed before generic action route to avoid matching collisions)
     path("api/posts/<int:post_id>/comments/", views.get_comments, name="get_comments"),
+    # Batch interaksi dari antrean offline app mobile
+    path(
+        "api/interactions/batch/",
+        views.interactions_batch,
+        name="interactions_batch",
+    ),
     # Post Interactions (Like, Dislike, Report, Share)
     path(
         "api/posts/<int:post_id>/<str:action>/",
@@ -47,6 +55,11 @@ urlpatterns = [
         notifications_views.notifications_api,
         name="notifications_api",
     ),
+    path(
+        "api/notifications/read/",
+        notifications_views.mark_notifications_read,
+        name="mark_notifications_read",
+    ),
     # Search API
     path("api/search/", search_views.search_posts_api, name="search_posts_api"),
     # Edit post
@@ -7,16 +7,42 @@ from django.views import View
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
+from django.db import transaction
 from django.db.models import Q, Count
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
 from django.core.exceptions import ValidationError
-from .models import Post, PostInteraction, PostSave, PostShare
-from comment.models import Comment, CommentInteraction
+from .models import Post, PostInteraction, PostSave
+from smash.feed_cache import cached_for_anonymous, fragment_cache_context
+from .batch import InvalidBatch, apply_interaction_batch, parse_actions
+from .counters import pending_counts, record_share, record_view
+from .hot import hot_posts
+from .serializers import (
+    can_manage_all_posts,
+    filter_posts_for_viewer,
+    serialize_posts,
+)
+from comment.models import Comment
+from comment.tree import (
+    load_comment_page,
+    reply_preview_limit,
+    viewer_comment_interactions,
+)
 from report.models import Report
 from django.contrib.auth.decorators import login_required
 from django.utils import timezone
 from datetime import timedelta
-from profil.models import Profile
+from profil.photos import user_photo_urls
+from smash.export import InvalidSince, parse_since
+from smash.image_cache import fetch_image, image_response
+from smash.pagination import (
+    InvalidCursor,
+    InvalidPageParam,
+    page_param,
+    paginate_by_cursor,
+    per_page_param,
+    wants_cursor,
+)
 import requests
 from django.http import HttpResponse
 from urllib.parse import parse_qs, urlparse
@@ -51,44 +77,45 @@ def process_post_interaction(user, post, action, data=None):
     """
     data = data or {}
     if action in ("like", "dislike"):
-        try:
-            interaction = PostInteraction.objects.get(user=user, post=post)
+        with transaction.atomic():
+            try:
+                interaction = PostInteraction.objects.get(user=user, post=post)
 
-            # If same interaction, remove it (toggle off)
-            if interaction.interaction_type == action:
-                interaction.delete()
-                return {
-                    "status": "success",
-                    "message": f"{action.capitalize()} removed",
-                    "action": "removed",
-                    "likes_count": post.likes_count,
-                    "dislikes_count": post.dislikes_count,
-                    "user_interaction": None,
-                }
-            else:
-                # Change interaction type (like -> dislike or vice versa)
-                interaction.interaction_type = action
-                interaction.save()
-                return {
+                # If same interaction, remove it (toggle off)
+                if interaction.interaction_type == action:
+                    interaction.delete()
+                    result = {
+                        "status": "success",
+                        "message": f"{action.capitalize()} removed",
+                        "action": "removed",
+                        "user_interaction": None,
+                    }
+                else:
+                    # Change interaction type (like -> dislike or vice versa)
+                    interaction.interaction_type = action
+                    interaction.save()
+                    result = {
+                        "status": "success",
+                        "message": f"Changed to {action}",
+                        "action": "changed",
+                        "user_interaction": action,
+                    }
+            except PostInteraction.DoesNotExist:
+                PostInteraction.objects.create(
+                    user=user, post=post, interaction_type=action
+                )
+                result = {
                     "status": "success",
-                    "message": f"Changed to {action}",
-                    "action": "changed",
-                    "likes_count": post.likes_count,
-                    "dislikes_count": post.dislikes_count,
+                    "message": f"Post {action}d",
+                    "action": "added",
                     "user_interaction": action,
                 }
-        except PostInteraction.DoesNotExist:
-            PostInteraction.objects.create(
-                user=user, post=post, interaction_type=action
-            )
-            return {
-                "status": "success",
-                "message": f"Post {action}d",
-                "action": "added",
-                "likes_count": post.likes_count,
-                "dislikes_count": post.dislikes_count,
-                "user_interaction": action,
-            }
+
+        # Counter sudah diupdate atomik oleh model; baca nilai terbaru dari row
+        post.refresh_from_db(fields=["likes_count", "dislikes_count"])
+        result["likes_count"] = post.likes_count
+        result["dislikes_count"] = post.dislikes_count
+        return result
 
     elif action == "save":
         existing_save = PostSave.objects.filter(user=user, post=post).first()
@@ -109,11 +136,14 @@ def process_post_interaction(user, post, action, data=None):
         }
 
     elif action == "share":
-        PostShare.objects.create(user=user, post=post)
+        # Baris PostShare dan shares_count ditulis bertahap (post/counters.py)
+        record_share(user.id, post.id)
+        post.refresh_from_db(fields=["shares_count"])
         return {
             "status": "success",
             "message": "Post berhasil dibagikan",
-            "shares_count": post.shares_count,
+            "shares_count": post.shares_count
+            + pending_counts(post.id)["shares_count"],
         }
 
     elif action == "report":
@@ -150,42 +180,76 @@ class PostAPIView(View):
         is_superuser = user.is_superuser or user.has_perm("post.manage_all_posts")
         return is_owner, is_superuser
 
+    def list_payload(self, request):
+        """Bangun payload list post (dengan pagination) untuk GET tanpa post_id"""
+        page = page_param(request)
+        per_page = per_page_param(request, 10)
+        start = (page - 1) * per_page
+        end = start + per_page
+
+        # Filter posts (superuser bisa lihat semua, user biasa hanya yang tidak deleted)
+        if can_manage_all_posts(request.user):
+            posts = Post.objects.all()
+        else:
+            posts = Post.objects.filter(is_deleted=False)
+
+        filter_by = request.GET.get("filter")
+        if filter_by:
+            if not request.user.is_authenticated:
+                posts = Post.objects.none()
+            elif filter_by == "my":
+                posts = posts.filter(user=request.user)
+            else:
+                posts = filter_posts_for_viewer(posts, request.user, filter_by)
+
+        # Mode cursor (opt-in): keyset pada (created_at, id), tanpa COUNT(*)
+        if wants_cursor(request):
+            page_posts, next_cursor = paginate_by_cursor(
+                posts.select_related("user__profile"),
+                request.GET.get("cursor"),
+                per_page,
+            )
+            return {
+                "status": "success",
+                "posts": serialize_posts(page_posts, request.user),
+                "pagination": {
+                    "per_page": per_page,
+                    "next_cursor": next_cursor,
+                    "has_next": next_cursor is not None,
+                },
+            }
+
+        # Apply ordering
+        sort_by = request.GET.get("sort_by", "-created_at")
+        posts = posts.order_by(sort_by)
+
+        total = posts.count()
+        posts_data = serialize_posts(
+            posts.select_related("user__profile")[start:end], request.user
+        )
+
+        return {
+            "status": "success",
+            "posts": posts_data,
+            "pagination": {
+                "page": page,
+                "per_page": per_page,
+                "total": total,
+                "has_next": end < total,
+            },
+        }
+
     def get(self, request, post_id=None):
         """
         GET: Retrieve single post atau list of posts
         AJAX Support: ✅
         """
         try:
-            user_interactions = {}
-            saved_post_ids = set()
-            profile_cache = {}
-
-            def get_profile_photo_url(user):
-                if user.id in profile_cache:
-                    return profile_cache[user.id]
-                profile = Profile.objects.filter(user=user).first()
-                url = (
-                    profile.profile_photo.url
-                    if profile and profile.profile_photo
-                    else None
-                )
-                profile_cache[user.id] = url
-                return url
-
-            if request.user.is_authenticated:
-                user_interactions = dict(
-                    PostInteraction.objects.filter(user=request.user).values_list(
-                        "post_id", "interaction_type"
-                    )
-                )
-                saved_post_ids = set(
-                    PostSave.objects.filter(user=request.user).values_list(
-                        "post_id", flat=True
-                    )
-                )
             if post_id:
                 # Get single post
-                post = Post.objects.get(id=post_id, is_deleted=False)
+                post = Post.objects.select_related("user__profile").get(
+                    id=post_id, is_deleted=False
+                )
 
                 # Check jika user memiliki akses
                 if (
@@ -200,131 +264,26 @@ class PostAPIView(View):
                         status=404,
                     )
 
-                # Get user interaction if authenticated
-                user_interaction = (
-                    user_interactions.get(post.id)
-                    if request.user.is_authenticated
-                    else None
-                )
-                is_saved = (
-                    post.id in saved_post_ids
-                    if request.user.is_authenticated
-                    else False
-                )
-
-                post_data = {
-                    "id": post.id,
-                    "title": post.title,
-                    "content": post.content,
-                    "image": post.image.url if post.image else None,
-                    "video_link": post.video_link,
-                    "user": post.user.username,
-                    "user_id": post.user.id,
-                    "created_at": post.created_at.isoformat(),
-                    "updated_at": post.updated_at.isoformat(),
-                    "comment_count": post.comments.filter(is_deleted=False).count(),
-                    "likes_count": post.likes_count,
-                    "dislikes_count": post.dislikes_count,
-                    "shares_count": post.shares_count,
-                    "profile_photo": get_profile_photo_url(post.user),
-                    "user_interaction": user_interaction,
-                    "is_saved": is_saved,
-                    "can_edit": self.get_user_permissions(request.user, post)[0]
-                    or self.get_user_permissions(request.user, post)[1],
-                }
+                record_view(post.id)
+                post_data = serialize_posts([post], request.user)[0]
+                post_data["updated_at"] = post.updated_at.isoformat()
+                post_data["views_count"] += pending_counts(post.id)["views_count"]
 
                 return JsonResponse({"status": "success", "post": post_data})
 
             else:
-                # Get list of posts dengan pagination
-                page = int(request.GET.get("page", 1))
-                per_page = int(request.GET.get("per_page", 10))
-                start = (page - 1) * per_page
-                end = start + per_page
-
-                # Filter posts (superuser bisa lihat semua, user biasa hanya yang tidak deleted)
-                if (
-                    request.user.is_authenticated
-                    and self.get_user_permissions(request.user)[1]
-                ):
-                    posts = Post.objects.all()
-                else:
-                    posts = Post.objects.filter(is_deleted=False)
-
-                filter_by = request.GET.get("filter")
-                if filter_by:
-                    if not request.user.is_authenticated:
-                        posts = Post.objects.none()
-                    elif filter_by == "my":
-                        posts = posts.filter(user=request.user)
-                    elif filter_by == "bookmarked":
-                        posts = posts.filter(id__in=saved_post_ids)
-                    elif filter_by == "liked":
-                        liked_post_ids = [
-                            post_id
-                            for post_id, action in user_interactions.items()
-                            if action == "like"
-                        ]
-                        posts = posts.filter(id__in=liked_post_ids)
-
-                # Apply ordering
-                sort_by = request.GET.get("sort_by", "-created_at")
-                posts = posts.order_by(sort_by)
-
-                posts_data = []
-                for post in posts[start:end]:
-                    user_interaction = (
-                        user_interactions.get(post.id)
-                        if request.user.is_authenticated
-                        else None
-                    )
-                    is_saved = (
-                        post.id in saved_post_ids
-                        if request.user.is_authenticated
-                        else False
-                    )
-
-                    posts_data.append(
-                        {
-                            "id": post.id,
-                            "title": post.title,
-                            "content": post.content,
-                            "image": post.image.url if post.image else None,
-                            "video_link": post.video_link,
-                            "user": post.user.username,
-                            "user_id": post.user.id,
-                            "created_at": post.created_at.isoformat(),
-                            "profile_photo": get_profile_photo_url(post.user),
-                            "comment_count": post.comments.filter(
-                                is_deleted=False
-                            ).count(),
-                            "likes_count": post.likes_count,
-                            "dislikes_count": post.dislikes_count,
-                            "shares_count": post.shares_count,
-                            "user_interaction": user_interaction,
-                            "is_saved": is_saved,
-                            "can_edit": self.get_user_permissions(request.user, post)[0]
-                            or self.get_user_permissions(request.user, post)[1],
-                        }
-                    )
-
-                return JsonResponse(
-                    {
-                        "status": "success",
-                        "posts": posts_data,
-                        "pagination": {
-                            "page": page,
-                            "per_page": per_page,
-                            "total": posts.count(),
-                            "has_next": end < posts.count(),
-                        },
-                    }
+                # Pengunjung anonim melihat feed yang sama, jadi payload di-cache
+                payload = cached_for_anonymous(
+                    request, "post_api_list", lambda: self.list_payload(request)
                 )
+                return JsonResponse(payload)
 
         except Post.DoesNotExist:
             return JsonResponse(
                 {"status": "error", "message": "Post tidak ditemukan"}, status=404
             )
+        except (InvalidCursor, InvalidPageParam) as e:
+            return JsonResponse({"status": "error", "message": str(e)}, status=400)
         except Exception as e:
             return JsonResponse(
                 {"status": "error", "message": f"Error retrieving post: {str(e)}"},
@@ -426,7 +385,6 @@ class PostAPIView(View):
                     image_name = data.get("image_name") or f"post_{post.id}.jpg"
                     file_data = base64.b64decode(image_b64)
                     post.image.save(image_name, ContentFile(file_data))
-                    post.save()
                 except Exception as e:
                     # If saving image fails, log and continue (post already created)
                     print(f"Failed to save base64 image: {e}")
@@ -441,6 +399,7 @@ class PostAPIView(View):
                         "title": post.title,
                         "content": post.content,
                         "image": post.image.url if post.image else None,
+                        "image_status": post.image_status,
                         "video_link": post.video_link,
                         "user": post.user.username,
                         "created_at": post.created_at.isoformat(),
@@ -569,6 +528,7 @@ class PostAPIView(View):
                         "title": post.title,
                         "content": post.content,
                         "image": post.image.url if post.image else None,
+                        "image_status": post.image_status,
                         "video_link": post.video_link,
                         "updated_at": post.updated_at.isoformat(),
                     },
@@ -691,28 +651,36 @@ class PostInteractionView(View):
 # TAMBAH FUNGSI UNTUK SEARCH POST
 def hot_threads(request):
     """
-    Menampilkan thread terpopuler berdasarkan jumlah like + komentar
+    Menampilkan thread terpopuler dari tabel skor hot yang sudah dihitung
+    (like + komentar dengan peluruhan waktu, lihat post/hot.py)
     """
-    posts = (
-        Post.objects.filter(is_deleted=False)
-        .annotate(
-            likes_count=Count(
-                "interactions", filter=Q(interactions__interaction_type="like")
-            ),
-            comments_count=Count("comments"),
-        )
-        .annotate(
-            total_score=Count(
-                "interactions", filter=Q(interactions__interaction_type="like")
-            )
-            + Count("comments")
-        )
-        .order_by("-total_score", "-created_at")[:50]
-    )
+    posts = hot_posts()
 
     return render(
-        request, "post/hot_threads.html", {"posts": posts, "page_title": "Hot Threads"}
+        request,
+        "hot_threads.html",
+        {"posts": posts, "page_title": "Hot Threads", **fragment_cache_context(request)},
+    )
+
+
+def hot_threads_api(request):
+    """
+    API: daftar thread terpopuler (JSON), urutan sama dengan halaman Hot Threads.
+    Mendukung ?limit= (maksimal 100).
+    """
+    try:
+        limit = max(min(int(request.GET.get("limit", 50)), 100), 1)
+    except (TypeError, ValueError):
+        limit = 50
+    payload = cached_for_anonymous(
+        request,
+        "hot_threads_api",
+        lambda: {
+            "status": "success",
+            "posts": serialize_posts(hot_posts(limit), request.user),
+        },
     )
+    return JsonResponse(payload)
 
 
 @login_required
@@ -735,11 +703,19 @@ def bookmarked_threads(request):
 
 
 def recent_thread(request):
-    posts = Post.objects.filter(is_deleted=False).order_by("-created_at")[:50]
+    posts = (
+        Post.objects.filter(is_deleted=False)
+        .select_related("user")
+        .order_by("-created_at")[:50]
+    )
     return render(
         request,
-        "post/recent_threads.html",
-        {"posts": posts, "page_title": "Recent Threads"},
+        "recent_thread.html",
+        {
+            "posts": posts,
+            "page_title": "Recent Threads",
+            **fragment_cache_context(request),
+        },
     )
 
 
@@ -767,8 +743,9 @@ def post_detail(request, post_id):
     post.can_edit = request.user.is_authenticated and (
         post.user == request.user or can_manage_all
     )
-    post.comment_count = post.comments.filter(is_deleted=False).count()
+    post.comment_count = post.comments_count
     post.video_thumbnail = _extract_youtube_thumbnail(post.video_link)
+    record_view(post.id)
 
     return render(
         request, "post/post_detail.html", {"post": post, "page_title": post.title}
@@ -821,11 +798,15 @@ def proxy_image(request):
         image_url = request.build_absolute_uri(image_url)
 
     try:
-        # Fetch image from external source with a friendly UA to avoid 403s
-        response = requests.get(image_url, timeout=10, headers=proxy_headers)
-        response.raise_for_status()
+        # Fetch image from external source with a friendly UA to avoid 403s;
+        # body di-stream dan disimpan di cache disk (smash/image_cache.py)
+        image, cache_status = fetch_image(
+            image_url,
+            headers=proxy_headers,
+            byte_range=request.headers.get("Range"),
+        )
 
-        content_type = response.headers.get("Content-Type", "").lower()
+        content_type = image.content_type.lower()
 
         # Fall back to inferring type for providers that omit the header
         if not content_type.startswith("image/"):
@@ -833,7 +814,8 @@ def proxy_image(request):
             if guessed_type and guessed_type.startswith("image/"):
                 content_type = guessed_type
             else:
-                payload = response.content
+                # Cukup chunk pertama untuk mengenali signature
+                payload = image.head
                 if payload.startswith(b"\x89PNG\r\n\x1a\n"):
                     content_type = "image/png"
                 elif payload.startswith(b"RIFF") and payload[8:12] == b"WEBP":
@@ -845,9 +827,11 @@ def proxy_image(request):
                 else:
                     content_type = "image/jpeg"
 
-        resp = HttpResponse(
-            response.content,
-            content_type=content_type or "application/octet-stream",
+        resp = image_response(
+            request,
+            image,
+            cache_status,
+            content_type or "application/octet-stream",
         )
         # Helpful headers for clients (CORS for web use, caching)
         resp["Access-Control-Allow-Origin"] = "*"
@@ -976,7 +960,11 @@ def create_post_flutter(request):
         new_post.save()
 
         return JsonResponse(
-            {"message": "Post created successfully", "post_id": str(new_post.id)},
+            {
+                "message": "Post created successfully",
+                "post_id": str(new_post.id),
+                "image_status": new_post.image_status,
+            },
             status=201,
         )
     except User.DoesNotExist:
@@ -1142,6 +1130,7 @@ def edit_post_flutter(request, post_id):
                     "title": post.title,
                     "content": post.content,
                     "image": post.image.url if post.image else None,
+                    "image_status": post.image_status,
                     "video_link": post.video_link,
                     "updated_at": post.updated_at.isoformat(),
                 },
@@ -1220,62 +1209,182 @@ def save_post_flutter(request):
         return JsonResponse({"error": str(e)}, status=400)
 
 
+@csrf_exempt
+def interactions_batch(request):
+    """
+    Terapkan banyak aksi like/dislike/save/share (post) dan like/dislike
+    (komentar) yang diantrekan app mobile saat offline, dalam satu request.
+
+    Accepts POST JSON {"actions": [{"target": "post"|"comment", "id": ...,
+    "action": ...}, ...], "user_id": optional}. Aksi diterapkan berurutan
+    dalam satu transaksi (lihat post/batch.py) dan response berisi state
+    akhir setiap post/komentar target.
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "Invalid HTTP method"}, status=401)
+
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError:
+        return JsonResponse({"error": "Invalid JSON"}, status=400)
+
+    user = None
+    if request.user.is_authenticated:
+        user = request.user
+    elif isinstance(data, dict) and (data.get("user_id") or data.get("userId")):
+        try:
+            user = User.objects.get(id=int(data.get("user_id") or data.get("userId")))
+        except (User.DoesNotExist, ValueError):
+            return JsonResponse(
+                {"error": "User not found (provided user_id invalid)"}, status=400
+            )
+    if user is None:
+        return JsonResponse(
+            {"error": "Authentication required or provide user_id in payload"},
+            status=401,
+        )
+
+    try:
+        actions = parse_actions(data)
+    except InvalidBatch as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    result = apply_interaction_batch(user, actions)
+    return JsonResponse({"status": "success", **result})
+
+
+def _flutter_viewer(request):
+    """User dari ?user_id= (dipakai app Flutter), di-resolve sekali per request"""
+    user_id = request.GET.get("user_id")
+    if user_id:
+        user = User.objects.filter(id=user_id).first()
+        if user is not None:
+            return user
+    return AnonymousUser()
+
+
+def _flutter_comment(node):
+    """Ubah dict dari comment.tree ke format field yang dipakai app Flutter"""
+    return {
+        "id": node["id"],
+        "parent_id": node["parent_id"],
+        "content": node["content"],
+        "author": node["user"],
+        "user_id": node["user_id"],
+        "profile_photo": node["profile_photo"],
+        "created_at": node["created_at"],
+        "updated_at": node["updated_at"],
+        "likes_count": node["likes_count"],
+        "dislikes_count": node["dislikes_count"],
+        "user_reaction": node["user_interaction"],
+        "reply_count": node["reply_count"],
+        "replies": [_flutter_comment(reply) for reply in node["replies"]],
+    }
+
+
+def _paginated_flutter_comments(request, post):
+    """
+    get_comments dengan ?cursor=: komentar top-level terbaru dulu, masing-masing
+    dengan ?replies= balasan pertama dan reply_count. Balasan lainnya diambil
+    lewat /comments/<comment_id>/replies/list/.
+    """
+    top_level = post.comments.filter(is_deleted=False, parent__isnull=True)
+    try:
+        viewer = _flutter_viewer(request)
+        per_page = per_page_param(request, 20)
+        roots, next_cursor = paginate_by_cursor(
+            top_level.select_related("user__profile"), request.GET.get("cursor"), per_page
+        )
+    except (InvalidCursor, ValueError) as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    nodes = load_comment_page(roots, viewer, reply_preview_limit(request))
+    return JsonResponse(
+        {
+            "comments": [_flutter_comment(node) for node in nodes],
+            "pagination": {
+                "per_page": per_page,
+                "next_cursor": next_cursor,
+                "has_next": next_cursor is not None,
+            },
+        }
+    )
+
+
 def get_comments(request, post_id):
     """
     Returns comments for a specific post as JSON suitable for consumption by a
     mobile app (e.g. Flutter). Each comment includes id, content, author,
-    timestamps.
+    timestamps. With ?cursor= the top-level comments are paginated and each
+    carries a preview of its replies plus reply_count. With ?since=<ISO
+    datetime> only comments created, edited or deleted after that time are
+    returned (deleted ones as id/parent_id/is_deleted/updated_at tombstones);
+    the X-Next-Since header holds the value for the next poll.
     """
     try:
         p = Post.objects.get(id=post_id, is_deleted=False)
     except Post.DoesNotExist:
         return JsonResponse({"error": "Post not found"}, status=404)
 
+    # Mode cursor (opt-in): halaman komentar top-level + preview balasan
+    if wants_cursor(request):
+        return _paginated_flutter_comments(request, p)
+
+    try:
+        viewer = _flutter_viewer(request)
+        since = parse_since(request)
+    except (InvalidSince, ValueError) as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
     # Order by newest first for mobile clients
-    comments_qs = p.comments.filter(is_deleted=False).order_by("-created_at")
+    started_at = timezone.now()
+    comments_qs = p.comments.select_related("user__profile").order_by("-created_at")
+    if since is None:
+        comments_qs = comments_qs.filter(is_deleted=False)
+    else:
+        # Delta: komentar baru/diedit/dihapus sejak `since`; yang dihapus dikirim
+        # sebagai tombstone (is_deleted=True) agar app bisa membuangnya dari cache lokal
+        comments_qs = comments_qs.filter(updated_at__gt=since)
+    comments_qs = list(comments_qs)
+
+    live = [c for c in comments_qs if not c.is_deleted]
+    photos = user_photo_urls(c.user for c in live)
+    reactions = viewer_comment_interactions(viewer, [c.pk for c in live])
     comments_list = []
-    profile_cache = {}
-
-    def get_profile_photo_url(user_obj):
-        if not user_obj:
-            return None
-        if user_obj.id in profile_cache:
-            return profile_cache[user_obj.id]
-        profile = Profile.objects.filter(user=user_obj).first()
-        url = profile.profile_photo.url if profile and profile.profile_photo else None
-        profile_cache[user_obj.id] = url
-        return url
-
-    user_id = request.GET.get("user_id")
     for c in comments_qs:
-        user_reaction = None
-        if user_id:
-            try:
-                u = User.objects.get(id=user_id)
-                try:
-                    ci = CommentInteraction.objects.get(user=u, comment=c)
-                    user_reaction = ci.interaction_type
-                except CommentInteraction.DoesNotExist:
-                    user_reaction = None
-            except User.DoesNotExist:
-                user_reaction = None
-
-        comments_list.append(
-            {
-                "id": c.id,
-                "content": c.content,
-                "author": getattr(c.user, "username", None),
-                "user_id": c.user.id if c.user else None,
-                "profile_photo": get_profile_photo_url(c.user),
-                "created_at": c.created_at.isoformat() if c.created_at else None,
-                "updated_at": c.updated_at.isoformat() if c.updated_at else None,
-                "likes_count": c.likes_count,
-                "dislikes_count": c.dislikes_count,
-                "user_reaction": user_reaction,
-            }
-        )
-
-    return JsonResponse(comments_list, safe=False)
+        if c.is_deleted:
+            # Tombstone: cukup agar app membuang komentar dari cache lokalnya,
+            # tanpa isi maupun penulis komentar yang sudah dihapus
+            comments_list.append(
+                {
+                    "id": c.id,
+                    "parent_id": c.parent_id,
+                    "is_deleted": True,
+                    "updated_at": c.updated_at.isoformat() if c.updated_at else None,
+                }
+            )
+            continue
+        item = {
+            "id": c.id,
+            "parent_id": c.parent_id,
+            "content": c.content,
+            "author": c.user.username,
+            "user_id": c.user_id,
+            "profile_photo": photos.get(c.user_id),
+            "created_at": c.created_at.isoformat() if c.created_at else None,
+            "updated_at": c.updated_at.isoformat() if c.updated_at else None,
+            "likes_count": c.likes_count,
+            "dislikes_count": c.dislikes_count,
+            "user_reaction": reactions.get(c.pk),
+        }
+        if since is not None:
+            item["is_deleted"] = c.is_deleted
+        comments_list.append(item)
+
+    response = JsonResponse(comments_list, safe=False)
+    # Dipakai app sebagai ?since= pada polling berikutnya
+    response["X-Next-Since"] = started_at.isoformat()
+    return response
 
 
 @csrf_exempt
@@ -0,0 +1,58 @@
+"""
+Persiapan Profile.user menjadi OneToOneField: setiap user dipastikan punya
+tepat satu profil.
+
+- Profil duplikat per user digabung ke profil dengan pk terkecil (yang selama
+  ini dipakai lewat .first()); bio/foto yang kosong diisi dari duplikat
+  terbaru yang punya nilai, lalu duplikat dihapus.
+- Profil tanpa user dihapus.
+- User yang belum punya profil dibuatkan profil kosong.
+"""
+from django.conf import settings
+from django.db import migrations
+
+
+def dedupe_profiles(apps, schema_editor):
+    Profile = apps.get_model("profil", "Profile")
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+
+    Profile.objects.filter(user__isnull=True).delete()
+
+    groups = {}
+    for profile in Profile.objects.order_by("user_id", "pk").iterator():
+        groups.setdefault(profile.user_id, []).append(profile)
+
+    duplicates = []
+    for primary, *others in groups.values():
+        if not others:
+            continue
+        duplicates.extend(profile.pk for profile in others)
+        changed = []
+        # Isi field kosong dari duplikat terbaru yang punya nilai
+        for profile in reversed(others):
+            if not primary.bio and profile.bio:
+                primary.bio = profile.bio
+                changed.append("bio")
+            if not primary.profile_photo and profile.profile_photo:
+                primary.profile_photo = profile.profile_photo.name
+                changed.append("profile_photo")
+        if changed:
+            primary.save(update_fields=changed)
+    Profile.objects.filter(pk__in=duplicates).delete()
+
+    missing = User.objects.exclude(pk__in=Profile.objects.values("user_id"))
+    Profile.objects.bulk_create(
+        Profile(user_id=user_id) for user_id in missing.values_list("pk", flat=True)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profil", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_profiles, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profil', '0003_profile_user_one_to_one'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='profile_photo_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
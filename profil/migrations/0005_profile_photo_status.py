@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:50
+
+from django.db import migrations, models
+
+
+def mark_existing_ready(apps, schema_editor):
+    # Gambar yang sudah ada sebelum antrian job langsung dianggap siap
+    Model = apps.get_model("profil", "Profile")
+    Model.objects.exclude(profile_photo="").exclude(profile_photo__isnull=True).update(
+        profile_photo_status="ready"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profil', '0004_profile_photo_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='profile_photo_status',
+            field=models.CharField(choices=[('none', 'Tanpa gambar'), ('processing', 'Sedang diproses'), ('ready', 'Siap'), ('failed', 'Gagal diproses')], default='none', editable=False, max_length=10),
+        ),
+        migrations.RunPython(mark_existing_ready, migrations.RunPython.noop),
+    ]
@@ -1,14 +1,58 @@
 from django.db import models
 from django.contrib.auth.models import User
 
+from smash.images import IMAGE_NONE, IMAGE_STATUS_CHOICES, sync_image
+
+from .photos import invalidate_profile_photo
+
 def upload_to(instance, filename):
     return f"profile_photos/{instance.user.username}/{filename}"
 
 # penambahan field untuk mengganti foto profile dan username
 class Profile(models.Model):
-    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True)
+    # Satu profil per user; dibuat otomatis saat user baru dibuat (signals.py)
+    # dan bisa di-join lewat select_related("user__profile")
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="profile")
     # menambahkan blank=True agar field bio bisa kosong
     bio = models.TextField(blank=True)
     profile_photo = models.ImageField(upload_to=upload_to, null=True, blank=True)
-    
+    # Thumbnail avatar per lebar/format, diisi oleh smash/images.py
+    profile_photo_variants = models.JSONField(default=dict, blank=True, editable=False)
+    profile_photo_status = models.CharField(
+        max_length=10, choices=IMAGE_STATUS_CHOICES, default=IMAGE_NONE, editable=False
+    )
+
+    # Ditulis oleh sync_image() dan job images.process (smash/images.py);
+    # save() biasa tidak boleh menimpanya dengan nilai instance yang sudah basi
+    IMAGE_JOB_FIELDS = ("profile_photo_variants", "profile_photo_status")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Simpan nama file awal agar save() tahu apakah foto berubah
+        instance._loaded_photo_name = instance.__dict__.get("profile_photo")
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Simpan profil dan buang URL foto di cache jika fotonya berubah"""
+        adding = self._state.adding
+        if not adding and kwargs.get("update_fields") is None and not kwargs.get("force_insert"):
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.IMAGE_JOB_FIELDS
+            ]
+        super().save(*args, **kwargs)
+        photo_name = self.profile_photo.name if self.profile_photo else None
+        previous_name = getattr(self, "_loaded_photo_name", None)
+        sync_image(
+            self, "profile_photo", "profile_photo_variants", "profile_photo_status", previous_name
+        )
+        if adding or photo_name != (previous_name or None):
+            invalidate_profile_photo(self.user_id)
+        self._loaded_photo_name = photo_name
 
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_profile_photo(self.user_id)
+        return result
@@ -0,0 +1,132 @@
+"""
+Resolver URL foto profil yang dipakai bersama oleh semua serializer/endpoint.
+
+profile_photo_urls() menerima banyak user_id sekaligus: yang sudah ada di cache
+(antar-request, lewat settings.CACHES) langsung dipakai, sisanya diambil dalam
+satu query Profile. Entri cache dihapus oleh Profile.save()/delete() setiap
+kali foto seorang user berubah.
+
+user_photo_urls() menerima objek User: jika query sumbernya memakai
+select_related("user__profile") profil sudah ikut di-join dalam SQL yang sama,
+sehingga URL dibaca langsung tanpa query maupun cache.
+
+Cache harus dipakai bersama semua worker agar invalidasi itu terlihat di
+mana-mana. Dengan CACHE_BACKEND "locmem" (default, per proses) invalidasi
+hanya membersihkan cache worker yang menyimpan foto; worker lain tetap
+memberi URL lama (bisa menunjuk file yang sudah dihapus) sampai entri
+kedaluwarsa. Karena itu pada LocMemCache umur entri dipotong menjadi
+PROFILE_PHOTO_LOCAL_CACHE_TIMEOUT detik; di production pakai CACHE_BACKEND
+"redis" atau "database" agar PROFILE_PHOTO_CACHE_TIMEOUT penuh berlaku.
+
+user_photo_srcsets() memberi map srcset thumbnail avatar (smash/images.py)
+dengan aturan join yang sama; user yang profilnya tidak di-join diambil dalam
+satu query.
+"""
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+from smash.images import variant_srcset
+
+# Penanda "user tidak punya foto" karena cache tidak bisa membedakan None dan miss
+NO_PHOTO = ""
+
+
+def photo_cache_timeout():
+    timeout = getattr(settings, "PROFILE_PHOTO_CACHE_TIMEOUT", 3600)
+    # Cache per proses tidak ikut ter-invalidasi di worker lain
+    if isinstance(caches[DEFAULT_CACHE_ALIAS], LocMemCache):
+        return min(timeout, getattr(settings, "PROFILE_PHOTO_LOCAL_CACHE_TIMEOUT", 10))
+    return timeout
+
+
+def photo_cache_key(user_id):
+    return f"profile_photo:{user_id}"
+
+
+def profile_photo_urls(user_ids):
+    """
+    Ambil URL foto profil untuk banyak user (maksimal satu query).
+    Mengembalikan dict {user_id: url atau None}.
+    """
+    from .models import Profile
+
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if not user_ids:
+        return {}
+    keys = {photo_cache_key(user_id): user_id for user_id in user_ids}
+    cached = cache.get_many(keys)
+    photos = {keys[key]: url or None for key, url in cached.items()}
+
+    missing = user_ids - photos.keys()
+    if missing:
+        storage = Profile._meta.get_field("profile_photo").storage
+        found = dict.fromkeys(missing, NO_PHOTO)
+        rows = Profile.objects.filter(user_id__in=missing).values_list(
+            "user_id", "profile_photo"
+        )
+        for user_id, photo_name in rows:
+            found[user_id] = storage.url(photo_name) if photo_name else NO_PHOTO
+        cache.set_many(
+            {photo_cache_key(user_id): url for user_id, url in found.items()},
+            photo_cache_timeout(),
+        )
+        photos.update({user_id: url or None for user_id, url in found.items()})
+    return photos
+
+
+def user_photo_urls(users):
+    """
+    Seperti profile_photo_urls() tetapi untuk objek User. Profil yang sudah
+    di-join (select_related("user__profile")) dipakai langsung; user lain
+    diselesaikan lewat cache/query bulk.
+    """
+    from .models import Profile
+
+    relation = Profile._meta.get_field("user").remote_field
+    photos, missing = {}, set()
+    for user in users:
+        if user is None:
+            continue
+        if relation.is_cached(user):
+            profile = relation.get_cached_value(user)
+            photo = profile.profile_photo if profile else None
+            photos[user.pk] = photo.url if photo else None
+        else:
+            missing.add(user.pk)
+    photos.update(profile_photo_urls(missing))
+    return photos
+
+
+def user_photo_srcsets(users):
+    """
+    Map srcset avatar {user_id: {format: {lebar: url}} atau None} untuk objek
+    User; profil yang sudah di-join tidak butuh query.
+    """
+    from .models import Profile
+
+    relation = Profile._meta.get_field("user").remote_field
+    storage = Profile._meta.get_field("profile_photo").storage
+    srcsets, missing = {}, set()
+    for user in users:
+        if user is None:
+            continue
+        if relation.is_cached(user):
+            profile = relation.get_cached_value(user)
+            variants = profile.profile_photo_variants if profile else None
+            srcsets[user.pk] = variant_srcset(storage, variants)
+        else:
+            missing.add(user.pk)
+    if missing:
+        srcsets.update(dict.fromkeys(missing))
+        rows = Profile.objects.filter(user_id__in=missing).values_list(
+            "user_id", "profile_photo_variants"
+        )
+        for user_id, variants in rows:
+            srcsets[user_id] = variant_srcset(storage, variants)
+    return srcsets
+
+
+def invalidate_profile_photo(user_id):
+    if user_id is not None:
+        cache.delete(photo_cache_key(user_id))
@@ -0,0 +1,13 @@
+# profil/signals.py
+from django.conf import settings
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Profile
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL, dispatch_uid="profil_create_profile")
+def create_profile_for_new_user(sender, instance, created, raw=False, **kwargs):
+    """Buat Profile kosong untuk setiap user baru (register, admin, createsuperuser)"""
+    if created and not raw:
+        Profile.objects.get_or_create(user=instance)
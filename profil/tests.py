@@ -1,3 +1,179 @@
-from django.test import TestCase
+import json
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from post.models import Post
+
+from .models import Profile
+from .photos import photo_cache_timeout, profile_photo_urls, user_photo_urls
+
+User = get_user_model()
+
+
+class PostExportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='dumper', password='pass')
+        Post.objects.create(user=self.user, title='Satu', content='a')
+        Post.objects.create(user=self.user, title='Dua', content='b')
+
+    def test_streams_all_posts_as_json_or_ndjson(self):
+        response = self.client.get('/profil/json/')
+        self.assertTrue(response.streaming)
+        data = json.loads(b''.join(response.streaming_content))
+        self.assertEqual([p['title'] for p in data], ['Satu', 'Dua'])
+        self.assertEqual(data[0]['user_name'], 'dumper')
+        self.assertIsNone(data[0]['image'])
+
+        response = self.client.get('/profil/json/?format=ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(json.loads(lines[1])['title'], 'Dua')
+
+
+class ProfilePhotoResolverTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.with_photo = User.objects.create_user(username='foto', password='pass')
+        self.without = User.objects.create_user(username='polos', password='pass')
+        # Profile sudah dibuat otomatis saat user dibuat
+        self.profile = self.with_photo.profile
+        self.profile.profile_photo = 'profile_photos/foto/a.png'
+        self.profile.save()
+
+    def test_resolves_many_users_in_one_query_then_from_cache(self):
+        ids = [self.with_photo.pk, self.without.pk]
+        with self.assertNumQueries(1):
+            photos = profile_photo_urls(ids)
+        self.assertTrue(photos[self.with_photo.pk].endswith('profile_photos/foto/a.png'))
+        self.assertIsNone(photos[self.without.pk])
+        with self.assertNumQueries(0):
+            self.assertEqual(profile_photo_urls(ids), photos)
+
+    def test_cache_is_invalidated_when_photo_changes(self):
+        profile_photo_urls([self.with_photo.pk])
+        profile = Profile.objects.get(pk=self.profile.pk)
+        profile.profile_photo = 'profile_photos/foto/b.png'
+        profile.save()
+        url = profile_photo_urls([self.with_photo.pk])[self.with_photo.pk]
+        self.assertTrue(url.endswith('b.png'))
+
+        profile.profile_photo = None
+        profile.save()
+        self.assertIsNone(profile_photo_urls([self.with_photo.pk])[self.with_photo.pk])
+
+
+    @override_settings(PROFILE_PHOTO_CACHE_TIMEOUT=3600, PROFILE_PHOTO_LOCAL_CACHE_TIMEOUT=10)
+    def test_per_process_cache_keeps_entries_short(self):
+        with override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }}):
+            self.assertEqual(photo_cache_timeout(), 10)
+        with override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': '/tmp/smash-test-cache',
+        }}):
+            self.assertEqual(photo_cache_timeout(), 3600)
+
+
+class ProfileOneToOneTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.user = User.objects.create_user(username='baru', password='pass')
+
+    def test_profile_created_on_signup(self):
+        self.assertEqual(Profile.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(self.user.profile.bio, '')
+        # Menyimpan ulang user tidak membuat profil kedua
+        self.user.save()
+        self.assertEqual(Profile.objects.filter(user=self.user).count(), 1)
+
+    def test_avatar_joined_with_post_query(self):
+        profile = self.user.profile
+        profile.profile_photo = 'profile_photos/baru/a.png'
+        profile.save()
+        Post.objects.create(user=self.user, title='Satu', content='isi')
+
+        with self.assertNumQueries(1):
+            post = Post.objects.select_related('user__profile').get()
+            photos = user_photo_urls([post.user])
+        self.assertTrue(photos[self.user.pk].endswith('profile_photos/baru/a.png'))
+
+        # Tanpa join tetap diselesaikan lewat resolver bulk/cache
+        post = Post.objects.get()
+        self.assertEqual(user_photo_urls([post.user]), photos)
+
+    def test_backfill_creates_missing_profiles(self):
+        import importlib
+
+        from django.apps import apps
+
+        migration = importlib.import_module('profil.migrations.0002_dedupe_profiles')
+        Profile.objects.filter(user=self.user).delete()
+        migration.dedupe_profiles(apps, None)
+        self.assertTrue(Profile.objects.filter(user=self.user).exists())
+
+
+class ProfilePhotoVariantTests(TestCase):
+    def setUp(self):
+        import shutil
+        import tempfile
+        from io import BytesIO
+
+        from django.core.cache import cache
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from django.test import override_settings
+        from PIL import Image
+
+        cache.clear()
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        override = override_settings(
+            MEDIA_ROOT=media, IMAGE_VARIANT_WIDTHS=[64, 320], JOBS_MODE='sync'
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+
+        buffer = BytesIO()
+        Image.new('RGB', (500, 500), (10, 120, 200)).save(buffer, 'JPEG')
+        self.user = User.objects.create_user(username='avatar', password='pass')
+        profile = self.user.profile
+        profile.profile_photo = SimpleUploadedFile('me.jpg', buffer.getvalue())
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.save()
+
+    def test_profile_api_exposes_avatar_srcset(self):
+        data = self.client.get(f'/profil/api/profile/{self.user.pk}/').json()['data']
+        srcset = data['profile_photo_srcset']
+        self.assertEqual(sorted(srcset['webp']), ['320', '64'])
+        self.assertTrue(srcset['webp']['64'].startswith('http://testserver/'))
+        self.assertTrue(srcset['jpeg']['64'].endswith('_w64.jpg'))
+        self.assertEqual(data['profile_photo_status'], 'ready')
+
+    def test_stale_profile_save_keeps_processed_photo(self):
+        from profil.models import Profile
+
+        stale = Profile.objects.get(user=self.user)
+        Profile.objects.filter(pk=stale.pk).update(profile_photo_status='processing')
+        stale = Profile.objects.get(pk=stale.pk)
+        Profile.objects.filter(pk=stale.pk).update(profile_photo_status='ready')
+
+        stale.bio = 'halo'
+        stale.save()
+        stale.refresh_from_db()
+        self.assertEqual((stale.bio, stale.profile_photo_status), ('halo', 'ready'))
+        self.assertIn('64', stale.profile_photo_variants)
+
+    def test_feed_avatar_srcset_with_and_without_join(self):
+        from django.contrib.auth.models import AnonymousUser
+
+        from post.serializers import serialize_posts
+
+        Post.objects.create(user=self.user, title='Satu', content='isi')
+        joined = serialize_posts(Post.objects.select_related('user__profile'), AnonymousUser())
+        plain = serialize_posts(Post.objects.select_related('user'), AnonymousUser())
+        self.assertEqual(joined[0]['profile_photo_srcset'], plain[0]['profile_photo_srcset'])
+        self.assertIn('64', joined[0]['profile_photo_srcset']['jpeg'])
@@ -1,6 +1,6 @@
 import json
 from django.shortcuts import render, redirect, get_object_or_404
-from post.models import Post, PostSave, PostInteraction
+from post.models import Post
 from django.http import HttpResponseRedirect, JsonResponse
 from profil.models import Profile
 from profil.forms import ProfileForm
@@ -13,6 +13,19 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 from django.templatetags.static import static
 from django.http import QueryDict
+from post.serializers import filter_posts_for_viewer, serialize_posts
+from django.utils import timezone
+from smash.export import (
+    InvalidSince,
+    export_response,
+    iter_rows,
+    parse_since,
+    stream_json_list,
+    stream_ndjson,
+    wants_ndjson,
+)
+from smash.images import variant_srcset
+from smash.pagination import InvalidCursor, paginate_by_cursor, wants_cursor
 
 User = get_user_model()
 
@@ -149,20 +162,40 @@ def change_password_api(request):
 
 
 def show_json(request):
-    post_list = Post.objects.all()
-    data = [
-        {
-            "title": post.title,
-            "content": post.content,
-            "image": post.image.url if post.image else None,
-            "url_vid": post.video_link,
-            "created_at": post.created_at.isoformat() if post.created_at else None,
-            "user_name": post.user.username,
-            "author_id": post.user.id,
+    """
+    Dump seluruh post sebagai JSON yang di-stream (memori tetap datar).
+    Mendukung ?format=ndjson dan ?since=<ISO datetime> untuk export incremental.
+    """
+    try:
+        since = parse_since(request)
+    except InvalidSince as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+
+    started_at = timezone.now()
+    posts = Post.objects.order_by('updated_at', 'pk')
+    if since is not None:
+        posts = posts.filter(updated_at__gt=since)
+    storage = Post._meta.get_field('image').storage
+
+    def to_row(row):
+        return {
+            'title': row['title'],
+            'content': row['content'],
+            'image': storage.url(row['image']) if row['image'] else None,
+            'url_vid': row['video_link'],
+            'created_at': row['created_at'],
+            'user_name': row['user__username'],
+            'author_id': row['user_id'],
         }
-        for post in post_list
-    ]
-    return JsonResponse(data, safe=False)
+
+    rows = iter_rows(
+        posts,
+        ['title', 'content', 'image', 'video_link', 'created_at', 'user__username', 'user_id'],
+        to_row,
+    )
+    if wants_ndjson(request):
+        return export_response(stream_ndjson([('posts', rows)]), True, started_at)
+    return export_response(stream_json_list(rows), False, started_at)
 
 
 @csrf_exempt
@@ -183,11 +216,22 @@ def profile_api(request, user_id=None):
             photo_url = static("images/user-profile.png")
 
         photo_url = request.build_absolute_uri(photo_url)
+        # Thumbnail avatar per format dan lebar (smash/images.py)
+        srcset = variant_srcset(
+            profile_obj.profile_photo.storage, profile_obj.profile_photo_variants
+        )
+        if srcset:
+            srcset = {
+                fmt: {width: request.build_absolute_uri(url) for width, url in urls.items()}
+                for fmt, urls in srcset.items()
+            }
         return {
             "id": profile_obj.user.id,
             "username": profile_obj.user.username,
             "bio": profile_obj.bio,
             "profile_photo": photo_url,
+            "profile_photo_srcset": srcset,
+            "profile_photo_status": profile_obj.profile_photo_status,
             "date_joined": profile_obj.user.date_joined.isoformat()
             if profile_obj.user.date_joined
             else None,
@@ -261,7 +305,8 @@ def profile_posts_api(request):
     - filter=bookmarked: posts the user bookmarked
     - filter=liked: posts the user liked
     - user_id=<id>: view posts for a specific user (filters ignored unless it's your own profile)
-    Supports simple pagination with ?page=&per_page=
+    Supports simple pagination with ?page=&per_page=, or keyset pagination with
+    ?cursor= (empty for the first page, then the returned next_cursor).
     """
     if request.method != "GET":
         return JsonResponse({"status": False, "message": "Method not allowed."}, status=405)
@@ -287,70 +332,43 @@ def profile_posts_api(request):
 
     is_owner = target_user == request.user
 
-    base_qs = Post.objects.filter(is_deleted=False).select_related("user")
+    base_qs = Post.objects.filter(is_deleted=False).select_related("user__profile")
     if not is_owner:
         base_qs = base_qs.filter(user=target_user)
 
-    user_interactions = dict(
-        PostInteraction.objects.filter(user=request.user).values_list("post_id", "interaction_type")
-    )
-    saved_post_ids = set(
-        PostSave.objects.filter(user=request.user).values_list("post_id", flat=True)
-    )
-
-    if is_owner:
-        if filter_param == "bookmarked":
-            posts_qs = base_qs.filter(id__in=saved_post_ids)
-        elif filter_param == "liked":
-            liked_ids = [pid for pid, action in user_interactions.items() if action == "like"]
-            posts_qs = base_qs.filter(id__in=liked_ids)
-        else:  # default "my"
-            posts_qs = base_qs.filter(user=request.user)
-    else:
+    if is_owner and filter_param in ("bookmarked", "liked"):
+        posts_qs = filter_posts_for_viewer(base_qs, request.user, filter_param)
+    else:  # default "my", atau posts milik user lain
         posts_qs = base_qs.filter(user=target_user)
 
+    if wants_cursor(request):
+        try:
+            posts, next_cursor = paginate_by_cursor(
+                posts_qs, request.GET.get("cursor"), per_page
+            )
+        except InvalidCursor as exc:
+            return JsonResponse({"status": False, "message": str(exc)}, status=400)
+        return JsonResponse(
+            {
+                "status": "success",
+                "data": serialize_posts(posts, request.user),
+                "pagination": {
+                    "per_page": per_page,
+                    "next_cursor": next_cursor,
+                    "has_next": next_cursor is not None,
+                },
+            }
+        )
+
     total = posts_qs.count()
     start = (page - 1) * per_page
     end = start + per_page
     posts = posts_qs.order_by("-created_at")[start:end]
 
-    profile_cache = {}
-
-    def get_profile_photo_url(user_obj):
-        if user_obj.id in profile_cache:
-            return profile_cache[user_obj.id]
-        profile_obj = Profile.objects.filter(user=user_obj).first()
-        url = profile_obj.profile_photo.url if profile_obj and profile_obj.profile_photo else None
-        profile_cache[user_obj.id] = url
-        return url
-
-    serialized = []
-    for post in posts:
-        serialized.append(
-            {
-                "id": post.id,
-                "title": post.title,
-                "content": post.content,
-                "image": post.image.url if post.image else None,
-                "video_link": post.video_link,
-                "user": post.user.username,
-                "user_id": post.user.id,
-                "created_at": post.created_at.isoformat(),
-                "comment_count": post.comments.filter(is_deleted=False).count(),
-                "likes_count": post.likes_count,
-                "dislikes_count": post.dislikes_count,
-                "shares_count": post.shares_count,
-                "profile_photo": get_profile_photo_url(post.user),
-                "user_interaction": user_interactions.get(post.id),
-                "is_saved": post.id in saved_post_ids,
-                "can_edit": post.user_id == request.user.id or request.user.is_superuser,
-            }
-        )
-
     return JsonResponse(
         {
             "status": "success",
-            "data": serialized,
+            "data": serialize_posts(posts, request.user),
             "pagination": {
                 "page": page,
                 "per_page": per_page,
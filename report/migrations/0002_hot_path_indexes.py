@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comment', '0002_hot_path_indexes'),
+        ('post', '0008_hot_path_indexes'),
+        ('report', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='report',
+            index=models.Index(fields=['status', 'category', '-created_at'], name='report_status_cat_created_idx'),
+        ),
+    ]
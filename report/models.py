@@ -86,6 +86,13 @@ class Report(models.Model):
         permissions = [
             ("manage_all_reports", "Can manage all reports"),  # Hak akses superuser
         ]
+        indexes = [
+            # Daftar laporan admin: filter status/kategori, terbaru dulu
+            models.Index(
+                fields=['status', 'category', '-created_at'],
+                name='report_status_cat_created_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"Laporan {self.category} oleh {self.reporter.username}"
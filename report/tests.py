@@ -1016,4 +1016,23 @@ class ReportEdgeCasesTest(TestCase):
         # Verifikasi deskripsi kosong tersimpan
         report_id = response.json()['report_id']
         report = Report.objects.get(id=report_id)
-        self.assertEqual(report.description, '')
\ No newline at end of file
+        self.assertEqual(report.description, '')
+
+
+class ReportPaginationParamsTest(TestCase):
+    """Parameter halaman ReportAPIView memakai helper smash/pagination.py"""
+
+    def setUp(self):
+        User.objects.create_superuser(username='admin_page', password='testpass123')
+        self.client.login(username='admin_page', password='testpass123')
+        self.url = reverse('report:report-list-create')
+
+    def test_bad_page_params_return_400(self):
+        for params in ({'cursor': '', 'per_page': 'abc'}, {'per_page': 'x'}, {'page': 'x'}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 400)
+
+    def test_per_page_is_clamped_in_cursor_mode(self):
+        response = self.client.get(self.url, {'cursor': '', 'per_page': 500})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['pagination']['per_page'], 100)
@@ -11,6 +11,14 @@ from django.contrib.auth import get_user_model
 from .models import Report
 from post.models import Post
 from comment.models import Comment
+from smash.pagination import (
+    InvalidCursor,
+    InvalidPageParam,
+    page_param,
+    paginate_by_cursor,
+    per_page_param,
+    wants_cursor,
+)
 
 User = get_user_model()
 
@@ -103,14 +111,22 @@ class ReportAPIView(View):
                 if category_filter:
                     reports = reports.filter(category=category_filter)
                 
-                # Pagination
-                page = int(request.GET.get('page', 1))
-                per_page = int(request.GET.get('per_page', 20))
-                start = (page - 1) * per_page
-                end = start + per_page
+                # Pagination (offset default, atau keyset jika ?cursor= dikirim)
+                per_page = per_page_param(request, 20)
+                reports = reports.select_related('reporter', 'post', 'comment')
+                use_cursor = wants_cursor(request)
+                if use_cursor:
+                    page_reports, next_cursor = paginate_by_cursor(
+                        reports, request.GET.get('cursor'), per_page
+                    )
+                else:
+                    page = page_param(request)
+                    start = (page - 1) * per_page
+                    end = start + per_page
+                    page_reports = reports.order_by('-created_at')[start:end]
                 
                 reports_data = []
-                for report in reports.order_by('-created_at')[start:end]:
+                for report in page_reports:
                     report_info = {
                         'id': report.id,
                         'reporter': report.reporter.username,
@@ -129,15 +145,25 @@ class ReportAPIView(View):
                     
                     reports_data.append(report_info)
                 
+                if use_cursor:
+                    pagination = {
+                        'per_page': per_page,
+                        'next_cursor': next_cursor,
+                        'has_next': next_cursor is not None
+                    }
+                else:
+                    total = reports.count()
+                    pagination = {
+                        'page': page,
+                        'per_page': per_page,
+                        'total': total,
+                        'has_next': end < total
+                    }
+
                 return JsonResponse({
                     'status': 'success',
                     'reports': reports_data,
-                    'pagination': {
-                        'page': page,
-                        'per_page': per_page,
-                        'total': reports.count(),
-                        'has_next': end < reports.count()
-                    },
+                    'pagination': pagination,
                     'filters': {
                         'status': status_filter,
                         'category': category_filter
@@ -149,6 +175,11 @@ class ReportAPIView(View):
                 'status': 'error',
                 'message': 'Laporan tidak ditemukan'
             }, status=404)
+        except (InvalidCursor, InvalidPageParam) as e:
+            return JsonResponse({
+                'status': 'error',
+                'message': str(e)
+            }, status=400)
         except Exception as e:
             return JsonResponse({
                 'status': 'error',
@@ -0,0 +1,198 @@
+"""
+Full-text search untuk post dengan hasil yang diurutkan berdasarkan relevansi.
+
+- PostgreSQL: kolom post_post.search_vector (tsvector GENERATED ... STORED,
+  bobot A untuk judul dan B untuk isi) dengan GIN index. Kolom dihitung oleh
+  database sendiri sehingga tidak perlu disinkronkan dari Python.
+- SQLite (dev): tabel virtual FTS5 search_post_fts (rowid = id post) yang
+  disinkronkan dari Post.save lewat sync_post_index(), diurutkan dengan bm25.
+- Backend lain atau SQLite tanpa FTS5: fallback ke icontains, urut terbaru.
+
+Setiap kata pada query dicari sebagai prefix ("pad" cocok dengan "padel") dan
+semua kata harus muncul. Post dari user yang username-nya diawali query ikut
+ditampilkan dan mendapat bonus ranking. Tabel/kolom dibuat oleh migration
+search/0001; `manage.py rebuild_search_index` mengisi ulang index SQLite.
+"""
+import re
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connection
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = "search_post_fts"
+# Bobot bm25 per kolom FTS (title, content): judul lebih penting
+FTS_WEIGHTS = (10.0, 1.0)
+# Konfigurasi text search PostgreSQL; 'simple' (tanpa stemming) karena konten
+# campuran bahasa Indonesia/Inggris. Harus sama dengan kolom di migration.
+PG_SEARCH_CONFIG = "simple"
+
+
+def max_results():
+    return getattr(settings, "SEARCH_MAX_RESULTS", 500)
+
+
+def author_boost():
+    return getattr(settings, "SEARCH_AUTHOR_BOOST", 1.0)
+
+
+def tokenize(query):
+    """Pecah query menjadi kata-kata (huruf/angka saja, lowercase)"""
+    return re.findall(r"[^\W_]+", query.lower())[:8]
+
+
+def sync_post_index(post):
+    """
+    Samakan baris FTS untuk satu post (SQLite saja). Post yang di-soft delete
+    dikeluarkan dari index dan masuk kembali saat di-restore.
+    """
+    if connection.vendor != "sqlite":
+        return
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [post.pk])
+            if not post.is_deleted:
+                cursor.execute(
+                    f"INSERT INTO {FTS_TABLE}(rowid, title, content) VALUES (%s, %s, %s)",
+                    [post.pk, post.title, post.content or ""],
+                )
+    except OperationalError:
+        # FTS5 tidak tersedia / migration belum jalan: pencarian memakai fallback
+        pass
+
+
+def rebuild_post_index():
+    """
+    Isi ulang tabel FTS dari seluruh post yang tidak terhapus (SQLite saja).
+    Mengembalikan jumlah post yang diindex, atau None jika tidak berlaku.
+    """
+    from post.models import Post
+
+    if connection.vendor != "sqlite":
+        return None
+
+    table = Post._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}(rowid, title, content) "
+            f"SELECT id, title, COALESCE(content, '') FROM {table} WHERE is_deleted = 0"
+        )
+        return cursor.rowcount
+
+
+def _author_ids(query):
+    User = get_user_model()
+    return list(
+        User.objects.filter(username__istartswith=query).values_list("pk", flat=True)[
+            : max_results()
+        ]
+    )
+
+
+def search_posts(query, page=1, per_page=20):
+    """
+    Cari post untuk `query` dan kembalikan (posts, total) untuk satu halaman.
+    Setiap post diberi atribut `search_rank` (None pada fallback icontains).
+    """
+    from post.models import Post
+
+    terms = tokenize(query)
+    if not terms:
+        return [], 0
+    start = (page - 1) * per_page
+
+    if connection.vendor == "postgresql":
+        return _search_postgres(Post, query, terms, start, per_page)
+    if connection.vendor == "sqlite":
+        try:
+            return _search_sqlite(Post, query, terms, start, per_page)
+        except OperationalError:
+            pass
+    return _search_fallback(Post, query, start, per_page)
+
+
+def _search_postgres(Post, query, terms, start, per_page):
+    tsquery = " & ".join(f"{term}:*" for term in terms)
+    params = [PG_SEARCH_CONFIG, tsquery]
+    matches = RawSQL(
+        "SELECT id FROM post_post WHERE search_vector @@ to_tsquery(%s::regconfig, %s)",
+        params,
+    )
+    rank = RawSQL(
+        "ts_rank_cd(post_post.search_vector, to_tsquery(%s::regconfig, %s))",
+        params,
+        output_field=FloatField(),
+    )
+    author_ids = _author_ids(query)
+    posts = (
+        Post.objects.filter(is_deleted=False)
+        .filter(Q(pk__in=matches) | Q(user_id__in=author_ids))
+        .annotate(
+            search_rank=rank
+            + Case(
+                When(user_id__in=author_ids, then=Value(author_boost())),
+                default=Value(0.0),
+                output_field=FloatField(),
+            )
+        )
+        .order_by("-search_rank", "-created_at")
+    )
+    total = min(posts.count(), max_results())
+    if start >= total:
+        return [], total
+    end = min(start + per_page, total)
+    return list(posts.select_related("user__profile")[start:end]), total
+
+
+def _search_sqlite(Post, query, terms, start, per_page):
+    match = " ".join(f'"{term}"*' for term in terms)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid, bm25({FTS_TABLE}, %s, %s) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s ORDER BY 2 LIMIT %s",
+            [*FTS_WEIGHTS, match, max_results()],
+        )
+        # bm25 bernilai negatif: makin kecil makin relevan
+        scores = {pk: -score for pk, score in cursor.fetchall()}
+
+    author_ids = _author_ids(query)
+    if author_ids:
+        authored = Post.objects.filter(
+            user_id__in=author_ids, is_deleted=False
+        ).values_list("pk", flat=True)[: max_results()]
+        for pk in authored:
+            scores[pk] = scores.get(pk, 0.0) + author_boost()
+
+    ranked = sorted(scores, key=lambda pk: (-scores[pk], -pk))[: max_results()]
+    page_ids = ranked[start : start + per_page]
+    by_id = Post.objects.filter(pk__in=page_ids, is_deleted=False).select_related(
+        "user__profile"
+    ).in_bulk()
+    posts = []
+    for pk in page_ids:
+        if pk in by_id:
+            by_id[pk].search_rank = scores[pk]
+            posts.append(by_id[pk])
+    return posts, len(ranked)
+
+
+def _search_fallback(Post, query, start, per_page):
+    posts = (
+        Post.objects.filter(is_deleted=False)
+        .filter(
+            Q(title__icontains=query)
+            | Q(content__icontains=query)
+            | Q(user__username__icontains=query)
+        )
+        .order_by("-created_at")
+    )
+    total = min(posts.count(), max_results())
+    if start >= total:
+        return [], total
+    end = min(start + per_page, total)
+    page = list(posts.select_related("user__profile")[start:end])
+    for post in page:
+        post.search_rank = None
+    return page, total
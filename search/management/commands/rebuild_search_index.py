@@ -0,0 +1,23 @@
+# search/management/commands/rebuild_search_index.py
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from search.index import rebuild_post_index
+
+
+class Command(BaseCommand):
+    """
+    Isi ulang index FTS5 post di SQLite. Di PostgreSQL kolom search_vector
+    dihitung otomatis oleh database sehingga command ini tidak diperlukan.
+    """
+
+    help = "Rebuild the SQLite full-text index for posts."
+
+    def handle(self, *args, **options):
+        total = rebuild_post_index()
+        if total is None:
+            self.stdout.write(
+                f"Nothing to do: {connection.vendor} keeps the search index up to date."
+            )
+            return
+        self.stdout.write(self.style.SUCCESS(f"{total} post(s) indexed."))
@@ -0,0 +1,60 @@
+from django.db import OperationalError, migrations
+
+# Disalin dari search/index.py saat migration ini dibuat; migration tidak
+# boleh bergantung pada kode aplikasi yang bisa berubah
+FTS_TABLE = "search_post_fts"
+PG_SEARCH_CONFIG = "simple"
+
+# Bobot A untuk judul dan B untuk isi
+PG_SEARCH_VECTOR = (
+    f"setweight(to_tsvector('{PG_SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{PG_SEARCH_CONFIG}', coalesce(content, '')), 'B')"
+)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(
+            "ALTER TABLE post_post ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({PG_SEARCH_VECTOR}) STORED"
+        )
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS post_post_search_vector_idx "
+            "ON post_post USING GIN (search_vector)"
+        )
+    elif vendor == "sqlite":
+        try:
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                "title, content, tokenize = 'unicode61 remove_diacritics 2')"
+            )
+        except OperationalError:
+            # SQLite tanpa FTS5: pencarian memakai fallback icontains
+            return
+        Post = apps.get_model("post", "Post")
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE}(rowid, title, content) "
+            f"SELECT id, title, COALESCE(content, '') FROM {Post._meta.db_table} "
+            "WHERE is_deleted = 0"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS post_post_search_vector_idx")
+        schema_editor.execute("ALTER TABLE post_post DROP COLUMN IF EXISTS search_vector")
+    elif vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("post", "0006_posthotscore"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
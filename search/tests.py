@@ -1,3 +1,64 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.test import TransactionTestCase
 
-# Create your tests here.
+from post.models import Post
+
+from search.index import rebuild_post_index, search_posts
+
+User = get_user_model()
+
+
+class PostSearchTests(TransactionTestCase):
+    # Bukan TestCase: FTS5 di SQLite 3.40 bisa merusak index jika satu rowid
+    # dihapus lalu diinsert ulang di dalam satu transaksi panjang (transaksi
+    # pembungkus test), sedangkan di aplikasi delete/restore adalah request
+    # terpisah. Tabel FTS tidak ikut di-flush antar test, jadi dibangun ulang.
+    def setUp(self):
+        rebuild_post_index()
+        self.user = User.objects.create_user(username="searcher", password="pass")
+        self.padel = User.objects.create_user(username="padelking", password="pass")
+        self.title_hit = Post.objects.create(
+            user=self.user, title="Raket padel terbaik", content="review singkat"
+        )
+        self.body_hit = Post.objects.create(
+            user=self.user, title="Catatan", content="main padel tiap minggu"
+        )
+        self.miss = Post.objects.create(user=self.user, title="Tenis", content="bola")
+
+    def test_ranks_title_matches_above_content_matches(self):
+        posts, total = search_posts("padel")
+        self.assertEqual(total, 2)
+        self.assertEqual([p.pk for p in posts], [self.title_hit.pk, self.body_hit.pk])
+        self.assertGreater(posts[0].search_rank, posts[1].search_rank)
+
+    def test_prefix_and_multi_term_queries(self):
+        posts, _ = search_posts("rak pad")
+        self.assertEqual([p.pk for p in posts], [self.title_hit.pk])
+
+    def test_index_follows_edits_and_soft_delete(self):
+        self.miss.content = "sekarang pindah ke padel"
+        self.miss.save()
+        self.title_hit.delete()
+        posts, total = search_posts("padel")
+        self.assertEqual(total, 2)
+        self.assertNotIn(self.title_hit.pk, [p.pk for p in posts])
+
+        self.title_hit.restore()
+        self.assertEqual(search_posts("padel")[1], 3)
+
+    def test_author_username_match_and_pagination(self):
+        authored = Post.objects.create(user=self.padel, title="Halo", content="semua")
+        posts, total = search_posts("padelk", page=1, per_page=1)
+        self.assertEqual(total, 1)
+        self.assertEqual(posts[0].pk, authored.pk)
+
+        page2, total = search_posts("padel", page=2, per_page=2)
+        self.assertEqual(total, 3)
+        self.assertEqual(len(page2), 1)
+
+    def test_api_returns_ranked_page(self):
+        response = self.client.get("/search/api/?q=padel&per_page=1")
+        data = response.json()
+        self.assertEqual(data["posts"][0]["id"], self.title_hit.pk)
+        self.assertEqual(data["pagination"]["total"], 2)
+        self.assertTrue(data["pagination"]["has_next"])
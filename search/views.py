@@ -1,96 +1,88 @@
 import json
 from django.shortcuts import render
 from django.http import JsonResponse
-from django.db.models import Q, Count
-from post.models import Post, PostInteraction, PostSave
-from profil.models import Profile
+from post.serializers import viewer_post_state
+from profil.photos import user_photo_urls
 
+from .index import search_posts as run_search
 
-def _profile_photo(user, cache):
-    if user.id in cache:
-        return cache[user.id]
-    profile = Profile.objects.filter(user=user).first()
-    cache[user.id] = profile.profile_photo.url if profile and profile.profile_photo else None
-    return cache[user.id]
 
+def _page_params(request, default_per_page):
+    try:
+        page = max(int(request.GET.get("page", 1)), 1)
+        per_page = min(max(int(request.GET.get("per_page", default_per_page)), 1), 50)
+    except ValueError:
+        page, per_page = 1, default_per_page
+    return page, per_page
 
-def search_posts(request):
-    query = (request.GET.get("q") or "").strip()
-    posts_qs = Post.objects.none()
 
-    if query:
-        posts_qs = (
-            Post.objects.filter(is_deleted=False)
-            .select_related("user")
-            .annotate(comment_count=Count("comments", filter=Q(comments__is_deleted=False)))
-            .filter(
-                Q(title__icontains=query)
-                | Q(content__icontains=query)
-                | Q(user__username__icontains=query)
-            )
-            .order_by("-created_at")
-        )
+def _pagination(page, per_page, total):
+    return {
+        "page": page,
+        "per_page": per_page,
+        "total": total,
+        "has_next": page * per_page < total,
+        "has_previous": page > 1,
+    }
+
 
-    user_interactions = {}
-    saved_post_ids = set()
-    if request.user.is_authenticated and posts_qs.exists():
-        user_interactions = dict(
-            PostInteraction.objects.filter(
-                user=request.user, post__in=posts_qs
-            ).values_list("post_id", "interaction_type")
-        )
-        saved_post_ids = set(
-            PostSave.objects.filter(user=request.user, post__in=posts_qs).values_list(
-                "post_id", flat=True
-            )
-        )
+def search_posts(request):
+    query = (request.GET.get("q") or "").strip()
+    page, per_page = _page_params(request, 20)
+    posts, total = run_search(query, page, per_page) if query else ([], 0)
 
-    posts = []
-    for post in posts_qs:
+    user_interactions, saved_post_ids = viewer_post_state(
+        request.user, [post.id for post in posts]
+    )
+    for post in posts:
+        post.comment_count = post.comments_count
         post.user_interaction = user_interactions.get(post.id)
         post.is_saved = post.id in saved_post_ids
-        posts.append(post)
 
-    return render(request, "search_results.html", {"posts": posts, "query": query})
+    return render(
+        request,
+        "search_results.html",
+        {
+            "posts": posts,
+            "query": query,
+            "pagination": _pagination(page, per_page, total),
+        },
+    )
 
 
 def search_posts_api(request):
     """
-    API: search posts by title/content/username.
-    Returns JSON list with core fields and profile photo.
+    API: full-text search post berdasarkan judul/isi (dan username penulis).
+    Hasil diurutkan berdasarkan relevansi dan dipaginasi dengan ?page=&per_page=.
     """
     query = (request.GET.get("q") or "").strip()
-    posts = []
-    if query:
-        posts_qs = (
-            Post.objects.filter(is_deleted=False)
-            .select_related("user")
-            .filter(
-                Q(title__icontains=query)
-                | Q(content__icontains=query)
-                | Q(user__username__icontains=query)
-            )
-            .order_by("-created_at")[:50]
-        )
-
-        profile_cache = {}
+    page, per_page = _page_params(request, 20)
+    posts, total = run_search(query, page, per_page) if query else ([], 0)
+    photos = user_photo_urls(post.user for post in posts)
 
-        for post in posts_qs:
-            posts.append(
-                {
-                    "id": post.id,
-                    "title": post.title,
-                    "content": post.content,
-                    "user": post.user.username,
-                    "user_id": post.user.id,
-                    "created_at": post.created_at.isoformat() if post.created_at else None,
-                    "likes_count": post.likes_count,
-                    "dislikes_count": post.dislikes_count,
-                    "comment_count": post.comments.filter(is_deleted=False).count(),
-                    "image": post.image.url if post.image else None,
-                    "video_link": post.video_link,
-                    "profile_photo": _profile_photo(post.user, profile_cache),
-                }
-            )
+    data = [
+        {
+            "id": post.id,
+            "title": post.title,
+            "content": post.content,
+            "user": post.user.username,
+            "user_id": post.user_id,
+            "created_at": post.created_at.isoformat() if post.created_at else None,
+            "likes_count": post.likes_count,
+            "dislikes_count": post.dislikes_count,
+            "comment_count": post.comments_count,
+            "image": post.image.url if post.image else None,
+            "video_link": post.video_link,
+            "profile_photo": photos.get(post.user_id),
+            "rank": post.search_rank,
+        }
+        for post in posts
+    ]
 
-    return JsonResponse({"status": "success", "posts": posts})
+    return JsonResponse(
+        {
+            "status": "success",
+            "posts": data,
+            "pagination": _pagination(page, per_page, total),
+        }
+    )
@@ -0,0 +1,98 @@
+"""
+Routing read replica.
+
+Semua write selalu ke database "default" (primary). Read boleh diarahkan ke
+salah satu replica di settings.DATABASE_REPLICAS hanya jika:
+- request sedang berjalan dengan method aman (GET/HEAD/OPTIONS), ditandai oleh
+  ReplicaRoutingMiddleware; di luar request (management command, shell, job)
+  semua query tetap ke primary,
+- client tidak baru saja melakukan write: setelah request POST/PUT/PATCH/
+  DELETE middleware memasang cookie sehingga request berikutnya selama
+  REPLICA_STICKY_SECONDS tetap membaca primary (read-your-own-writes
+  meski replica tertinggal), dan
+- tidak sedang berada di dalam transaction.atomic() pada primary.
+
+Untuk mencoba secara lokal dengan dua file SQLite, set DB_SQLITE_REPLICA ke
+path file kedua (lihat smash/settings.py); tanpa replica router tidak
+mengubah apa pun.
+"""
+import contextvars
+import random
+
+from django.conf import settings
+from django.db import connections
+
+PRIMARY = "default"
+STICKY_COOKIE = "db_use_primary"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# True selama request aman yang boleh membaca dari replica
+_replica_reads = contextvars.ContextVar("replica_reads", default=False)
+
+
+def replica_aliases():
+    return list(getattr(settings, "DATABASE_REPLICAS", []))
+
+
+def sticky_seconds():
+    return getattr(settings, "REPLICA_STICKY_SECONDS", 5)
+
+
+def read_alias():
+    """Alias database untuk read berikutnya pada konteks saat ini"""
+    replicas = replica_aliases()
+    if not replicas or not _replica_reads.get():
+        return PRIMARY
+    if connections[PRIMARY].in_atomic_block:
+        return PRIMARY
+    return random.choice(replicas)
+
+
+class PrimaryReplicaRouter:
+    """Database router: write ke primary, read ke replica jika aman"""
+
+    def db_for_read(self, model, **hints):
+        return read_alias()
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primary dan replica berisi data yang sama
+        pool = {PRIMARY, *replica_aliases()}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replica mendapat skema lewat replikasi dari primary
+        return db == PRIMARY
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Tandai request aman agar read-nya boleh ke replica, dan pasang cookie
+    "sticky primary" setelah request yang melakukan write.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        safe = request.method in SAFE_METHODS and STICKY_COOKIE not in request.COOKIES
+        token = _replica_reads.set(safe)
+        try:
+            response = self.get_response(request)
+        finally:
+            _replica_reads.reset(token)
+
+        if request.method not in SAFE_METHODS and replica_aliases():
+            response.set_cookie(
+                STICKY_COOKIE,
+                "1",
+                max_age=sticky_seconds(),
+                httponly=True,
+                secure=settings.SESSION_COOKIE_SECURE,
+                samesite=settings.SESSION_COOKIE_SAMESITE,
+            )
+        return response
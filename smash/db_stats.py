@@ -0,0 +1,103 @@
+"""
+Statistik koneksi database per proses worker.
+
+Dengan CONN_MAX_AGE > 0 (atau pool psycopg) sebuah worker seharusnya hanya
+membuka sedikit koneksi lalu memakainya ulang, sehingga "connections_per_request"
+mendekati 0. Dengan CONN_MAX_AGE = 0 nilainya sekitar 1: setiap request
+membayar biaya connect (TCP + TLS + autentikasi PostgreSQL).
+
+DatabaseStatsMiddleware memasang penghitung saat worker start, menghitung
+request, dan (opsional) menulis ringkasan ke log setiap DB_STATS_LOG_EVERY
+request. Ringkasan yang sama tersedia sebagai JSON di /health/db/.
+"""
+import logging
+import os
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_opened = Counter()  # alias -> jumlah koneksi baru di proses ini
+_requests = 0
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    with _lock:
+        _opened[connection.alias] += 1
+        total = _opened[connection.alias]
+    logger.debug("Koneksi database baru ke %s (total %d)", connection.alias, total)
+
+
+def install():
+    connection_created.connect(
+        _on_connection_created, dispatch_uid="smash_db_stats_connection_created"
+    )
+
+
+def record_request():
+    """Tambah hitungan request; kembalikan total request di proses ini"""
+    global _requests
+    with _lock:
+        _requests += 1
+        return _requests
+
+
+def _pool_stats(alias):
+    # DatabaseWrapper PostgreSQL (psycopg 3) punya .pool jika OPTIONS["pool"] diisi
+    pool = getattr(connections[alias], "pool", None)
+    return pool.get_stats() if pool is not None else None
+
+
+def db_stats():
+    """Ringkasan koneksi untuk setiap alias database di proses ini"""
+    with _lock:
+        opened, requests = dict(_opened), _requests
+    databases = {}
+    for alias in connections:
+        conf = connections.settings[alias]
+        databases[alias] = {
+            "vendor": connections[alias].vendor,
+            "conn_max_age": conf.get("CONN_MAX_AGE"),
+            "health_checks": conf.get("CONN_HEALTH_CHECKS"),
+            "pooled": "pool" in conf.get("OPTIONS", {}),
+            "connections_opened": opened.get(alias, 0),
+            "pool": _pool_stats(alias),
+        }
+    total_opened = sum(opened.values())
+    return {
+        "pid": os.getpid(),
+        "requests": requests,
+        "connections_opened": total_opened,
+        "connections_per_request": (
+            round(total_opened / requests, 3) if requests else None
+        ),
+        "databases": databases,
+    }
+
+
+class DatabaseStatsMiddleware:
+    """Hitung request dan tulis statistik koneksi ke log secara berkala"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        install()
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        count = record_request()
+        every = getattr(settings, "DB_STATS_LOG_EVERY", 0)
+        if every and count % every == 0:
+            stats = db_stats()
+            logger.info(
+                "db stats pid=%s requests=%s connections_opened=%s per_request=%s",
+                stats["pid"],
+                stats["requests"],
+                stats["connections_opened"],
+                stats["connections_per_request"],
+            )
+        return response
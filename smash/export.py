@@ -0,0 +1,109 @@
+"""
+Helper untuk endpoint dump/export JSON yang di-stream.
+
+Baris diambil dengan .values() lewat .iterator(chunk_size=...) lalu langsung
+ditulis ke response sebagai potongan teks, sehingga memori tetap datar
+berapa pun besar tabelnya. Dua format tersedia:
+- JSON biasa (default), bentuknya sama dengan dump lama.
+- NDJSON (?format=ndjson): satu objek JSON per baris.
+
+Parameter ?since=<ISO datetime> membatasi export ke baris yang berubah
+setelah waktu tersebut. Header X-Export-Next-Since berisi waktu mulai export
+yang bisa dipakai client sebagai `since` pada export berikutnya.
+"""
+import json
+import uuid
+from datetime import date, datetime
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+
+class InvalidSince(ValueError):
+    """Parameter since tidak bisa dibaca sebagai datetime."""
+
+
+def export_chunk_size():
+    return getattr(settings, "EXPORT_CHUNK_SIZE", 2000)
+
+
+def wants_ndjson(request):
+    return request.GET.get("format") == "ndjson"
+
+
+def parse_since(request):
+    """Datetime (aware) dari ?since=, None jika tidak dikirim"""
+    raw = request.GET.get("since")
+    if not raw:
+        return None
+    parsed = parse_datetime(raw.replace(" ", "+"))
+    if parsed is None:
+        raise InvalidSince("Parameter since tidak valid")
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, timezone.get_current_timezone())
+    return parsed
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} tidak bisa di-serialize")
+
+
+def dumps(row):
+    return json.dumps(row, default=_default)
+
+
+def iter_rows(queryset, fields, transform=None):
+    """Iterasi dict .values() per chunk, opsional dipetakan oleh transform"""
+    rows = queryset.values(*fields).iterator(chunk_size=export_chunk_size())
+    for row in rows:
+        yield transform(row) if transform else row
+
+
+def _json_array(rows):
+    yield "["
+    first = True
+    for row in rows:
+        yield ("" if first else ",") + dumps(row)
+        first = False
+    yield "]"
+
+
+def stream_json_list(rows):
+    """Potongan teks untuk satu array JSON"""
+    return _json_array(rows)
+
+
+def stream_json_sections(sections):
+    """Potongan teks untuk objek {nama: [baris...]} dari pasangan (nama, rows)"""
+    yield "{"
+    for index, (name, rows) in enumerate(sections):
+        yield ("" if index == 0 else ",") + json.dumps(name) + ":"
+        yield from _json_array(rows)
+    yield "}"
+
+
+def stream_ndjson(sections, tagged=None):
+    """
+    Satu objek per baris. Untuk export dengan beberapa bagian (atau
+    tagged=True), setiap baris diberi key "type" berisi nama bagiannya.
+    """
+    if tagged is None:
+        tagged = len(sections) > 1
+    for name, rows in sections:
+        for row in rows:
+            if tagged:
+                row = {"type": name, **row}
+            yield dumps(row) + "\n"
+
+
+def export_response(chunks, ndjson, started_at):
+    content_type = "application/x-ndjson" if ndjson else "application/json"
+    response = StreamingHttpResponse(chunks, content_type=content_type)
+    response["X-Export-Next-Since"] = started_at.isoformat()
+    return response
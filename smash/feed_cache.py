@@ -0,0 +1,72 @@
+"""
+Cache untuk feed publik (home, hot, recent, dan list PostAPIView) yang
+tampil sama persis untuk semua pengunjung anonim.
+
+Semua key memuat "versi feed". Setiap kali post dibuat/diedit/dihapus atau
+mendapat interaksi, versi dinaikkan sehingga seluruh key lama otomatis tidak
+terpakai lagi (tanpa perlu menghapus key satu per satu). Backend cache diatur
+lewat settings.CACHES (locmem/file/redis, lihat smash/settings.py).
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+FEED_VERSION_KEY = "feed:version"
+
+
+def feed_cache_timeout():
+    return getattr(settings, "FEED_CACHE_TIMEOUT", 60)
+
+
+def feed_version():
+    """Versi feed saat ini (dibuat jika belum ada di cache)"""
+    version = cache.get(FEED_VERSION_KEY)
+    if version is None:
+        cache.add(FEED_VERSION_KEY, 1, timeout=None)
+        version = cache.get(FEED_VERSION_KEY, 1)
+    return version
+
+
+def invalidate_feed_cache():
+    """Naikkan versi feed; semua entri feed yang lama jadi kedaluwarsa"""
+    try:
+        cache.incr(FEED_VERSION_KEY)
+    except ValueError:
+        # Key belum ada (cache baru/di-flush): mulai dari versi baru
+        cache.set(FEED_VERSION_KEY, 1, timeout=None)
+
+
+def feed_cache_key(name, request=None):
+    """Key berversi untuk `name`, ditambah hash query string jika ada request"""
+    key = f"feed:{feed_version()}:{name}"
+    if request is not None and request.GET:
+        query = request.GET.urlencode()
+        key += ":" + hashlib.md5(query.encode("utf-8")).hexdigest()
+    return key
+
+
+def cached_for_anonymous(request, name, builder):
+    """
+    Kembalikan hasil builder() dari cache untuk pengunjung anonim; user yang
+    login selalu mendapat data segar karena payload bisa berisi status pribadi.
+    """
+    if request.user.is_authenticated:
+        return builder()
+    key = feed_cache_key(name, request)
+    value = cache.get(key)
+    if value is None:
+        value = builder()
+        cache.set(key, value, feed_cache_timeout())
+    return value
+
+
+def fragment_cache_context(request):
+    """
+    Context untuk tag {% cache %} di template feed. Fragment hanya disimpan
+    untuk anonim; untuk user login timeout 0 berarti tidak pernah disimpan.
+    """
+    return {
+        "feed_version": feed_version(),
+        "feed_cache_timeout": 0 if request.user.is_authenticated else feed_cache_timeout(),
+    }
@@ -0,0 +1,129 @@
+"""
+HTTP client bersama untuk request keluar (image proxy).
+
+Satu requests.Session per proses dengan HTTPAdapter yang menyimpan koneksi
+keep-alive per host, sehingga fetch berikutnya ke host yang sama (thumbnail
+YouTube, CDN gambar) tidak mengulang DNS lookup + handshake TCP/TLS.
+
+- HTTP_POOL_HOSTS: jumlah host yang pool-nya disimpan (LRU),
+  HTTP_POOL_MAXSIZE: koneksi idle yang disimpan per host.
+- HTTP_CONNECT_TIMEOUT / HTTP_READ_TIMEOUT: timeout default.
+- HTTP_RETRIES dengan backoff eksponensial HTTP_RETRY_BACKOFF untuk GET/HEAD
+  yang gagal connect/read atau mendapat 502/503/504 (Retry-After dihormati).
+
+Session tidak menyimpan cookie dari upstream agar aman dipakai bersama oleh
+semua thread. pool_stats() menghitung request yang memakai koneksi lama
+(hit) dan yang harus membuka koneksi baru (miss); tersedia di /health/http/.
+"""
+import http.cookiejar
+import threading
+from collections import Counter
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RETRY_STATUSES = (502, 503, 504)
+
+_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_session = None
+_retired = Counter()  # statistik pool host yang sudah dibuang dari LRU
+
+
+def timeout():
+    """Timeout default (connect, read) untuk request keluar"""
+    return (
+        getattr(settings, "HTTP_CONNECT_TIMEOUT", 3.05),
+        getattr(settings, "HTTP_READ_TIMEOUT", 10),
+    )
+
+
+def _retire(pool):
+    with _stats_lock:
+        _retired["requests"] += pool.num_requests
+        _retired["connections"] += pool.num_connections
+    pool.close()
+
+
+def _build_session():
+    retries = getattr(settings, "HTTP_RETRIES", 2)
+    adapter = HTTPAdapter(
+        pool_connections=getattr(settings, "HTTP_POOL_HOSTS", 20),
+        pool_maxsize=getattr(settings, "HTTP_POOL_MAXSIZE", 10),
+        max_retries=Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=getattr(settings, "HTTP_RETRY_BACKOFF", 0.3),
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            # Response terakhir dikembalikan apa adanya; pemanggil memakai raise_for_status()
+            raise_on_status=False,
+        ),
+    )
+    # Simpan hitungan pool yang dibuang agar metrik tidak hilang
+    adapter.poolmanager.pools.dispose_func = _retire
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+def get_session():
+    """requests.Session bersama milik proses ini"""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def get(url, **kwargs):
+    """requests.get lewat session bersama dengan timeout default"""
+    kwargs.setdefault("timeout", timeout())
+    return get_session().get(url, **kwargs)
+
+
+def close():
+    """Tutup session bersama (dibuat ulang dari settings saat dipakai lagi)"""
+    global _session
+    with _lock:
+        session, _session = _session, None
+    if session is not None:
+        session.close()
+    with _stats_lock:
+        _retired.clear()
+
+
+def pool_stats():
+    """Hit/miss koneksi pool per host dan totalnya"""
+    with _stats_lock:
+        totals = Counter(_retired)
+    hosts = {}
+    session = _session
+    if session is not None:
+        pools = session.get_adapter("https://").poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = f"{key.key_scheme}://{key.key_host}:{key.key_port}"
+            hosts[host] = {
+                "requests": pool.num_requests,
+                "connections_opened": pool.num_connections,
+                "idle": pool.pool.qsize() if pool.pool is not None else 0,
+            }
+            totals["requests"] += pool.num_requests
+            totals["connections"] += pool.num_connections
+    return {
+        "requests": totals["requests"],
+        "hits": totals["requests"] - totals["connections"],
+        "misses": totals["connections"],
+        "hosts": hosts,
+    }
@@ -0,0 +1,573 @@
+"""
+Cache disk untuk image proxy (smash.views.proxy_image dan
+post.views.proxy_image).
+
+Setiap gambar upstream disimpan sebagai satu file di IMAGE_PROXY_CACHE_DIR
+dengan nama sha256(URL): baris pertama berisi metadata JSON (content type,
+ETag, Last-Modified, waktu fetch), sisanya body gambar. File ditulis ke file
+sementara lalu os.replace() sehingga proses lain tidak pernah membaca file
+setengah jadi.
+
+- Fresh (umur < IMAGE_PROXY_CACHE_TTL): dilayani langsung dari disk.
+- Stale: direvalidasi ke upstream dengan If-None-Match/If-Modified-Since;
+  304 cukup memperbarui waktu fetch tanpa mengunduh ulang body.
+- Miss bersamaan untuk URL yang sama dalam satu proses hanya memicu satu
+  fetch upstream; request lain menunggu lalu membaca hasil yang sama.
+- Total ukuran dibatasi IMAGE_PROXY_CACHE_MAX_BYTES; entry yang paling lama
+  tidak dipakai (mtime, diperbarui setiap hit) dibuang lebih dulu.
+
+Body tidak pernah dimuat utuh ke memori: saat miss, chunk upstream
+(stream=True) diteruskan ke client sambil ditulis ke file cache; saat hit,
+file dibaca per chunk. Tipe gambar cukup ditebak dari chunk pertama
+(CachedImage.head). Gambar lebih besar dari IMAGE_PROXY_MAX_BYTES ditolak
+(atau diputus di tengah jika upstream tidak mengirim Content-Length).
+Request Range dilayani dari file cache, atau diteruskan ke upstream tanpa
+di-cache jika gambar belum ada di cache.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import requests
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+
+from smash import http_client
+
+logger = logging.getLogger(__name__)
+
+HIT = "HIT"
+MISS = "MISS"
+REVALIDATED = "REVALIDATED"
+BYPASS = "BYPASS"
+
+CHUNK_SIZE = 64 * 1024
+HEAD_BYTES = 64  # cukup untuk mengenali signature PNG/JPEG/GIF/WebP
+
+_TMP_PREFIX = ".tmp-"
+
+_inflight_guard = threading.Lock()
+_inflight = {}  # key -> Event milik request yang sedang mengambil dari upstream
+_usage = {"bytes": None}  # perkiraan ukuran cache dari sudut pandang proses ini
+
+
+class ImageTooLarge(requests.RequestException):
+    """Gambar upstream melebihi IMAGE_PROXY_MAX_BYTES"""
+
+
+class CachedImage:
+    """
+    Gambar dari file cache (path) atau dari response upstream yang sedang
+    di-stream, beserta metadata validasinya. Body dibaca lewat stream().
+    """
+
+    def __init__(
+        self,
+        url,
+        content_type="",
+        etag="",
+        last_modified="",
+        fetched_at=None,
+        path=None,
+        offset=0,
+        size=None,
+        head=b"",
+        status=200,
+        content_range="",
+    ):
+        self.url = url
+        self.content_type = content_type
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = time.time() if fetched_at is None else fetched_at
+        self.path = path
+        self.offset = offset
+        self.size = size
+        self.head = head
+        self.status = status
+        self.content_range = content_range
+        self._upstream = None
+
+    def meta(self):
+        return {
+            "url": self.url,
+            "content_type": self.content_type,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "fetched_at": self.fetched_at,
+        }
+
+    def stream(self, start=0, end=None):
+        """Iterable chunk body; start/end (inklusif) hanya berlaku untuk file cache"""
+        if self._upstream is not None:
+            return self._upstream
+        if end is None:
+            end = self.size - 1
+        return _file_chunks(self.path, self.offset + start, self.offset + end)
+
+    def close(self):
+        if self._upstream is not None:
+            self._upstream.close()
+
+
+class _EntryWriter:
+    """Tulis entry cache ke file sementara lalu pasang dengan os.replace()"""
+
+    def __init__(self, key, image):
+        self.key = key
+        directory = cache_dir()
+        os.makedirs(directory, exist_ok=True)
+        fd, self.tmp = tempfile.mkstemp(dir=directory, prefix=_TMP_PREFIX)
+        self.fh = os.fdopen(fd, "wb")
+        self.size = 0
+        self.write(json.dumps(image.meta()).encode("utf-8") + b"\n")
+
+    def write(self, chunk):
+        self.fh.write(chunk)
+        self.size += len(chunk)
+
+    def commit(self):
+        self.fh.close()
+        os.replace(self.tmp, _path(self.key))
+        _account(self.size)
+
+    def abort(self):
+        self.fh.close()
+        try:
+            os.unlink(self.tmp)
+        except OSError:
+            pass
+
+
+class _UpstreamStream:
+    """
+    Teruskan chunk upstream ke client sambil menulis ke cache. Ditutup oleh
+    StreamingHttpResponse (juga saat client putus), yang melepaskan koneksi
+    upstream dan membangunkan request lain yang menunggu URL yang sama.
+    """
+
+    def __init__(self, response, chunks, head, writer, budget, on_close):
+        self.response = response
+        self.chunks = chunks
+        self.head = head
+        self.writer = writer
+        self.budget = budget
+        self.on_close = on_close
+        self.closed = False
+
+    def __iter__(self):
+        total = 0
+        complete = True
+        for chunk in self._all_chunks():
+            total += len(chunk)
+            if total > self.budget:
+                logger.warning(
+                    "Gambar %s melebihi %d byte, stream dihentikan", self.response.url, self.budget
+                )
+                complete = False
+                break
+            if self.writer is not None:
+                try:
+                    self.writer.write(chunk)
+                except OSError:
+                    logger.warning("Gagal menulis cache gambar %s", self.response.url, exc_info=True)
+                    self._drop_writer()
+            yield chunk
+        if complete and self.writer is not None:
+            try:
+                self.writer.commit()
+            except OSError:
+                logger.warning("Gagal menyimpan cache gambar %s", self.response.url, exc_info=True)
+                self.writer.abort()
+            self.writer = None
+        self.close()
+
+    def _all_chunks(self):
+        if self.head:
+            yield self.head
+        for chunk in self.chunks:
+            if chunk:
+                yield chunk
+
+    def _drop_writer(self):
+        if self.writer is not None:
+            self.writer.abort()
+            self.writer = None
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        # Stream tidak selesai: jangan simpan entry setengah jadi
+        self._drop_writer()
+        self.response.close()
+        if self.on_close is not None:
+            self.on_close()
+
+
+def cache_enabled():
+    return getattr(settings, "IMAGE_PROXY_CACHE", True)
+
+
+def cache_dir():
+    return str(settings.IMAGE_PROXY_CACHE_DIR)
+
+
+def max_bytes():
+    return getattr(settings, "IMAGE_PROXY_CACHE_MAX_BYTES", 256 * 1024 * 1024)
+
+
+def max_image_bytes():
+    return getattr(settings, "IMAGE_PROXY_MAX_BYTES", 10 * 1024 * 1024)
+
+
+def ttl():
+    return getattr(settings, "IMAGE_PROXY_CACHE_TTL", 3600)
+
+
+def url_key(url):
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def _path(key):
+    return os.path.join(cache_dir(), key)
+
+
+def _load(key):
+    path = _path(key)
+    try:
+        with open(path, "rb") as fh:
+            meta = json.loads(fh.readline())
+            offset = fh.tell()
+            head = fh.read(HEAD_BYTES)
+            size = os.fstat(fh.fileno()).st_size - offset
+    except (OSError, ValueError):
+        return None
+    return CachedImage(path=path, offset=offset, size=size, head=head, **meta)
+
+
+def _file_chunks(path, start, end):
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = fh.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _is_fresh(image):
+    return time.time() - image.fetched_at < ttl()
+
+
+def _touch(key):
+    # mtime = waktu terakhir dipakai, dasar urutan LRU
+    try:
+        os.utime(_path(key), None)
+    except OSError:
+        pass
+
+
+def _account(size):
+    if _usage["bytes"] is None:
+        evict()
+    else:
+        _usage["bytes"] += size
+        if _usage["bytes"] > max_bytes():
+            evict()
+
+
+def _refresh(key, cached):
+    """Tulis ulang metadata entry setelah upstream menjawab 304"""
+    try:
+        writer = _EntryWriter(key, cached)
+        try:
+            with open(cached.path, "rb") as fh:
+                fh.seek(cached.offset)
+                shutil.copyfileobj(fh, writer.fh, CHUNK_SIZE)
+            writer.size += cached.size
+            writer.commit()
+        except BaseException:
+            writer.abort()
+            raise
+    except OSError:
+        logger.warning("Gagal memperbarui cache gambar %s", cached.url, exc_info=True)
+        return cached
+    return _load(key) or cached
+
+
+def evict(limit=None):
+    """
+    Buang entry paling lama tidak dipakai sampai total ukuran <= limit
+    (default IMAGE_PROXY_CACHE_MAX_BYTES); kembalikan jumlah entry yang dibuang
+    """
+    limit = max_bytes() if limit is None else limit
+    entries = []
+    try:
+        with os.scandir(cache_dir()) as it:
+            for entry in it:
+                if entry.name.startswith(_TMP_PREFIX) or not entry.is_file():
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+    except OSError:
+        _usage["bytes"] = 0
+        return 0
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= limit:
+            break
+        try:
+            os.unlink(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    _usage["bytes"] = total
+    return removed
+
+
+def _claim(key):
+    """Kembalikan (event, leader); hanya leader yang mengambil dari upstream"""
+    with _inflight_guard:
+        event = _inflight.get(key)
+        if event is not None:
+            return event, False
+        event = _inflight[key] = threading.Event()
+        return event, True
+
+
+def _release(key, event):
+    with _inflight_guard:
+        if _inflight.get(key) is event:
+            del _inflight[key]
+    event.set()
+
+
+def _cacheable(response, length):
+    cache_control = response.headers.get("Cache-Control", "").lower()
+    if "no-store" in cache_control or "private" in cache_control:
+        return False
+    return length is None or length <= max_bytes()
+
+
+def _content_length(response):
+    # Dengan Content-Encoding (gzip) panjang body setelah decode berbeda
+    if response.headers.get("Content-Encoding", "identity").lower() != "identity":
+        return None
+    try:
+        return int(response.headers["Content-Length"])
+    except (KeyError, ValueError):
+        return None
+
+
+def _download(url, headers, timeout):
+    # Session bersama: koneksi keep-alive, retry dan backoff (smash/http_client.py)
+    return http_client.get(url, headers=headers, timeout=timeout, stream=True)
+
+
+def _open_upstream(url, key, response, on_close):
+    """CachedImage yang men-stream response upstream (di-cache jika key diisi)"""
+    budget = max_image_bytes()
+    try:
+        response.raise_for_status()
+        length = _content_length(response)
+        if length is not None and length > budget:
+            raise ImageTooLarge(f"Gambar {length} byte melebihi batas {budget} byte")
+        chunks = response.iter_content(CHUNK_SIZE)
+        head = next(chunks, b"")
+    except BaseException:
+        response.close()
+        if on_close is not None:
+            on_close()
+        raise
+
+    image = CachedImage(
+        url=url,
+        content_type=response.headers.get("Content-Type", ""),
+        etag=response.headers.get("ETag", ""),
+        last_modified=response.headers.get("Last-Modified", ""),
+        size=length,
+        head=head,
+        status=response.status_code,
+        content_range=response.headers.get("Content-Range", ""),
+    )
+    writer = None
+    if key is not None and _cacheable(response, length):
+        try:
+            writer = _EntryWriter(key, image)
+        except OSError:
+            logger.warning("Gagal membuat cache gambar %s", url, exc_info=True)
+    image._upstream = _UpstreamStream(response, chunks, head, writer, budget, on_close)
+    return image
+
+
+def fetch_image(url, headers=None, timeout=None, byte_range=None):
+    """
+    Ambil gambar lewat cache disk. Kembalikan (CachedImage, status) dengan
+    status HIT/MISS/REVALIDATED/BYPASS; error upstream dilempar sebagai
+    requests.RequestException (HTTPError untuk status 4xx/5xx, ImageTooLarge
+    jika melebihi IMAGE_PROXY_MAX_BYTES).
+
+    byte_range adalah header Range dari client: dilayani dari cache jika
+    entry fresh, selain itu diteruskan ke upstream tanpa di-cache. timeout
+    default mengikuti http_client.timeout().
+    """
+    if timeout is None:
+        timeout = http_client.timeout()
+    if not cache_enabled():
+        return _bypass(url, headers, timeout, byte_range)
+
+    key = url_key(url)
+    cached = _load(key)
+    if cached is not None and _is_fresh(cached):
+        _touch(key)
+        return cached, HIT
+    if byte_range:
+        return _bypass(url, headers, timeout, byte_range)
+
+    event, leader = _claim(key)
+    if not leader:
+        # Tunggu request lain yang sedang mengambil URL yang sama
+        wait = max(timeout) if isinstance(timeout, tuple) else timeout
+        if not event.wait(wait):
+            # Leader macet/ditinggalkan: jangan sampai menahan request berikutnya
+            _release(key, event)
+        cached = _load(key)
+        if cached is not None and _is_fresh(cached):
+            _touch(key)
+            return cached, HIT
+        return _fetch(url, key, headers, timeout, cached, None)
+
+    def release():
+        _release(key, event)
+
+    try:
+        # Request lain mungkin sudah mengisi cache selagi kita memeriksa
+        cached = _load(key)
+        if cached is not None and _is_fresh(cached):
+            release()
+            _touch(key)
+            return cached, HIT
+        return _fetch(url, key, headers, timeout, cached, release)
+    except BaseException:
+        release()
+        raise
+
+
+def _fetch(url, key, headers, timeout, cached, on_close):
+    request_headers = dict(headers or {})
+    if cached is not None:
+        if cached.etag:
+            request_headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            request_headers["If-Modified-Since"] = cached.last_modified
+
+    response = _download(url, request_headers, timeout)
+    if cached is not None and response.status_code == 304:
+        response.close()
+        cached.fetched_at = time.time()
+        cached.etag = response.headers.get("ETag", cached.etag)
+        refreshed = _refresh(key, cached)
+        if on_close is not None:
+            on_close()
+        return refreshed, REVALIDATED
+
+    return _open_upstream(url, key, response, on_close), MISS
+
+
+def _bypass(url, headers, timeout, byte_range):
+    request_headers = dict(headers or {})
+    if byte_range:
+        request_headers["Range"] = byte_range
+    response = _download(url, request_headers, timeout)
+    return _open_upstream(url, None, response, None), BYPASS
+
+
+def _not_modified(request, image):
+    """True jika ETag/Last-Modified milik client masih sama dengan cache"""
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match and image.etag:
+        return image.etag in (tag.strip() for tag in if_none_match.split(","))
+    if_modified_since = request.headers.get("If-Modified-Since")
+    return bool(if_modified_since and image.last_modified == if_modified_since)
+
+
+def _parse_range(header, size):
+    """
+    (start, end) inklusif untuk satu range "bytes=a-b"; None jika header
+    diabaikan (tidak ada, multi-range, format lain) dan False jika range
+    tidak bisa dipenuhi.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, _, last = header[len("bytes="):].strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            start, end = max(size - int(last), 0), size - 1
+    except ValueError:
+        return None
+    if start > end or start >= size:
+        return False
+    return start, min(end, size - 1)
+
+
+def image_response(request, image, cache_status, content_type):
+    """
+    StreamingHttpResponse untuk gambar dari fetch_image(); 304 jika client
+    sudah memegang versi yang sama, 206/416 untuk request Range. Header
+    X-Cache berisi status cache.
+    """
+    if _not_modified(request, image):
+        image.close()
+        response = HttpResponseNotModified()
+    elif image.path is not None:
+        response = _file_response(request, image, content_type)
+    else:
+        response = StreamingHttpResponse(
+            image.stream(), status=image.status, content_type=content_type
+        )
+        if image.size is not None:
+            response["Content-Length"] = image.size
+        if image.content_range:
+            response["Content-Range"] = image.content_range
+    if image.etag:
+        response["ETag"] = image.etag
+    if image.last_modified:
+        response["Last-Modified"] = image.last_modified
+    response["X-Cache"] = cache_status
+    return response
+
+
+def _file_response(request, image, content_type):
+    byte_range = _parse_range(request.headers.get("Range"), image.size)
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{image.size}"
+        return response
+    start, end = byte_range or (0, image.size - 1)
+    response = StreamingHttpResponse(
+        image.stream(start, end),
+        status=206 if byte_range else 200,
+        content_type=content_type,
+    )
+    response["Content-Length"] = end - start + 1
+    response["Accept-Ranges"] = "bytes"
+    if byte_range:
+        response["Content-Range"] = f"bytes {start}-{end}/{image.size}"
+    return response
@@ -0,0 +1,235 @@
+"""
+Varian gambar berukuran tetap untuk Post.image dan Profile.profile_photo.
+
+Gambar upload (sampai 5 MB) tidak dikirim apa adanya ke kartu feed atau
+avatar 40px: setiap kali file gambar berubah, model memanggil sync_image()
+yang menandai gambar "processing" dan menjadwalkan job "images.process"
+(jobs/queue.py), sehingga request upload tidak menunggu Pillow. Job itu:
+
+- membuang metadata EXIF (termasuk lokasi GPS) dari file asli dengan
+  menerapkan rotasi EXIF lalu meng-encode ulang (hanya jika ada EXIF),
+- membuat thumbnail selebar IMAGE_VARIANT_WIDTHS (tanpa upscale) dalam
+  format WebP dan JPEG di samping file aslinya (foto.jpg -> foto_w320.webp,
+  foto_w320.jpg),
+- mencatat nama file varian di JSONField model dan mengubah status menjadi
+  "ready" ("failed" jika file bukan gambar atau job gagal permanen).
+
+Serializer membangun map srcset dari JSON tersebut tanpa menyentuh storage:
+
+    {"webp": {"64": url, "320": url}, "jpeg": {"64": url, "320": url}}
+
+Gambar lama tanpa varian bisa dibuatkan lewat `manage.py generate_image_variants`.
+"""
+import logging
+import os
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+from jobs.queue import enqueue, register
+from smash.feed_cache import invalidate_feed_cache
+
+logger = logging.getLogger(__name__)
+
+# Status pemrosesan gambar pada model
+IMAGE_NONE = "none"
+IMAGE_PROCESSING = "processing"
+IMAGE_READY = "ready"
+IMAGE_FAILED = "failed"
+IMAGE_STATUS_CHOICES = [
+    (IMAGE_NONE, "Tanpa gambar"),
+    (IMAGE_PROCESSING, "Sedang diproses"),
+    (IMAGE_READY, "Siap"),
+    (IMAGE_FAILED, "Gagal diproses"),
+]
+
+# format -> (format Pillow, ekstensi file, opsi encoder)
+VARIANT_FORMATS = {
+    "webp": ("WEBP", "webp", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", "jpg", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+# Opsi encode ulang file asli saat EXIF dibuang; format lain (GIF) dibiarkan
+REENCODE_OPTIONS = {
+    "JPEG": {"quality": 90, "optimize": True, "progressive": True},
+    "PNG": {"optimize": True},
+    "WEBP": {"quality": 90},
+}
+
+
+class UnprocessableImage(Exception):
+    """File tidak bisa dibaca sebagai gambar"""
+
+
+def variant_widths():
+    return sorted(getattr(settings, "IMAGE_VARIANT_WIDTHS", (64, 320, 1080)))
+
+
+def variant_name(name, width, extension):
+    root, _ = os.path.splitext(name)
+    return f"{root}_w{width}.{extension}"
+
+
+def _flatten(image):
+    """Gambar RGB untuk JPEG; transparansi ditumpuk di atas latar putih"""
+    if image.mode in ("RGBA", "LA") or "transparency" in image.info:
+        rgba = image.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def _load_source(storage, name):
+    """
+    Baca gambar dari storage; kembalikan (gambar RGB/RGBA dengan rotasi EXIF
+    sudah diterapkan, format asli, True jika file asli perlu di-encode ulang)
+    """
+    try:
+        with storage.open(name, "rb") as fh:
+            with Image.open(fh) as image:
+                source_format = image.format
+                has_exif = bool(image.getexif()) and not getattr(image, "is_animated", False)
+                # Terapkan rotasi EXIF lalu lepaskan dari file (metadata ikut dibuang)
+                image = ImageOps.exif_transpose(image)
+                has_alpha = image.mode in ("RGBA", "LA", "P") and (
+                    image.mode != "P" or "transparency" in image.info
+                )
+                image = image.convert("RGBA" if has_alpha else "RGB")
+    except FileNotFoundError:
+        raise
+    except (OSError, ValueError, Image.DecompressionBombError) as exc:
+        raise UnprocessableImage(str(exc)) from exc
+    return image, source_format, has_exif and source_format in REENCODE_OPTIONS
+
+
+def _strip_metadata(storage, name, source, source_format):
+    """Tulis ulang file asli tanpa EXIF (orientasi sudah diterapkan ke piksel)"""
+    image = _flatten(source) if source_format == "JPEG" else source
+    buffer = BytesIO()
+    image.save(buffer, source_format, **REENCODE_OPTIONS[source_format])
+    with storage.open(name, "wb") as fh:
+        fh.write(buffer.getvalue())
+
+
+def generate_variants(field_file):
+    """
+    Buang EXIF dari file gambar yang sudah tersimpan lalu buat semua varian;
+    kembalikan {"<lebar>": {"webp": nama_file, "jpeg": nama_file}}. Melempar
+    UnprocessableImage jika file bukan gambar.
+    """
+    storage, name = field_file.storage, field_file.name
+    source, source_format, reencode = _load_source(storage, name)
+    if reencode:
+        _strip_metadata(storage, name, source, source_format)
+
+    variants = {}
+    for width in variant_widths():
+        # Tanpa upscale: file asli sudah cukup untuk lebar sebesar itu
+        if width >= source.width:
+            break
+        height = max(round(source.height * width / source.width), 1)
+        resized = source.resize((width, height), Image.Resampling.LANCZOS)
+        entry = {}
+        for fmt, (pil_format, extension, options) in VARIANT_FORMATS.items():
+            image = resized if fmt == "webp" else _flatten(resized)
+            buffer = BytesIO()
+            image.save(buffer, pil_format, **options)
+            target = variant_name(name, width, extension)
+            if storage.exists(target):
+                storage.delete(target)
+            entry[fmt] = storage.save(target, ContentFile(buffer.getvalue()))
+        variants[str(width)] = entry
+    return variants
+
+
+def delete_variants(storage, variants):
+    for entry in (variants or {}).values():
+        for name in entry.values():
+            storage.delete(name)
+
+
+def variant_srcset(storage, variants):
+    """Map {format: {lebar: url}} dari JSON varian; None jika belum ada varian"""
+    if not variants:
+        return None
+    srcset = {}
+    for width in sorted(variants, key=int):
+        for fmt, name in variants[width].items():
+            srcset.setdefault(fmt, {})[width] = storage.url(name)
+    return srcset
+
+
+def _mark_failed(model, pk, file_field, variants_field, status_field, name):
+    apps.get_model(model)._base_manager.filter(pk=pk, **{file_field: name}).update(
+        **{status_field: IMAGE_FAILED}
+    )
+    invalidate_feed_cache()
+
+
+@register("images.process", on_failure=_mark_failed)
+def process_image(model, pk, file_field, variants_field, status_field, name):
+    """
+    Job pemrosesan gambar (lihat docstring modul). Hasil dibuang jika gambar
+    sudah diganti atau dihapus selama job berjalan.
+    """
+    model_class = apps.get_model(model)
+    instance = model_class._base_manager.filter(pk=pk, **{file_field: name}).first()
+    if instance is None:
+        return
+    field_file = getattr(instance, file_field)
+
+    try:
+        variants, status = generate_variants(field_file), IMAGE_READY
+    except FileNotFoundError:
+        logger.info("File %s tidak ada, varian dilewati", name)
+        variants, status = {}, IMAGE_FAILED
+    except UnprocessableImage as exc:
+        logger.warning("Tidak bisa memproses gambar %s: %s", name, exc)
+        variants, status = {}, IMAGE_FAILED
+
+    updated = model_class._base_manager.filter(pk=pk, **{file_field: name}).update(
+        **{variants_field: variants, status_field: status}
+    )
+    if not updated:
+        delete_variants(field_file.storage, variants)
+    invalidate_feed_cache()
+
+
+def sync_image(instance, file_field, variants_field, status_field, previous_name):
+    """
+    Dipanggil dari save() model setelah tersimpan: jika file gambar berbeda
+    dari previous_name, buang varian lama, tandai gambar baru "processing"
+    dan jadwalkan job pemrosesannya. Perubahan kolom ditulis dengan UPDATE
+    (tanpa memicu save() lagi). True jika gambar berubah.
+    """
+    field_file = getattr(instance, file_field)
+    name = field_file.name if field_file else None
+    if name == (previous_name or None):
+        return False
+    # Varian di instance bisa basi (dimuat sebelum job selesai), jadi baca dari database
+    model_class = type(instance)
+    stored_variants = (
+        model_class._base_manager.filter(pk=instance.pk)
+        .values_list(variants_field, flat=True)
+        .first()
+    )
+    delete_variants(field_file.storage, stored_variants)
+    changes = {variants_field: {}, status_field: IMAGE_PROCESSING if name else IMAGE_NONE}
+    for field, value in changes.items():
+        setattr(instance, field, value)
+    model_class._base_manager.filter(pk=instance.pk).update(**changes)
+    if name:
+        enqueue(
+            "images.process",
+            model=instance._meta.label,
+            pk=instance.pk,
+            file_field=file_field,
+            variants_field=variants_field,
+            status_field=status_field,
+            name=name,
+        )
+    return True
@@ -0,0 +1,113 @@
+"""
+Keyset (cursor) pagination helper yang dipakai bersama oleh endpoint list.
+
+Cursor bersifat opaque bagi client: base64 dari pasangan (created_at, id)
+milik item terakhir pada halaman sebelumnya. Halaman berikutnya diambil
+dengan WHERE (created_at, id) < cursor (atau > untuk urutan naik) sehingga
+biayanya konstan berapa pun dalamnya client melakukan scroll, dan tidak perlu
+COUNT(*) total.
+"""
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+# Batas ukuran halaman untuk semua endpoint list
+MAX_PER_PAGE = 100
+
+
+class InvalidCursor(ValueError):
+    """Cursor tidak bisa didecode atau formatnya salah."""
+
+
+class InvalidPageParam(ValueError):
+    """Parameter ?page= atau ?per_page= bukan bilangan bulat."""
+
+
+def clamp_per_page(per_page):
+    return min(max(per_page, 1), MAX_PER_PAGE)
+
+
+def _int_param(request, name, default):
+    raw = request.GET.get(name)
+    if raw is None or raw == "":
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        raise InvalidPageParam(f"Parameter {name} harus berupa bilangan bulat")
+
+
+def per_page_param(request, default):
+    """?per_page= sebagai int dalam rentang 1..MAX_PER_PAGE (InvalidPageParam jika bukan angka)"""
+    return clamp_per_page(_int_param(request, "per_page", default))
+
+
+def page_param(request):
+    """?page= sebagai int >= 1 (InvalidPageParam jika bukan angka)"""
+    return max(_int_param(request, "page", 1), 1)
+
+
+def wants_cursor(request):
+    """Mode cursor bersifat opt-in: aktif jika parameter ?cursor= dikirim."""
+    return "cursor" in request.GET
+
+
+def encode_cursor(created_at, pk):
+    raw = json.dumps([created_at.isoformat(), str(pk)]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, pk_field=None):
+    """
+    Kembalikan (waktu, pk) dari cursor. Jika pk_field diberikan, pk dikonversi
+    dengan to_python() field tersebut sehingga pk yang salah tipe (mis. "abc"
+    untuk AutoField) menjadi InvalidCursor, bukan error saat query dijalankan.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, pk = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        parsed = parse_datetime(created_at)
+        if pk_field is not None and pk is not None:
+            pk = pk_field.to_python(pk)
+    except (ValueError, TypeError, UnicodeError, ValidationError):
+        raise InvalidCursor("Cursor tidak valid")
+    if parsed is None or not pk:
+        raise InvalidCursor("Cursor tidak valid")
+    return parsed, pk
+
+
+def paginate_by_cursor(queryset, cursor, per_page, date_field="created_at", descending=True):
+    """
+    Ambil satu halaman dari `queryset` (default terbaru lebih dulu; dengan
+    descending=False terlama lebih dulu, mis. untuk daftar balasan).
+
+    Mengembalikan (items, next_cursor); next_cursor bernilai None jika tidak
+    ada halaman berikutnya. Melempar InvalidCursor untuk cursor yang rusak.
+    per_page dibatasi ke rentang 1..MAX_PER_PAGE.
+    """
+    per_page = clamp_per_page(per_page)
+    if descending:
+        queryset = queryset.order_by(f"-{date_field}", "-pk")
+        op = "lt"
+    else:
+        queryset = queryset.order_by(date_field, "pk")
+        op = "gt"
+    if cursor:
+        created_at, pk = decode_cursor(cursor, queryset.model._meta.pk)
+        queryset = queryset.filter(
+            Q(**{f"{date_field}__{op}": created_at})
+            | Q(**{date_field: created_at, f"pk__{op}": pk})
+        )
+
+    # Ambil satu baris ekstra untuk tahu apakah masih ada halaman berikutnya
+    items = list(queryset[: per_page + 1])
+    next_cursor = None
+    if len(items) > per_page:
+        items = items[:per_page]
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, date_field), last.pk)
+    return items, next_cursor
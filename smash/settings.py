@@ -69,10 +69,13 @@ INSTALLED_APPS = [
     "corsheaders",
     "search",
     "notifications",
+    "jobs",
 ]
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "smash.db_stats.DatabaseStatsMiddleware",
+    "smash.db_router.ReplicaRoutingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -80,6 +83,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
+    "post.counters.CounterFlushMiddleware",
 ]
 
 CORS_ALLOW_ALL_ORIGINS = True
@@ -124,8 +128,33 @@ if PRODUCTION:
             "HOST": os.getenv("DB_HOST"),
             "PORT": os.getenv("DB_PORT"),
             "OPTIONS": {"options": f"-c search_path={os.getenv('SCHEMA', 'public')}"},
+            # Koneksi dipakai ulang antar request selama DB_CONN_MAX_AGE detik
+            # (0 = tutup tiap request) dan dicek dulu sebelum dipakai ulang
+            "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "60")),
+            "CONN_HEALTH_CHECKS": os.getenv("DB_CONN_HEALTH_CHECKS", "True").lower() == "true",
+            # Wajib True di belakang PgBouncer mode transaction
+            "DISABLE_SERVER_SIDE_CURSORS": os.getenv("DB_PGBOUNCER", "False").lower() == "true",
         }
     }
+    # Connection pool bawaan Django (butuh psycopg 3 + psycopg-pool, bukan
+    # psycopg2); pool menggantikan CONN_MAX_AGE sehingga nilainya harus 0
+    if os.getenv("DB_POOL", "False").lower() == "true":
+        DATABASES["default"]["CONN_MAX_AGE"] = 0
+        DATABASES["default"]["OPTIONS"]["pool"] = {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+            "timeout": int(os.getenv("DB_POOL_TIMEOUT", "10")),
+        }
+    # Read replica (opsional): DB_REPLICA_HOSTS="host1,host2" memakai
+    # kredensial yang sama dengan primary
+    for index, host in enumerate(
+        host.strip() for host in os.getenv("DB_REPLICA_HOSTS", "").split(",") if host.strip()
+    ):
+        DATABASES[f"replica_{index}"] = {
+            **DATABASES["default"],
+            "HOST": host,
+            "TEST": {"MIRROR": "default"},
+        }
 else:
     # Development: gunakan SQLite
     DATABASES = {
@@ -134,6 +163,102 @@ else:
             "NAME": BASE_DIR / "db.sqlite3",
         }
     }
+    # Simulasi read replica lokal: DB_SQLITE_REPLICA=db.replica.sqlite3 (salinan
+    # db.sqlite3, disinkronkan manual)
+    if os.getenv("DB_SQLITE_REPLICA"):
+        DATABASES["replica"] = {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR / os.getenv("DB_SQLITE_REPLICA"),
+            "TEST": {"MIRROR": "default"},
+        }
+
+# Alias selain "default" adalah read replica (lihat smash/db_router.py)
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["smash.db_router.PrimaryReplicaRouter"]
+# Lama (detik) client tetap membaca primary setelah melakukan write
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+
+# Statistik koneksi DB per worker (smash/db_stats.py): dicatat ke log setiap
+# DB_STATS_LOG_EVERY request (0 = tidak pernah) dan tersedia di /health/db/
+# untuk staff atau dengan header X-Stats-Token: DB_STATS_TOKEN
+DB_STATS_LOG_EVERY = int(os.getenv("DB_STATS_LOG_EVERY", "0"))
+DB_STATS_TOKEN = os.getenv("DB_STATS_TOKEN", "")
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# CACHE_BACKEND: "locmem" (default, per proses), "file", "redis", "database",
+# atau "dummy". Dengan beberapa worker gunicorn gunakan "redis"/"database"
+# (atau "file" jika satu host) agar invalidasi feed dan foto profil terlihat
+# oleh semua worker. "database" butuh `manage.py createcachetable`.
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+    "database": "django.core.cache.backends.db.DatabaseCache",
+    "dummy": "django.core.cache.backends.dummy.DummyCache",
+}
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "locmem")
+CACHE_DEFAULT_LOCATIONS = {
+    "locmem": "smash-default",
+    "file": str(BASE_DIR / ".cache"),
+    "redis": "redis://127.0.0.1:6379/1",
+    "database": "smash_cache",
+    "dummy": "",
+}
+
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKENDS[CACHE_BACKEND],
+        "LOCATION": os.getenv(
+            "CACHE_LOCATION", CACHE_DEFAULT_LOCATIONS[CACHE_BACKEND]
+        ),
+        "TIMEOUT": 300,
+    }
+}
+
+# Lama (detik) halaman feed anonim disimpan di cache; versi feed tetap
+# dinaikkan setiap ada perubahan post (lihat smash/feed_cache.py)
+FEED_CACHE_TIMEOUT = int(os.getenv("FEED_CACHE_TIMEOUT", "60"))
+
+# Cache disk untuk image proxy (smash/image_cache.py): entry fresh selama
+# IMAGE_PROXY_CACHE_TTL detik lalu direvalidasi dengan ETag/Last-Modified;
+# total ukuran dibatasi dengan eviction LRU
+IMAGE_PROXY_CACHE = os.getenv("IMAGE_PROXY_CACHE", "True").lower() == "true"
+IMAGE_PROXY_CACHE_DIR = os.getenv(
+    "IMAGE_PROXY_CACHE_DIR", os.path.join(BASE_DIR, ".cache", "image_proxy")
+)
+IMAGE_PROXY_CACHE_MAX_BYTES = int(
+    os.getenv("IMAGE_PROXY_CACHE_MAX_BYTES", str(256 * 1024 * 1024))
+)
+IMAGE_PROXY_CACHE_TTL = int(os.getenv("IMAGE_PROXY_CACHE_TTL", "3600"))
+# Ukuran maksimum satu gambar yang mau di-stream oleh proxy
+IMAGE_PROXY_MAX_BYTES = int(os.getenv("IMAGE_PROXY_MAX_BYTES", str(10 * 1024 * 1024)))
+
+# Lebar thumbnail (px) yang dibuat untuk gambar post dan foto profil
+# (smash/images.py), masing-masing dalam WebP dan JPEG
+IMAGE_VARIANT_WIDTHS = [
+    int(width) for width in os.getenv("IMAGE_VARIANT_WIDTHS", "64,320,1080").split(",")
+]
+
+# Antrian job latar belakang (jobs/queue.py): "thread" = thread pool di
+# proses web, "sync" = langsung setelah commit, "worker" = hanya dijalankan
+# oleh `manage.py run_jobs`
+JOBS_MODE = os.getenv("JOBS_MODE", "thread")
+JOBS_THREADS = int(os.getenv("JOBS_THREADS", "2"))
+JOBS_MAX_ATTEMPTS = int(os.getenv("JOBS_MAX_ATTEMPTS", "3"))
+JOBS_RETRY_DELAY = int(os.getenv("JOBS_RETRY_DELAY", "10"))
+JOBS_STALE_SECONDS = int(os.getenv("JOBS_STALE_SECONDS", "600"))
+JOBS_KEEP_DAYS = int(os.getenv("JOBS_KEEP_DAYS", "7"))
+
+# HTTP client bersama untuk request keluar (smash/http_client.py): koneksi
+# keep-alive per host, timeout default, dan retry GET dengan backoff
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "10"))
+HTTP_POOL_HOSTS = int(os.getenv("HTTP_POOL_HOSTS", "20"))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+HTTP_RETRY_BACKOFF = float(os.getenv("HTTP_RETRY_BACKOFF", "0.3"))
 
 
 # Password validation
@@ -191,3 +316,43 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # allow up to 10 MB request body for base64 uploads
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024
+
+# Hot threads ranking (lihat post/hot.py)
+# "reddit": skor stabil terhadap waktu, cukup diupdate saat ada like/komentar
+# "hn": skor meluruh (gravity), jalankan `manage.py rebuild_hot_scores` berkala
+HOT_SCORE_FORMULA = os.getenv("HOT_SCORE_FORMULA", "reddit")
+HOT_SCORE_GRAVITY = float(os.getenv("HOT_SCORE_GRAVITY", "1.8"))
+HOT_SCORE_DECAY_SECONDS = int(os.getenv("HOT_SCORE_DECAY_SECONDS", "45000"))
+HOT_THREADS_LIMIT = 50
+
+# Jumlah baris per fetch untuk endpoint dump JSON yang di-stream (smash/export.py)
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "2000"))
+
+# Full-text search post (lihat search/index.py)
+SEARCH_MAX_RESULTS = 500
+SEARCH_AUTHOR_BOOST = 1.0
+
+# Lama (detik) URL foto profil disimpan di cache; entri dihapus otomatis saat
+# foto berubah (lihat profil/photos.py). Invalidasi hanya terlihat semua worker
+# pada cache bersama, jadi dengan CACHE_BACKEND "locmem" umur entri dibatasi
+# PROFILE_PHOTO_LOCAL_CACHE_TIMEOUT detik
+PROFILE_PHOTO_CACHE_TIMEOUT = int(os.getenv("PROFILE_PHOTO_CACHE_TIMEOUT", "3600"))
+PROFILE_PHOTO_LOCAL_CACHE_TIMEOUT = int(
+    os.getenv("PROFILE_PHOTO_LOCAL_CACHE_TIMEOUT", "10")
+)
+
+# Jumlah balasan preview per komentar pada mode cursor CommentAPIView
+COMMENT_REPLY_PREVIEW = 3
+
+# Jumlah aksi maksimal per request /post/api/interactions/batch/
+INTERACTION_BATCH_MAX = 100
+
+# Counter share/view write-behind (lihat post/counters.py): buffer di-flush
+# setiap COUNTER_FLUSH_INTERVAL detik atau COUNTER_FLUSH_EVENTS event.
+# Default mati (tulis langsung). Buffer ada di memori proses: jika worker
+# dimatikan paksa (SIGKILL, OOM killer, worker gunicorn yang kena timeout)
+# share, view, dan baris audit PostShare yang belum di-flush HILANG, paling
+# banyak COUNTER_FLUSH_INTERVAL detik / COUNTER_FLUSH_EVENTS event per worker.
+COUNTER_WRITE_BEHIND = os.getenv("COUNTER_WRITE_BEHIND", "False") == "True"
+COUNTER_FLUSH_INTERVAL = int(os.getenv("COUNTER_FLUSH_INTERVAL", "5"))
+COUNTER_FLUSH_EVENTS = int(os.getenv("COUNTER_FLUSH_EVENTS", "100"))
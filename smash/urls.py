@@ -8,7 +8,7 @@ from django.conf.urls.static import static
 from django.views.static import serve
 
 from post import views as post_views
-from smash.views import proxy_image
+from smash.views import db_stats_view, http_stats_view, proxy_image
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -27,6 +27,8 @@ urlpatterns = [
     path("recent/", post_views.recent_thread, name="recent_thread"),
     path("authentication/", include("authentication.urls")),
     path("proxy-image/", proxy_image, name="proxy_image"),
+    path("health/db/", db_stats_view, name="db_stats"),
+    path("health/http/", http_stats_view, name="http_stats"),
 ]
 
 # Serve media files
@@ -1,19 +1,53 @@
-from django.http import HttpResponse
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from django.utils.crypto import constant_time_compare
 import requests
+
+from smash import http_client
+from smash.db_stats import db_stats
+from smash.image_cache import fetch_image, image_response
+
+
 def proxy_image(request):
     image_url = request.GET.get('url')
     if not image_url:
         return HttpResponse('No URL provided', status=400)
     
     try:
-        # Fetch image from external source
-        response = requests.get(image_url, timeout=10)
-        response.raise_for_status()
-        
-        # Return the image with proper content type
-        return HttpResponse(
-            response.content,
-            content_type=response.headers.get('Content-Type', 'image/jpeg')
+        # Fetch image from external source (lewat cache disk)
+        image, cache_status = fetch_image(
+            image_url, byte_range=request.headers.get('Range')
         )
     except requests.RequestException as e:
-        return HttpResponse(f'Error fetching image: {str(e)}', status=500)
\ No newline at end of file
+        return HttpResponse(f'Error fetching image: {str(e)}', status=500)
+
+    # Return the image with proper content type
+    return image_response(
+        request, image, cache_status, image.content_type or 'image/jpeg'
+    )
+
+
+def _stats_allowed(request):
+    """Staff atau request dengan header X-Stats-Token yang cocok"""
+    token = getattr(settings, "DB_STATS_TOKEN", "")
+    has_token = bool(token) and constant_time_compare(
+        request.headers.get("X-Stats-Token", ""), token
+    )
+    return has_token or (request.user.is_authenticated and request.user.is_staff)
+
+
+def db_stats_view(request):
+    """
+    Statistik koneksi database worker yang melayani request ini (lihat
+    smash/db_stats.py). Hanya untuk staff atau dengan header X-Stats-Token.
+    """
+    if not _stats_allowed(request):
+        return JsonResponse({"status": "error", "message": "Forbidden"}, status=403)
+    return JsonResponse({"status": "success", **db_stats()})
+
+
+def http_stats_view(request):
+    """Hit/miss pool koneksi HTTP keluar worker ini (smash/http_client.py)"""
+    if not _stats_allowed(request):
+        return JsonResponse({"status": "error", "message": "Forbidden"}, status=403)
+    return JsonResponse({"status": "success", **http_client.pool_stats()})